@@ -0,0 +1,41 @@
+"""
+Shared bootstrap for standalone benchmarks.
+
+Benchmarks run against a throw-away test database (same as manage.py test),
+never against the configured development / production database.
+"""
+
+import os
+import sys
+from contextlib import contextmanager
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def setup():
+    if APP_DIR not in sys.path:
+        sys.path.insert(0, APP_DIR)
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "sea_saw_server.settings")
+
+    import django
+
+    django.setup()
+
+
+@contextmanager
+def test_database():
+    """Create the test database, yield, then destroy it."""
+    from django.test.utils import (
+        setup_databases,
+        setup_test_environment,
+        teardown_databases,
+        teardown_test_environment,
+    )
+
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False)
+    try:
+        yield
+    finally:
+        teardown_databases(old_config, verbosity=0)
+        teardown_test_environment()
@@ -0,0 +1,95 @@
+"""
+Benchmark: CSV export, OFFSET chunks + pandas vs keyset streaming.
+
+Usage (from app/):
+    python -m benchmarks.bench_csv_export
+    python -m benchmarks.bench_csv_export --orders 20000 --items 3 --repeat 3
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks import _django
+
+
+def seed(orders, items_per_order):
+    from sea_saw_sales.models import Order, OrderItem
+
+    Order.objects.bulk_create(
+        Order(order_code=f"BENCH-{index:08d}", order_date="2024-01-01")
+        for index in range(orders)
+    )
+    OrderItem.objects.bulk_create(
+        OrderItem(order=order, order_qty=1, gross_weight=1, unit_price=2)
+        for order in Order.objects.all()
+        for _ in range(items_per_order)
+    )
+
+
+def export_offset_pandas(file_path, ordering, chunk_size):
+    """Previous generate_csv_task loop, kept for comparison."""
+    import pandas as pd
+
+    from sea_saw_download.utilis import flatten
+    from sea_saw_sales.models import Order
+    from sea_saw_sales.serializers import OrderSerializerForDownload
+
+    total = Order.objects.count()
+    first_chunk = True
+    for offset in range(0, total, chunk_size):
+        queryset = Order.objects.order_by(*ordering)[offset:offset + chunk_size]
+        data, headers = flatten(queryset, OrderSerializerForDownload)
+        df = pd.DataFrame.from_records(data).rename(columns=headers)
+        df.to_csv(file_path, mode="a", header=first_chunk, index=False, encoding="utf-8-sig")
+        first_chunk = False
+    return total
+
+
+def export_keyset_stream(file_path, ordering, chunk_size):
+    from sea_saw_download.exporter import StreamingCSVExporter
+    from sea_saw_sales.models import Order
+    from sea_saw_sales.serializers import OrderSerializerForDownload
+
+    exporter = StreamingCSVExporter(
+        Order.objects.all(), OrderSerializerForDownload, ordering, chunk_size=chunk_size
+    )
+    return exporter.write(file_path)
+
+
+def measure(func, repeat, **kwargs):
+    best = None
+    with tempfile.TemporaryDirectory() as directory:
+        for run in range(repeat):
+            file_path = os.path.join(directory, f"{func.__name__}_{run}.csv")
+            start = time.perf_counter()
+            records = func(file_path, **kwargs)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+    return records, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orders", type=int, default=5000)
+    parser.add_argument("--items", type=int, default=3, help="Items per order")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    _django.setup()
+    with _django.test_database():
+        seed(args.orders, args.items)
+        for func in (export_offset_pandas, export_keyset_stream):
+            records, seconds = measure(
+                func, args.repeat, ordering=["-order_date"], chunk_size=args.chunk_size
+            )
+            print(
+                f"{func.__name__:<22} {records:>8} records  {seconds:8.2f}s  "
+                f"{records / seconds:10.0f} records/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
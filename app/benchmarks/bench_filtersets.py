@@ -0,0 +1,65 @@
+"""
+Benchmark: per-request FilterSet construction for OrderFilter / PipelineFilter (pyperf).
+
+Each list request builds the view's filterset (DjangoFilterBackend), and
+OPTIONS builds another one for BaseMetadata.get_filters_info. Measures:
+- *_init: FilterSet(data, queryset) only
+- *_request: init + form validation + filtered queryset (not evaluated)
+
+No database is needed: querysets are built but never executed.
+
+Usage (from app/):
+    python -m benchmarks.bench_filtersets
+    python -m benchmarks.bench_filtersets --fast -o filtersets.json
+"""
+
+import os
+import sys
+
+if __package__ in (None, ""):
+    # pyperf workers re-run this file as a script
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pyperf
+
+from benchmarks import _django
+
+QUERY = "status__iexact=draft&order_date__gte=2024-01-01&owner__in=1,2"
+
+
+def build_filterset(filterset_class, data, queryset):
+    return filterset_class(data=data, queryset=queryset)
+
+
+def filter_request(filterset_class, data, queryset):
+    filterset = filterset_class(data=data, queryset=queryset)
+    filterset.is_valid()
+    return filterset.qs
+
+
+def main():
+    runner = pyperf.Runner()
+    runner.metadata["description"] = "Per-request FilterSet construction cost"
+
+    _django.setup()
+    from django.http import QueryDict
+
+    from sea_saw_pipeline.filters import PipelineFilter
+    from sea_saw_pipeline.models import Pipeline
+    from sea_saw_sales.filters import OrderFilter
+    from sea_saw_sales.models import Order
+
+    data = QueryDict(QUERY)
+    for name, filterset_class, model in (
+        ("order_filter", OrderFilter, Order),
+        ("pipeline_filter", PipelineFilter, Pipeline),
+    ):
+        queryset = model.objects.all()
+        runner.bench_func(f"{name}_init", build_filterset, filterset_class, data, queryset)
+        runner.bench_func(
+            f"{name}_request", filter_request, filterset_class, data, queryset
+        )
+
+
+if __name__ == "__main__":
+    main()
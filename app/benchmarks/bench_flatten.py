@@ -0,0 +1,74 @@
+"""
+Benchmark: flattening serialized orders, utilis.traverse vs FlattenPlan.
+
+Usage (from app/):
+    python -m benchmarks.bench_flatten
+    python -m benchmarks.bench_flatten --orders 500 --items 50
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from benchmarks import _django
+from benchmarks.bench_csv_export import seed
+
+
+def flatten_traverse(serializer, data):
+    from sea_saw_download.utilis import flatten_header, traverse
+
+    columns = list(flatten_header(serializer))
+    return sum(
+        1 for row in traverse(data, serializer) if [row.get(c) for c in columns]
+    )
+
+
+def flatten_plan(serializer, data):
+    from sea_saw_download.flattener import FlattenPlan
+
+    plan = FlattenPlan.for_serializer(type(serializer.child))
+    return sum(1 for record in data for _row in plan.iter_rows(record))
+
+
+def measure(func, serializer, data, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = func(serializer, data)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    func(serializer, data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return rows, best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orders", type=int, default=200)
+    parser.add_argument("--items", type=int, default=30, help="Items per order")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    _django.setup()
+    with _django.test_database():
+        from sea_saw_sales.models import Order
+        from sea_saw_sales.serializers import OrderSerializerForDownload
+
+        seed(args.orders, args.items)
+        queryset = Order.objects.prefetch_related("order_items")
+        serializer = OrderSerializerForDownload(queryset, many=True)
+        data = serializer.data
+
+        for func in (flatten_traverse, flatten_plan):
+            rows, seconds, peak = measure(func, serializer, data, args.repeat)
+            print(
+                f"{func.__name__:<18} {rows:>8} rows  {seconds:8.3f}s  "
+                f"{rows / seconds:10.0f} rows/s  peak {peak / 1024:10.0f} KiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
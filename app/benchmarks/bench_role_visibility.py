@@ -0,0 +1,118 @@
+"""
+Benchmark: User.get_all_visible_users over a deep / wide role tree.
+
+Compares the previous per-node BFS (one query per role) with RoleVisibility
+(one recursive query, then cached). Reports queries and time per call.
+
+Usage (from app/):
+    python -m benchmarks.bench_role_visibility
+    python -m benchmarks.bench_role_visibility --depth 6 --width 4 --users 3
+"""
+
+import argparse
+import time
+
+from benchmarks import _django
+
+
+def build_tree(depth, width, users_per_role):
+    from sea_saw_auth.models import Role, User
+
+    root = Role.objects.create(role_name="bench-root", is_peer_visible=True)
+    level = [root]
+    roles = [root]
+    for d in range(depth):
+        next_level = []
+        for parent in level:
+            for w in range(width):
+                next_level.append(
+                    Role.objects.create(role_name=f"bench-{d}-{w}", parent=parent)
+                )
+        roles.extend(next_level)
+        level = next_level
+
+    User.objects.bulk_create(
+        User(username=f"bench-{role.pk}-{n}", role=role)
+        for role in roles
+        for n in range(users_per_role)
+    )
+    return User.objects.filter(role=root).first(), len(roles)
+
+
+def visible_users_bfs(user):
+    """Previous implementation, kept for comparison."""
+    from django.db.models import Q
+
+    from sea_saw_auth.models import Role, User
+
+    descendants = set()
+    queue = list(user.role.children.all())
+    while queue:
+        current = queue.pop(0)
+        descendants.add(current.id)
+        queue.extend(current.children.all())
+    visible_roles = list(Role.objects.filter(id__in=descendants)) + [user.role.id]
+    return set(
+        User.objects.filter(Q(role__in=visible_roles) | Q(id=user.id)).values_list(
+            "id", flat=True
+        )
+    )
+
+
+def visible_users_cached(user):
+    return set(user.get_visible_user_ids())
+
+
+def measure(func, user, repeat):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    timings = []
+    queries = []
+    for _ in range(repeat):
+        # the query log is capped: keep it empty so every call is counted
+        connection.queries_log.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            start = time.perf_counter()
+            result = func(user)
+            timings.append(time.perf_counter() - start)
+        queries.append(len(ctx.captured_queries))
+    return result, timings, queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--depth", type=int, default=5)
+    parser.add_argument("--width", type=int, default=4)
+    parser.add_argument("--users", type=int, default=2, help="Users per role")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    _django.setup()
+    with _django.test_database():
+        from sea_saw_auth.visibility import RoleVisibility
+
+        user, role_count = build_tree(args.depth, args.width, args.users)
+        print(f"{role_count} roles, depth {args.depth}, width {args.width}")
+
+        RoleVisibility.invalidate()
+        expected, timings, queries = measure(visible_users_bfs, user, args.repeat)
+        print(
+            f"{'bfs':<14} {len(expected):>6} users  queries/call {queries[0]:>5}  "
+            f"{min(timings) * 1000:8.2f} ms"
+        )
+
+        result, timings, queries = measure(visible_users_cached, user, args.repeat)
+        assert result == expected
+        print(
+            f"{'cte (cold)':<14} {len(result):>6} users  queries/call {queries[0]:>5}  "
+            f"{timings[0] * 1000:8.2f} ms"
+        )
+        print(
+            f"{'cte (cached)':<14} {len(result):>6} users  queries/call {queries[-1]:>5}  "
+            f"{min(timings[1:]) * 1000:8.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
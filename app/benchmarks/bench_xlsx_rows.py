@@ -0,0 +1,75 @@
+"""
+Benchmark: expanding contract sheets to N product rows (pyperf).
+
+Measures copy_worksheet + setup_product_rows + fill_product_row for the
+Sales Contract template; no database is needed.
+
+Usage (from app/):
+    python -m benchmarks.bench_xlsx_rows
+    python -m benchmarks.bench_xlsx_rows --fast -o xlsx_rows.json
+"""
+
+import os
+import sys
+
+if __package__ in (None, ""):
+    # pyperf workers re-run this file as a script
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pyperf
+
+from benchmarks import _django
+
+PRODUCT_COUNTS = (1, 10, 100, 500)
+
+
+def make_products(n_products):
+    return [
+        {
+            "Product Name": f"Frozen Squid {index}",
+            "Specifications": "200-300g",
+            "KG/Carton": 10,
+            "Cartons": 100 + index,
+            "Unit Price (USD/KG)": 2.5,
+        }
+        for index in range(n_products)
+    ]
+
+
+def build_sheet(n_products, products):
+    from sea_saw_export.xlsx import (
+        PRODUCT_FIRST_ROW,
+        fill_product_row,
+        fix_copied_sheet,
+        load_template,
+        setup_product_rows,
+    )
+    from sea_saw_sales.sc.generator import SC_CONFIG, TEMPLATE_PATH
+
+    wb = load_template(TEMPLATE_PATH)
+    template_ws = wb[SC_CONFIG.template_sheet]
+    ws = wb.copy_worksheet(template_ws)
+    fix_copied_sheet(template_ws, ws, SC_CONFIG)
+
+    setup_product_rows(ws, n_products, SC_CONFIG)
+    for index, product in enumerate(products):
+        fill_product_row(ws, PRODUCT_FIRST_ROW + index, product, SC_CONFIG)
+    return ws
+
+
+def main():
+    runner = pyperf.Runner()
+    runner.metadata["description"] = "Contract sheet expansion to N product rows"
+
+    _django.setup()
+    for n_products in PRODUCT_COUNTS:
+        runner.bench_func(
+            f"sc_sheet_{n_products}_products",
+            build_sheet,
+            n_products,
+            make_products(n_products),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 from sea_saw_attachment.models import Attachment
+from sea_saw_base.utils import ContentTypeRegistry
 
 
 class ReusableAttachmentWriteMixin:
@@ -86,10 +87,7 @@ class ReusableAttachmentWriteMixin:
         if not self.attachment_model:
             raise AssertionError("attachment_model must be defined")
 
-        # Import here to avoid circular imports
-        from django.contrib.contenttypes.models import ContentType
-
-        content_type = ContentType.objects.get_for_model(instance)
+        content_type = ContentTypeRegistry.get_for_model(instance)
 
         # Delete attachments that are no longer in the submitted list
         keep_ids = {att.get("id") for att in attachments if att.get("id")}
@@ -17,6 +17,7 @@ from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 
 from sea_saw_base.models import BaseModel
+from sea_saw_base.utils import ContentTypeRegistry
 from .enums import AttachmentType
 from ..validators import validate_file_upload
 from ..utils import attachment_file_path
@@ -136,8 +137,8 @@ class Attachment(BaseModel):
                 pass
 
         # Auto-set attachment_type if not set
-        if not self.attachment_type and self.content_type:
-            model_name = self.content_type.model
+        if not self.attachment_type and self.content_type_id:
+            model_name = ContentTypeRegistry.model_name(self.content_type_id)
             if model_name == "order":
                 self.attachment_type = AttachmentType.ORDER_ATTACHMENT
             elif model_name == "productionorder":
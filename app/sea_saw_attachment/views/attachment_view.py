@@ -129,11 +129,10 @@ class SecureAttachmentDownloadView(APIView):
             return True
 
         # Role-based access: check if user can see the entity owner
-        # based on role hierarchy (using the existing get_all_visible_users method)
+        # based on role hierarchy (cached visible user ids)
         if hasattr(related_object, "owner") and related_object.owner:
-            if hasattr(user, "get_all_visible_users"):
-                visible_users = user.get_all_visible_users()
-                if related_object.owner in visible_users:
+            if hasattr(user, "get_visible_user_ids"):
+                if related_object.owner_id in user.get_visible_user_ids():
                     return True
 
         # Default: deny access
@@ -17,6 +17,7 @@ class SeaSawAuthConfig(AppConfig):
             return
 
         post_migrate.connect(add_default_roles, sender=self)
+        from . import signals  # noqa: F401
         self._signals_registered = True
 
 
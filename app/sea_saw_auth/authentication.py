@@ -0,0 +1,27 @@
+"""
+JWT authentication serving the request user from token claims.
+
+The stock JWTAuthentication loads the User row on every request, and most
+views then load its Role (``request.user.role.role_type``) and groups as
+well. With current role claims (see tokens.py) the user is a ClaimsUser built
+without any query; otherwise the stock lookup is used.
+"""
+
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+
+from .models import ClaimsUser
+from .tokens import has_current_claims
+
+
+class RoleClaimsJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        if not has_current_claims(validated_token):
+            return super().get_user(validated_token)
+
+        user = ClaimsUser.from_claims(validated_token)
+        # Same checks as the stock lookup (current claims reflect the row)
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
@@ -1,9 +1,11 @@
 from django.contrib.auth.models import AbstractUser
-from django.db import models
-from django.db.models import Q
+from django.db import models, router
+from django.db.models import DEFERRED
 
 from django.utils.translation import gettext_lazy as _
 
+from sea_saw_base.models import FieldTrackingMixin
+
 
 class RoleType(models.TextChoices):
     ADMIN = "ADMIN", _("Admin")
@@ -14,9 +16,12 @@ class RoleType(models.TextChoices):
     UNKNOWN = "UNKNOWN", _("Unknown")
 
 
-class Role(models.Model):
+class Role(FieldTrackingMixin, models.Model):
     """Role model: 实现层级关系，用于数据可见性控制"""
 
+    # Fields compared by signals.py: visibility tree and token claims
+    tracked_fields = ("role_type", "parent", "is_peer_visible")
+
     role_name = models.CharField(max_length=100)
     role_type = models.CharField(
         max_length=20, choices=RoleType.choices, default=RoleType.UNKNOWN
@@ -36,17 +41,11 @@ class Role(models.Model):
 
     def get_all_descendants(self):
         """
-        Retrieve all descendant roles using a single query.
-        Avoid recursive DB hits.
+        Retrieve all descendant roles using a single recursive query.
         """
-        # Use BFS / iterative approach
-        descendants = set()
-        queue = list(self.children.all())
-        while queue:
-            current = queue.pop(0)
-            descendants.add(current.id)
-            queue.extend(current.children.all())
-        return Role.objects.filter(id__in=descendants)
+        from .visibility import RoleVisibility
+
+        return Role.objects.filter(id__in=RoleVisibility.descendant_role_ids(self.pk))
 
     def get_all_parent_users(self):
         """
@@ -63,30 +62,98 @@ class Role(models.Model):
         return User.objects.filter(role__in=parents)
 
 
-class User(AbstractUser):
+class User(FieldTrackingMixin, AbstractUser):
     phone = models.CharField(max_length=20, null=True, blank=True)
     department = models.CharField(max_length=100, null=True, blank=True)
     role = models.ForeignKey(
         Role, on_delete=models.SET_NULL, null=True, related_name="users"
     )
+    # Version of the access-token claims (see tokens.py); only ever incremented
+    claims_version = models.PositiveIntegerField(default=0, editable=False)
+
+    # Fields compared by signals.py: claimed in access tokens, and the password
+    # (revokes the claims so CHECK_REVOKE_TOKEN applies on the next request)
+    tracked_fields = (
+        "username",
+        "is_active",
+        "is_staff",
+        "is_superuser",
+        "role",
+        "password",
+    )
+
+    def get_visible_user_ids(self):
+        """
+        Ids of users visible to this user (cached, see RoleVisibility).
+        Use for membership checks: ``owner_id in user.get_visible_user_ids()``.
+        """
+        from .visibility import RoleVisibility
+
+        return RoleVisibility.visible_user_ids(self)
 
     def get_all_visible_users(self):
         """
         Returns queryset of users visible to this user based on role hierarchy and peer visibility.
+
+        It filters by the cached id set of get_visible_user_ids() (RoleVisibility),
+        so ``qs.filter(owner__in=user.get_all_visible_users())`` inlines that id
+        list into the SQL (a subquery on the user table, no role-tree query).
+        Prefer ``owner_id__in=user.get_visible_user_ids()`` when the rows are not needed.
         """
-        if not self.role:
-            return User.objects.filter(id=self.id)
-
-        # Descendants of current role
-        descendant_roles = self.role.get_all_descendants()
-
-        if self.role.is_peer_visible:
-            # Include self role
-            visible_roles = list(descendant_roles) + [self.role.id]
-        else:
-            visible_roles = list(descendant_roles)
-
-        # Include self user always
-        return User.objects.filter(
-            Q(role__in=visible_roles) | Q(id=self.id)
-        ).select_related("role")
+        return User.objects.filter(id__in=self.get_visible_user_ids()).select_related(
+            "role"
+        )
+
+    def get_group_names(self):
+        """Names of the user's auth groups (served from token claims by ClaimsUser)."""
+        return frozenset(self.groups.values_list("name", flat=True))
+
+
+class ClaimsUser(User):
+    """
+    Authenticated principal built from access-token claims (see authentication.py).
+
+    id / username / flags / role_id / claims_version / role.role_type / group
+    names come from the token; every other field is deferred and the whole row
+    is loaded with one query the first time any of them is read. Being a User,
+    it can be assigned to owner / created_by foreign keys as is.
+    """
+
+    # Concrete fields served from claims: claim name → attname
+    CLAIM_FIELDS = {
+        "user_id": "id",
+        "username": "username",
+        "is_active": "is_active",
+        "is_staff": "is_staff",
+        "is_superuser": "is_superuser",
+        "role_id": "role_id",
+        "claims_version": "claims_version",
+    }
+
+    class Meta:
+        proxy = True
+
+    @classmethod
+    def from_claims(cls, token):
+        # Model.from_db() takes one value per concrete field, in field order
+        claimed = {attname: token[claim] for claim, attname in cls.CLAIM_FIELDS.items()}
+        field_names = [field.attname for field in cls._meta.concrete_fields]
+        values = [claimed.get(attname, DEFERRED) for attname in field_names]
+        user = cls.from_db(router.db_for_read(cls), field_names, values)
+        if user.role_id is not None:
+            user.role = Role.from_db(
+                router.db_for_read(Role),
+                ["id", "role_type"],
+                [user.role_id, token["role_type"]],
+            )
+        user._group_names = frozenset(token["groups"])
+        return user
+
+    def get_group_names(self):
+        return self._group_names
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        # A deferred field was read: load the rest of the row along with it
+        if fields is not None:
+            fields = set(fields) | self.get_deferred_fields()
+        super().refresh_from_db(using, fields, from_queryset)
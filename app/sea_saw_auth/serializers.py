@@ -1,8 +1,15 @@
 from django.contrib.auth.models import Group
 from rest_framework import serializers
 from django.contrib.auth.password_validation import validate_password
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import AccessToken
 
 from sea_saw_auth.models import User, Role
+from sea_saw_auth.tokens import RoleClaimsRefreshToken, add_role_claims, has_current_claims
 
 
 class GroupSerializer(serializers.ModelSerializer):
@@ -211,3 +218,28 @@ class AdminUserCreateSerializer(serializers.ModelSerializer):
             user.role = role
             user.save(update_fields=["role"])
         return user
+
+
+# =====================================================
+# JWT
+# =====================================================
+
+
+class RoleClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Token pair whose access token carries role / group claims"""
+
+    token_class = RoleClaimsRefreshToken
+
+
+class RoleClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """Re-stamp stale role claims (roles / groups changed) into refreshed access tokens"""
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        access = AccessToken(data["access"])
+        if not has_current_claims(access):
+            user = User.objects.select_related("role").get(
+                **{jwt_settings.USER_ID_FIELD: access[jwt_settings.USER_ID_CLAIM]}
+            )
+            data["access"] = str(add_role_claims(access, user))
+        return data
@@ -0,0 +1,95 @@
+"""
+Auth signals module.
+
+Visibility cache maintenance:
+Cached visible-user sets (RoleVisibility) depend on the role tree, role
+peer visibility and each user's role. Changes to those, and users joining or
+leaving, invalidate every cached set.
+
+Token claims maintenance:
+Access tokens carry claims versioned per user (tokens.py). Changes to a
+user's claimed fields or groups bump that user's claims_version; a role_type
+change bumps every user of the role.
+
+Changes are detected with FieldTrackingMixin, so saves that do not touch
+these fields (e.g. last_login) invalidate nothing. QuerySet.update() sends no
+signals: call RoleVisibility.invalidate() / ClaimsVersion.bump() by hand.
+"""
+
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .models import Role, User
+from .tokens import ClaimsVersion
+from .visibility import RoleVisibility
+
+# Role fields that affect visibility sets
+VISIBILITY_ROLE_FIELDS = {"parent", "is_peer_visible"}
+
+
+def _changed_fields(instance, update_fields):
+    """Tracked fields of ``instance`` written with a different value by this save."""
+    changed = {name for name in instance.tracked_fields if instance.has_changed(name)}
+    if update_fields is not None:
+        written = set(update_fields)
+        changed = {
+            name
+            for name in changed
+            if name in written or instance._meta.get_field(name).attname in written
+        }
+    return changed
+
+
+@receiver(post_save, sender=Role)
+def invalidate_on_role_save(sender, instance, created, update_fields, **kwargs):
+    if created:
+        return  # no users yet
+    changed = _changed_fields(instance, update_fields)
+    if changed & VISIBILITY_ROLE_FIELDS:
+        RoleVisibility.invalidate()
+    if "role_type" in changed:
+        ClaimsVersion.bump(User.objects.filter(role=instance))
+
+
+@receiver(pre_delete, sender=Role)
+def invalidate_claims_on_role_delete(sender, instance, **kwargs):
+    # role is SET_NULL by an update that sends no User signals
+    ClaimsVersion.bump(User.objects.filter(role=instance))
+
+
+@receiver(post_delete, sender=Role)
+def invalidate_visibility_on_role_delete(sender, **kwargs):
+    RoleVisibility.invalidate()
+
+
+@receiver(post_save, sender=User)
+def invalidate_on_user_save(sender, instance, created, update_fields, **kwargs):
+    if created:
+        if instance.role_id is not None:
+            RoleVisibility.invalidate()
+        return
+
+    changed = _changed_fields(instance, update_fields)
+    if "role" in changed:
+        RoleVisibility.invalidate()
+    if changed:
+        ClaimsVersion.bump(User.objects.filter(pk=instance.pk))
+        # A later full save() must not write the old version back
+        instance.refresh_from_db(fields=["claims_version"])
+
+
+@receiver(post_delete, sender=User)
+def invalidate_visibility_on_user_delete(sender, **kwargs):
+    RoleVisibility.invalidate()
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_claims_on_group_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in {"post_add", "post_remove", "post_clear"}:
+            ClaimsVersion.bump(User.objects.filter(pk=instance.pk))
+    elif action in {"post_add", "post_remove"}:
+        # group.user_set.add(...) / remove(...)
+        ClaimsVersion.bump(User.objects.filter(pk__in=pk_set))
+    elif action == "pre_clear":
+        ClaimsVersion.bump(User.objects.filter(groups=instance))
@@ -1,6 +1,13 @@
+from django.contrib.auth.models import Group
+from django.core.cache import cache
 from django.test import TestCase
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken
 
-from .models import Role, User
+from .authentication import RoleClaimsJWTAuthentication
+from .models import ClaimsUser, Role, User
+from .tokens import RoleClaimsRefreshToken
 
 
 class RoleModelTests(TestCase):
@@ -69,3 +76,175 @@ class RoleModelTests(TestCase):
         self.assertEqual(
             set(visible_users), {self.user1, self.user2, self.user3, self.user4}
         )
+
+
+class RoleVisibilityCacheTests(TestCase):
+
+    def setUp(self):
+        self.root = Role.objects.create(role_name="Root")
+        self.child = Role.objects.create(role_name="Child", parent=self.root)
+        self.other = Role.objects.create(role_name="Other")
+        self.manager = User.objects.create_user(username="manager", role=self.root)
+        self.member = User.objects.create_user(username="member", role=self.child)
+        self.outsider = User.objects.create_user(username="outsider", role=self.other)
+
+    def test_resolved_in_one_query_then_cached(self):
+        with self.assertNumQueries(1):
+            user_ids = self.manager.get_visible_user_ids()
+        self.assertEqual(user_ids, {self.manager.pk, self.member.pk})
+
+        with self.assertNumQueries(0):
+            self.manager.get_visible_user_ids()
+
+    def test_role_tree_change_invalidates(self):
+        self.manager.get_visible_user_ids()
+
+        self.other.parent = self.child
+        self.other.save()
+        self.assertIn(self.outsider.pk, self.manager.get_visible_user_ids())
+
+    def test_user_changes_invalidate(self):
+        self.manager.get_visible_user_ids()
+        newcomer = User.objects.create_user(username="newcomer", role=self.child)
+        self.assertIn(newcomer.pk, self.manager.get_visible_user_ids())
+
+        newcomer.role = self.other
+        newcomer.save(update_fields=["role"])
+        self.assertNotIn(newcomer.pk, self.manager.get_visible_user_ids())
+
+    def test_last_login_update_keeps_cache(self):
+        self.manager.get_visible_user_ids()
+        self.member.save(update_fields=["last_login"])
+        with self.assertNumQueries(0):
+            self.manager.get_visible_user_ids()
+
+    def test_unrelated_user_save_keeps_cache(self):
+        self.manager.get_visible_user_ids()
+        self.member.email = "member@example.com"
+        self.member.is_staff = True
+        self.member.save()
+        with self.assertNumQueries(0):
+            self.manager.get_visible_user_ids()
+
+
+class RoleClaimsJWTTests(TestCase):
+    """Access tokens carry role claims; the request user is built without queries."""
+
+    def setUp(self):
+        self.role = Role.objects.create(role_name="Sales", role_type="SALE")
+        self.user = User.objects.create_user(
+            username="seller",
+            password="pass-1234",
+            email="seller@example.com",
+            role=self.role,
+        )
+        self.user.groups.add(Group.objects.create(name="Sale"))
+
+    def _obtain(self):
+        response = APIClient().post(
+            "/api/token/", {"username": "seller", "password": "pass-1234"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def _authenticate(self, access):
+        request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {access}")
+        user, _ = RoleClaimsJWTAuthentication().authenticate(request)
+        return user
+
+    def test_principal_is_served_from_claims(self):
+        access = self._obtain()["access"]
+        self.assertEqual(AccessToken(access)["role_type"], "SALE")
+        self._authenticate(access)  # reads the claims version once
+
+        with self.assertNumQueries(0):
+            user = self._authenticate(access)
+            self.assertIsInstance(user, ClaimsUser)
+            self.assertEqual(user, self.user)
+            self.assertEqual(user.username, "seller")
+            self.assertTrue(user.is_active)
+            self.assertFalse(user.is_staff)
+            self.assertFalse(user.is_superuser)
+            self.assertEqual(user.role_id, self.role.pk)
+            self.assertEqual(user.role.role_type, "SALE")
+            self.assertEqual(user.get_group_names(), {"Sale"})
+
+        # Deferred fields are loaded together, once
+        with self.assertNumQueries(1):
+            self.assertEqual(user.email, "seller@example.com")
+            self.assertFalse(user.first_name)
+
+    def test_stale_claims_fall_back_and_refresh_restamps(self):
+        tokens = self._obtain()
+        self.role.role_type = "PRODUCTION"
+        self.role.save()
+
+        user = self._authenticate(tokens["access"])
+        self.assertNotIsInstance(user, ClaimsUser)
+        self.assertEqual(user.role.role_type, "PRODUCTION")
+
+        response = APIClient().post(
+            "/api/token/refresh/", {"refresh": tokens["refresh"]}, format="json"
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        user = self._authenticate(response.json()["access"])
+        self.assertIsInstance(user, ClaimsUser)
+        self.assertEqual(user.role.role_type, "PRODUCTION")
+
+    def test_deactivation_invalidates_claims(self):
+        access = self._obtain()["access"]
+        self.user.is_active = False
+        self.user.save(update_fields=["is_active"])
+
+        request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {access}")
+        with self.assertRaises(AuthenticationFailed):
+            RoleClaimsJWTAuthentication().authenticate(request)
+
+    def test_flags_are_not_scrambled(self):
+        self.user.is_staff = True
+        self.user.is_superuser = True
+        self.user.save()
+        access = self._obtain()["access"]
+
+        user = self._authenticate(access)
+        self.assertIsInstance(user, ClaimsUser)
+        self.assertEqual(user.username, "seller")
+        self.assertTrue(user.is_active)
+        self.assertTrue(user.is_staff)
+        self.assertTrue(user.is_superuser)
+
+    def test_inactive_principal_is_rejected(self):
+        self.user.is_active = False
+        self.user.save()
+        access = RoleClaimsRefreshToken.for_user(self.user).access_token
+
+        request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {access}")
+        with self.assertRaises(AuthenticationFailed):
+            RoleClaimsJWTAuthentication().authenticate(request)
+
+    def test_claims_version_survives_cache_clear(self):
+        stale = self._obtain()["access"]
+        self.user.groups.clear()
+        current = self._obtain()["access"]
+        cache.clear()
+
+        self.assertNotIsInstance(self._authenticate(stale), ClaimsUser)
+        user = self._authenticate(current)
+        self.assertIsInstance(user, ClaimsUser)
+        self.assertEqual(user.get_group_names(), frozenset())
+
+    def test_role_type_change_invalidates_members_only(self):
+        other = User.objects.create_user(
+            username="other", role=Role.objects.create(role_name="Ops")
+        )
+        access = self._obtain()["access"]
+        other_access = RoleClaimsRefreshToken.for_user(other).access_token
+
+        self.role.description = "Sales team"
+        self.role.save()
+        self.assertIsInstance(self._authenticate(access), ClaimsUser)
+
+        self.role.role_type = "PRODUCTION"
+        self.role.save()
+        self.assertNotIsInstance(self._authenticate(access), ClaimsUser)
+        self.assertIsInstance(self._authenticate(other_access), ClaimsUser)
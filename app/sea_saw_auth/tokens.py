@@ -0,0 +1,102 @@
+"""
+Role claims embedded in JWTs.
+
+Access tokens carry the user's role_type, group names and flags, stamped with
+the user's claims_version. RoleClaimsJWTAuthentication serves requests from
+these claims without loading User / Role rows as long as the version is
+current; a change of a claimed field, of the user's groups or of the role's
+type increments it (signals.py) and stale tokens fall back to a database
+lookup until refreshed.
+
+claims_version is a User column, so it survives cache clears and restarts;
+the cache only saves reading it on every request.
+"""
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .models import User
+
+CLAIMS_VERSION_CLAIM = "claims_version"
+
+
+class ClaimsVersion:
+    """Per-user claims_version, read through the cache."""
+
+    CACHE_PREFIX = "sea_saw_auth:claims_version"
+    CACHE_TIMEOUT = 5 * 60
+
+    @classmethod
+    def _key(cls, user_id):
+        return f"{cls.CACHE_PREFIX}:user:{user_id}"
+
+    @classmethod
+    def current(cls, user_id):
+        """Stored claims_version of ``user_id`` (None for unknown users)."""
+        key = cls._key(user_id)
+        version = cache.get(key)
+        if version is None:
+            version = (
+                User.objects.filter(pk=user_id)
+                .values_list("claims_version", flat=True)
+                .first()
+            )
+            if version is not None:
+                cache.set(key, version, cls.CACHE_TIMEOUT)
+        return version
+
+    @classmethod
+    def bump(cls, users):
+        """
+        Invalidate the claims of ``users`` (a User queryset).
+
+        Returns:
+            list[int]: Ids of the bumped users
+        """
+        user_ids = list(users.values_list("pk", flat=True))
+        if not user_ids:
+            return user_ids
+        User.objects.filter(pk__in=user_ids).update(
+            claims_version=F("claims_version") + 1
+        )
+        keys = [cls._key(user_id) for user_id in user_ids]
+        cache.delete_many(keys)
+        # Readers may have cached the old version before this transaction committed
+        transaction.on_commit(lambda: cache.delete_many(keys))
+        return user_ids
+
+
+def add_role_claims(token, user):
+    """Stamp ``user``'s identity, role and groups into ``token`` (in place)."""
+    role = user.role
+    token["username"] = user.get_username()
+    token["is_active"] = user.is_active
+    token["is_staff"] = user.is_staff
+    token["is_superuser"] = user.is_superuser
+    token["role_id"] = user.role_id
+    token["role_type"] = role.role_type if role else None
+    token["groups"] = sorted(user.get_group_names())
+    token[CLAIMS_VERSION_CLAIM] = user.claims_version
+    return token
+
+
+def has_current_claims(token):
+    """Whether ``token``'s role claims still match the user's claims_version."""
+    version = token.get(CLAIMS_VERSION_CLAIM)
+    user_id = token.get(api_settings.USER_ID_CLAIM)
+    return (
+        version is not None
+        and user_id is not None
+        and version == ClaimsVersion.current(user_id)
+    )
+
+
+class RoleClaimsRefreshToken(RefreshToken):
+    """Refresh token whose access tokens inherit the role claims."""
+
+    @classmethod
+    def for_user(cls, user):
+        return add_role_claims(super().for_user(user), user)
@@ -13,6 +13,7 @@ from sea_saw_base.metadata import BaseMetadata
 from sea_saw_auth.filters import AdminUserFilter
 from sea_saw_auth.models import User, Role
 from sea_saw_auth.serializers import (
+    RoleClaimsTokenObtainPairSerializer,
     UserSerializer,
     UserCreateSerializer,
     UserUpdateSerializer,
@@ -25,6 +26,7 @@ from sea_saw_auth.throttles import LoginRateThrottle, RegisterRateThrottle
 
 class ThrottledTokenObtainPairView(BaseTokenObtainPairView):
     throttle_classes = [LoginRateThrottle]
+    serializer_class = RoleClaimsTokenObtainPairSerializer
 
 
 class UserDetailView(APIView):
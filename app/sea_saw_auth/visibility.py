@@ -0,0 +1,108 @@
+"""
+Role Visibility - cached role-hierarchy resolver
+
+User.get_all_visible_users() 几乎在每个列表请求中调用, 原实现按角色节点逐层
+BFS (每个节点一次查询)。这里:
+- 一条 WITH RECURSIVE 查询同时算出角色闭包和可见用户 id
+- 结果按用户缓存在 Django cache 中
+- 角色树 / 用户角色变更时递增全局 generation, 旧缓存键自然失效 (见 signals.py)
+
+注意: QuerySet.update() / bulk_create() 不发送信号, 批量修改角色后需手动调用
+RoleVisibility.invalidate()。
+"""
+
+from django.core.cache import cache
+from django.db import connection
+
+from sea_saw_base.utils import CacheGeneration
+
+
+class RoleVisibility:
+    CACHE_PREFIX = "sea_saw_auth:visibility"
+    CACHE_TIMEOUT = 60 * 60
+
+    # Version of every visibility set
+    _generation = CacheGeneration(f"{CACHE_PREFIX}:generation")
+
+    # ========================
+    # SQL
+    # ========================
+    @staticmethod
+    def _tables():
+        from .models import Role, User
+
+        quote = connection.ops.quote_name
+        return {
+            "role": quote(Role._meta.db_table),
+            "user": quote(User._meta.db_table),
+            "parent_id": quote(Role._meta.get_field("parent").column),
+            "role_id": quote(User._meta.get_field("role").column),
+            "peer": quote(Role._meta.get_field("is_peer_visible").column),
+        }
+
+    @classmethod
+    def _descendants_cte(cls):
+        # UNION (not UNION ALL) also stops on accidental parent cycles
+        return (
+            "WITH RECURSIVE descendants(id) AS ("
+            " SELECT id FROM {role} WHERE {parent_id} = %s"
+            " UNION"
+            " SELECT r.id FROM {role} r"
+            " INNER JOIN descendants d ON r.{parent_id} = d.id"
+            ")"
+        ).format(**cls._tables())
+
+    @classmethod
+    def descendant_role_ids(cls, role_id):
+        """All descendant role ids of ``role_id`` (one query)."""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"{cls._descendants_cte()} SELECT id FROM descendants", [role_id]
+            )
+            return {row[0] for row in cursor.fetchall()}
+
+    @classmethod
+    def _query_visible_user_ids(cls, user):
+        if not user.role_id:
+            return frozenset([user.pk])
+
+        sql = (
+            "{cte} SELECT u.id FROM {user} u"
+            " WHERE u.id = %s"
+            " OR u.{role_id} IN (SELECT id FROM descendants)"
+            " OR (u.{role_id} = %s AND EXISTS ("
+            "  SELECT 1 FROM {role} WHERE id = %s AND {peer}"
+            " ))"
+        ).format(cte=cls._descendants_cte(), **cls._tables())
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [user.role_id, user.pk, user.role_id, user.role_id])
+            return frozenset(row[0] for row in cursor.fetchall())
+
+    # ========================
+    # Cache
+    # ========================
+    @classmethod
+    def generation(cls):
+        """Current version of every visibility set."""
+        return cls._generation.current()
+
+    @classmethod
+    def invalidate(cls):
+        """Drop every cached visibility set (role tree / user roles changed)."""
+        cls._generation.bump()
+
+    @classmethod
+    def visible_user_ids(cls, user):
+        """
+        Ids of users whose data ``user`` can see: self, users of descendant
+        roles, and users of the same role when it is peer visible.
+
+        Returns:
+            frozenset[int]
+        """
+        key = f"{cls.CACHE_PREFIX}:{cls.generation()}:user:{user.pk}"
+        user_ids = cache.get(key)
+        if user_ids is None:
+            user_ids = cls._query_visible_user_ids(user)
+            cache.set(key, user_ids, cls.CACHE_TIMEOUT)
+        return user_ids
@@ -1,8 +1,16 @@
+import copy
+from collections import OrderedDict
+
 from django_filters import Filter
+from django_filters.filters import QuerySetRequestMixin
 from django_filters.fields import DateRangeWidget, RangeField
 from django.utils.dateparse import parse_date
 from datetime import datetime, time
 from django_filters import rest_framework as filters
+from django.conf import settings
+from django.utils.datastructures import MultiValueDict
+from django.db import connections
+from rest_framework.filters import SearchFilter
 
 
 class DateTimeAwareFilter(Filter):
@@ -123,17 +131,72 @@ class BaseFilter(filters.FilterSet):
         ],
     }
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+    def __init__(self, data=None, queryset=None, *, request=None, prefix=None):
+        # Same as BaseFilterSet.__init__ (django-filter 24.3), except that the
+        # class-level filters are copied shallowly: per instance only model /
+        # parent / the lazily built form field differ, so deep-copying every
+        # filter on each request is wasted work.
+        if queryset is None:
+            queryset = self._meta.model._default_manager.all()
+        model = queryset.model
+
+        self.is_bound = data is not None
+        self.data = data or MultiValueDict()
+        self.queryset = queryset
+        self.request = request
+        self.form_prefix = prefix
+
+        self.filters = OrderedDict()
+        for name, base_filter in self.base_filters.items():
+            filter_ = copy.copy(base_filter)
+            filter_.model = model
+            filter_.parent = self
+            if filter_.method is not None:
+                # Rebind the FilterMethod proxy to the copy (and thus its parent)
+                filter_.method = filter_.method
+            self.filters[name] = filter_
+
+    def get_form_class(self):
+        """
+        Form class built once per FilterSet subclass.
+
+        Form instances deep-copy their base fields, so sharing the class is
+        safe unless a filter builds its field from the request.
+        """
+        cls = type(self)
+        form_class = cls.__dict__.get("_compiled_form_class")
+        if form_class is None:
+            form_class = super().get_form_class()
+            if not any(
+                isinstance(filter_, QuerySetRequestMixin)
+                for filter_ in self.filters.values()
+            ):
+                cls._compiled_form_class = form_class
+        return form_class
 
-        filter_fields = getattr(self, "filter_fields", {})
+    @classmethod
+    def get_filters(cls):
+        """
+        Declared / Meta filters plus the ``filter_fields`` expansion.
+
+        Called once per subclass by FilterSetMetaclass, so the dynamic filters
+        live in ``base_filters`` instead of being rebuilt on every instance.
+        """
+        base_filters = super().get_filters()
+        base_filters.update(cls.build_dynamic_filters())
+        return base_filters
+
+    @classmethod
+    def build_dynamic_filters(cls):
+        dynamic = {}
+        filter_fields = getattr(cls, "filter_fields", {})
 
         for field, options in filter_fields.items():
             filter_type = options.get("filter_type", filters.CharFilter)
             lookup_exprs = options.get("lookup_expr", ["exact"])
 
             if "__all__" in lookup_exprs:
-                lookup_exprs = self.filter_mapper.get(filter_type, [])
+                lookup_exprs = cls.filter_mapper.get(filter_type, [])
 
             for expr in lookup_exprs:
                 is_exclude = expr.endswith("_ex")
@@ -146,27 +209,58 @@ class BaseFilter(filters.FilterSet):
                         filter_type == filters.DateFilter
                         or filter_type == DateTimeAwareFilter
                     ):
-                        self.filters[filter_name] = filters.DateFromToRangeFilter(
+                        dynamic[filter_name] = filters.DateFromToRangeFilter(
                             field_name=field, lookup_expr=actual_expr
                         )
                     else:
-                        self.filters[filter_name] = filters.NumericRangeFilter(
+                        dynamic[filter_name] = filters.NumericRangeFilter(
                             field_name=f"{field}__pk", lookup_expr=actual_expr
                         )
                 elif actual_expr == "isnull" or actual_expr == "isnull_ex":
-                    self.filters[filter_name] = filters.BooleanFilter(
+                    dynamic[filter_name] = filters.BooleanFilter(
                         field_name=field, lookup_expr=actual_expr, exclude=is_exclude
                     )
                 elif filter_type == filters.BaseInFilter:
-                    self.filters[filter_name] = filters.BaseInFilter(
+                    dynamic[filter_name] = filters.BaseInFilter(
                         field_name=field, lookup_expr=actual_expr
                     )
                 else:
-                    self.filters[filter_name] = filter_type(
+                    dynamic[filter_name] = filter_type(
                         field_name=field,
                         lookup_expr=actual_expr,
                         exclude=is_exclude,
                     )
 
+        return dynamic
+
     class Meta:
         abstract = True
+
+
+class SearchDocumentFilter(SearchFilter):
+    """
+    SearchFilter matching ``?search=`` against the model's search_document.
+
+    Each term must appear in the document (LIKE '%term%', served by the
+    pg_trgm GIN index on PostgreSQL). Models without SearchDocumentMixin, and
+    databases other than PostgreSQL under SEARCH_BACKEND="auto", keep the
+    field-by-field behaviour of SearchFilter over ``search_fields``.
+    """
+
+    def use_search_document(self, queryset):
+        from .models import SearchDocumentMixin
+
+        if not issubclass(queryset.model, SearchDocumentMixin):
+            return False
+        backend = getattr(settings, "SEARCH_BACKEND", "auto")
+        if backend == "auto":
+            return connections[queryset.db].vendor == "postgresql"
+        return backend == "document"
+
+    def filter_queryset(self, request, queryset, view):
+        if not self.use_search_document(queryset):
+            return super().filter_queryset(request, queryset, view)
+
+        for term in self.get_search_terms(request):
+            queryset = queryset.filter(search_document__contains=term.lower())
+        return queryset
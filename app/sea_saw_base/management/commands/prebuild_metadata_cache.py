@@ -0,0 +1,108 @@
+"""
+Management command to warm the OPTIONS metadata cache at deploy time.
+
+Drops previously cached metadata (serializers may have changed with the
+deploy), then sends an OPTIONS request to every list route whose view uses
+BaseMetadata, once per role type / staff flag / configured language.
+
+Usage:
+    python manage.py prebuild_metadata_cache
+    python manage.py prebuild_metadata_cache --role ADMIN --role SALE
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.urls import NoReverseMatch, URLResolver, get_resolver, reverse
+from django.utils import translation
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from sea_saw_auth.models import Role, RoleType, User
+from sea_saw_base.metadata import BaseMetadata, MetadataCache
+
+
+def iter_metadata_routes(resolver=None, namespace=None):
+    """Yield (path, view callback) of reversible routes using BaseMetadata."""
+    resolver = resolver or get_resolver()
+    for pattern in resolver.url_patterns:
+        if isinstance(pattern, URLResolver):
+            child_namespace = namespace
+            if pattern.namespace:
+                child_namespace = (
+                    f"{namespace}:{pattern.namespace}" if namespace else pattern.namespace
+                )
+            yield from iter_metadata_routes(pattern, child_namespace)
+            continue
+
+        view_class = getattr(pattern.callback, "cls", None)
+        metadata_class = getattr(view_class, "metadata_class", None)
+        if not pattern.name or not (
+            isinstance(metadata_class, type) and issubclass(metadata_class, BaseMetadata)
+        ):
+            continue
+
+        name = f"{namespace}:{pattern.name}" if namespace else pattern.name
+        try:
+            yield reverse(name), pattern.callback
+        except NoReverseMatch:
+            # Detail routes need a pk; their metadata is not cached
+            continue
+
+
+class Command(BaseCommand):
+    help = "Invalidate and prebuild cached OPTIONS metadata of list endpoints"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--role",
+            action="append",
+            dest="roles",
+            choices=RoleType.values,
+            help="Role type to warm (repeatable); all role types if omitted",
+        )
+        parser.add_argument(
+            "--no-invalidate",
+            action="store_true",
+            help="Keep entries cached before this run",
+        )
+
+    def handle(self, *args, **options):
+        if not options["no_invalidate"]:
+            MetadataCache.invalidate()
+
+        routes = {}
+        for path, callback in iter_metadata_routes():
+            routes.setdefault(path, callback)
+
+        users = [
+            User(
+                username=f"metadata-{role_type.lower()}",
+                role=Role(role_type=role_type),
+                is_staff=is_staff,
+            )
+            for role_type in options["roles"] or RoleType.values
+            for is_staff in (False, True)
+        ]
+
+        factory = APIRequestFactory()
+        warmed = failed = 0
+        for language, _ in settings.LANGUAGES:
+            with translation.override(language):
+                for path, callback in sorted(routes.items()):
+                    for user in users:
+                        request = factory.options(path)
+                        force_authenticate(request, user=user)
+                        try:
+                            response = callback(request)
+                        except Exception as exc:  # noqa: BLE001 - report and go on
+                            failed += 1
+                            self.stderr.write(f"  {path} ({user.username}): {exc}")
+                            continue
+                        if response.status_code == 200:
+                            warmed += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Done. Warmed {warmed} metadata response(s) "
+                f"across {len(routes)} route(s); {failed} failed."
+            )
+        )
@@ -0,0 +1,48 @@
+"""
+Management command to rebuild the search_document column of every model
+using SearchDocumentMixin (after bulk imports or raw SQL edits).
+
+Usage:
+    python manage.py rebuild_search_documents
+    python manage.py rebuild_search_documents --model sea_saw_sales.Order
+"""
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from sea_saw_base.models import SearchDocumentMixin
+
+
+class Command(BaseCommand):
+    help = "Rebuild search documents used by the list endpoint ?search= filter"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--model",
+            action="append",
+            dest="models",
+            help="app_label.ModelName to rebuild (repeatable); all models if omitted",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Rows written per UPDATE batch",
+        )
+
+    def handle(self, *args, **options):
+        if options["models"]:
+            try:
+                models = [apps.get_model(label) for label in options["models"]]
+            except (LookupError, ValueError) as exc:
+                raise CommandError(str(exc))
+        else:
+            models = apps.get_models()
+
+        for model in models:
+            if not issubclass(model, SearchDocumentMixin):
+                continue
+            updated = model.rebuild_search_documents(batch_size=options["batch_size"])
+            self.stdout.write(f"  {model._meta.label}: {updated} document(s) updated")
+
+        self.stdout.write(self.style.SUCCESS("Done."))
@@ -1,17 +1,25 @@
 """
-Management command to reset PostgreSQL sequences for all tables.
+Management command to reset PostgreSQL sequences for all tables,
+and to realign document code counters (CodeSequence) with stored codes.
 
 Usage:
     python manage.py reset_sequences
     python manage.py reset_sequences --table sea_saw_attachment_attachment
+    python manage.py reset_sequences --codes-only
 """
 
+from django.apps import apps
 from django.core.management.base import BaseCommand
-from django.db import connection
+from django.db import connection, transaction
+
+from sea_saw_base.models import SequentialCodeMixin
 
 
 class Command(BaseCommand):
-    help = "Reset PostgreSQL sequences to max(id) for all tables (or a specific table)"
+    help = (
+        "Reset PostgreSQL sequences to max(id) for all tables (or a specific table) "
+        "and resync document code sequences"
+    )
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -19,10 +27,27 @@ class Command(BaseCommand):
             type=str,
             help="Only reset the sequence for this specific table name",
         )
+        parser.add_argument(
+            "--codes-only",
+            action="store_true",
+            help="Only resync document code sequences (works on any database)",
+        )
+        parser.add_argument(
+            "--skip-codes",
+            action="store_true",
+            help="Do not resync document code sequences",
+        )
 
     def handle(self, *args, **options):
         specific_table = options.get("table")
 
+        if not options.get("codes_only"):
+            self.reset_table_sequences(specific_table)
+
+        if not options.get("skip_codes") and not specific_table:
+            self.resync_code_sequences()
+
+    def reset_table_sequences(self, specific_table=None):
         with connection.cursor() as cursor:
             if specific_table:
                 tables = [specific_table]
@@ -64,3 +89,21 @@ class Command(BaseCommand):
         self.stdout.write(
             self.style.SUCCESS(f"Done. Reset {reset_count} sequence(s).")
         )
+
+    def resync_code_sequences(self):
+        synced = 0
+        with transaction.atomic():
+            for model in apps.get_models():
+                if not issubclass(model, SequentialCodeMixin) or not model.code_prefix:
+                    continue
+
+                last_values = model.resync_code_sequences()
+                for year, value in sorted(last_values.items()):
+                    self.stdout.write(
+                        f"  {model.code_prefix}{year}: code sequence reset to {value}"
+                    )
+                    synced += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Done. Resynced {synced} code sequence(s).")
+        )
@@ -1,3 +1,4 @@
 from .base_model_manager import BaseModelManager
+from .code_sequence_manager import CodeSequenceManager
 
-__all__ = ["BaseModelManager"]
+__all__ = ["BaseModelManager", "CodeSequenceManager"]
@@ -0,0 +1,66 @@
+from django.db import IntegrityError, models, transaction
+
+
+class CodeSequenceManager(models.Manager):
+    """
+    Allocator for per-prefix / per-year document code counters.
+
+    - allocate(): row-locked increment (SELECT ... FOR UPDATE), one round trip
+      for any number of codes
+    - resync(): move a counter to the highest value already used
+    """
+
+    # ----------------------
+    # ALLOCATE
+    # ----------------------
+    def allocate(self, prefix, year, count=1, seed=None):
+        """
+        Reserve ``count`` consecutive values and return the first one.
+
+        Args:
+            prefix: Code prefix, e.g. "SO"
+            year: Sequence year
+            count: Number of values to reserve
+            seed: Optional callable returning the last used value; only called
+                  the first time a (prefix, year) counter is created
+
+        Returns:
+            int: First reserved value (the range is [first, first + count))
+        """
+        if count < 1:
+            raise ValueError("count must be >= 1")
+
+        with transaction.atomic():
+            sequence = self._get_locked(prefix, year, seed)
+            first = sequence.last_value + 1
+            sequence.last_value += count
+            sequence.save(update_fields=["last_value"])
+        return first
+
+    def _get_locked(self, prefix, year, seed):
+        queryset = self.select_for_update()
+        try:
+            return queryset.get(prefix=prefix, year=year)
+        except self.model.DoesNotExist:
+            pass
+
+        # First allocation for this (prefix, year): create the counter, racing
+        # creators fall back to locking the row that won
+        try:
+            with transaction.atomic():
+                self.create(
+                    prefix=prefix, year=year, last_value=seed() if seed else 0
+                )
+        except IntegrityError:
+            pass
+        return queryset.get(prefix=prefix, year=year)
+
+    # ----------------------
+    # RESYNC
+    # ----------------------
+    def resync(self, prefix, year, last_value):
+        """Set the counter to ``last_value`` (creating it if needed)."""
+        sequence, _ = self.update_or_create(
+            prefix=prefix, year=year, defaults={"last_value": last_value}
+        )
+        return sequence
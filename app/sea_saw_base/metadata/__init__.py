@@ -3,5 +3,6 @@
 """
 
 from .base_metadata import BaseMetadata
+from .metadata_cache import MetadataCache
 
-__all__ = ["BaseMetadata"]
+__all__ = ["BaseMetadata", "MetadataCache"]
@@ -1,7 +1,6 @@
 import re
 from collections import defaultdict
 
-from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import PermissionDenied
 from django.http import Http404
 from django.utils.encoding import force_str
@@ -11,7 +10,9 @@ from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import exceptions, serializers
 from rest_framework.metadata import SimpleMetadata
 from rest_framework.request import clone_request
-from sea_saw_base.models import Field
+from sea_saw_base.utils import ContentTypeRegistry
+
+from .metadata_cache import MetadataCache
 
 
 class BaseMetadata(SimpleMetadata):
@@ -51,11 +52,19 @@ class BaseMetadata(SimpleMetadata):
     def __init__(self):
         super().__init__()
         self.filter_info = {}
+        self._model_field_info = None
 
     # =====================================================
     # Entry
     # =====================================================
     def determine_metadata(self, request, view):
+        # List-route responses are cached per (view, role, language, Field
+        # generation); see MetadataCache
+        return MetadataCache.get_or_build(
+            request, view, lambda: self.build_metadata(request, view)
+        )
+
+    def build_metadata(self, request, view):
         metadata = super().determine_metadata(request, view)
         metadata["actions"] = self.determine_actions(request, view)
         return metadata
@@ -141,11 +150,8 @@ class BaseMetadata(SimpleMetadata):
         model = getattr(serializer.Meta, "model", None)
         model_field_info = {}
         if model:
-            content_type = ContentType.objects.get_for_model(model)
-            model_field_info = {
-                field.field_name: field.extra_info
-                for field in Field.objects.filter(content_type=content_type)
-            }
+            content_type = ContentTypeRegistry.get_for_model(model)
+            model_field_info = self.get_model_field_info().get(content_type.pk, {})
 
         for field_name, field in serializer.fields.items():
             if isinstance(field, serializers.HiddenField):
@@ -166,6 +172,17 @@ class BaseMetadata(SimpleMetadata):
 
         return ret
 
+    def get_model_field_info(self):
+        """
+        Field.extra_info of every model, resolved once per metadata build.
+
+        Returns:
+            dict: content_type_id → {field_name: extra_info}
+        """
+        if self._model_field_info is None:
+            self._model_field_info = ContentTypeRegistry.field_extra_info()
+        return self._model_field_info
+
     def get_field_info(self, field):
         """
         Given an instance of a serializer field, return a dictionary
@@ -0,0 +1,65 @@
+"""
+Metadata Cache - cached OPTIONS responses of BaseMetadata views
+
+前端每次打开列表页都会发送 OPTIONS, BaseMetadata 需要遍历整个嵌套序列化器树、
+实例化 FilterSet 并按模型查询 Field 表。列表路由的 OPTIONS 结果只取决于:
+- 视图类
+- 用户角色 (权限决定暴露 POST / PUT 哪些 actions, 以及按角色选择的序列化器)
+- 语言 (label / help_text / choices 为翻译字符串)
+- Field 表内容 (extra_info 合并进字段信息)
+
+因此按 (视图类, 角色, 语言, Field generation) 缓存。Field 行变更时
+(FieldListView / admin, 见 signals.py) 递增 generation 使旧键失效;
+prebuild_metadata_cache 命令在部署时递增 generation 并预热。
+
+详情路由 (带 pk) 的 PUT actions 依赖对象级权限, 不缓存。
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import translation
+
+from ..utils.cache_generation import CacheGeneration
+
+
+class MetadataCache:
+    """Versioned cache of BaseMetadata.determine_metadata() results."""
+
+    CACHE_PREFIX = "sea_saw_base:metadata"
+    generation = CacheGeneration(f"{CACHE_PREFIX}:generation")
+
+    @classmethod
+    def invalidate(cls):
+        """Drop every cached metadata response (Field rows / code changed)."""
+        cls.generation.bump()
+
+    @staticmethod
+    def role_of(user):
+        """Cache scope of ``user``: role type, plus staff / superuser flags."""
+        role_type = getattr(getattr(user, "role", None), "role_type", None)
+        flags = "su" if user.is_superuser else "staff" if user.is_staff else "user"
+        return f"{role_type}:{flags}"
+
+    @classmethod
+    def key_for(cls, request, view):
+        """Cache key of an OPTIONS request, or None if it must not be cached."""
+        if view.kwargs or not request.user.is_authenticated:
+            return None
+        view_class = type(view)
+        return (
+            f"{cls.CACHE_PREFIX}:{cls.generation.current()}:"
+            f"{view_class.__module__}.{view_class.__qualname__}:"
+            f"{cls.role_of(request.user)}:{translation.get_language()}"
+        )
+
+    @classmethod
+    def get_or_build(cls, request, view, build):
+        key = cls.key_for(request, view)
+        if key is None:
+            return build()
+
+        metadata = cache.get(key)
+        if metadata is None:
+            metadata = build()
+            cache.set(key, metadata, settings.METADATA_CACHE_TIMEOUT)
+        return metadata
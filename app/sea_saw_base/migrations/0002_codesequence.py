@@ -0,0 +1,27 @@
+# Generated by Django 5.1.2 on 2026-10-17 00:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sea_saw_base', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CodeSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('prefix', models.CharField(help_text='Code prefix, e.g. SO / PO / PL.', max_length=20, verbose_name='Prefix')),
+                ('year', models.PositiveIntegerField(help_text='Sequence year; counters restart every year.', verbose_name='Year')),
+                ('last_value', models.PositiveBigIntegerField(default=0, help_text='Last allocated sequence value.', verbose_name='Last Value')),
+            ],
+            options={
+                'verbose_name': 'Code Sequence',
+                'verbose_name_plural': 'Code Sequences',
+                'constraints': [models.UniqueConstraint(fields=('prefix', 'year'), name='unique_code_sequence_prefix_year')],
+            },
+        ),
+    ]
@@ -4,10 +4,15 @@ Common reusable mixins for ViewSets and Serializers
 from .return_related_mixin import ReturnRelatedMixin
 from .multipart_nested import MultipartNestedDataMixin
 from .views_mixins import RoleFilterMixin, DjangoFilterMixin
+from .prefetch_plan import PrefetchPlan, PrefetchPlanMixin
+from .object_memo import MemoizedObjectMixin
 
 __all__ = [
     "ReturnRelatedMixin",
     "MultipartNestedDataMixin",
     "RoleFilterMixin",
     "DjangoFilterMixin",
+    "PrefetchPlan",
+    "PrefetchPlanMixin",
+    "MemoizedObjectMixin",
 ]
@@ -0,0 +1,38 @@
+"""
+Object Memo - one lookup of the detail object per request
+
+Access policy conditions (e.g. OrderAccessPolicy.*_can_view_object), object
+permissions and handlers (update → perform_update) each call
+view.get_object(); without a memo every call re-runs get_queryset /
+filter_queryset and fetches the same row again.
+
+MemoizedObjectMixin fetches the object once per lookup value and shares it
+for the rest of the request. Object permissions are still checked on every
+call, since the request may have been cloned for another method
+(BaseMetadata.determine_actions checks PUT this way).
+"""
+
+from django.shortcuts import get_object_or_404
+
+
+class MemoizedObjectMixin:
+    """GenericAPIView mixin: get_object() queries the database once per lookup."""
+
+    _object_memo = None
+
+    def get_object(self):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        assert lookup_url_kwarg in self.kwargs, (
+            f"Expected view {type(self).__name__} to be called with a URL keyword "
+            f'argument named "{lookup_url_kwarg}".'
+        )
+        lookup_value = self.kwargs[lookup_url_kwarg]
+
+        if self._object_memo is None or self._object_memo[0] != lookup_value:
+            queryset = self.filter_queryset(self.get_queryset())
+            obj = get_object_or_404(queryset, **{self.lookup_field: lookup_value})
+            self._object_memo = (lookup_value, obj)
+
+        obj = self._object_memo[1]
+        self.check_object_permissions(self.request, obj)
+        return obj
@@ -0,0 +1,190 @@
+"""
+Prefetch Plan - derive select_related / Prefetch trees from serializers
+
+序列化器声明了要输出哪些关联数据, 这里按序列化器字段反推查询计划:
+- 单值关联 (FK / OneToOne / 反向 OneToOne)   → select_related
+- 多值关联 (反向 FK / M2M / GenericRelation) → Prefetch(queryset=...) 递归
+- 点号 source (如 "owner.username")           → 按路径 select_related
+
+SerializerMethodField 无法推断, 序列化器可通过类属性补充:
+- select_related_hints = ["pipeline"]
+- prefetch_related_hints = ["related_object"]   (支持 GenericForeignKey)
+- setup_prefetch_queryset(cls, queryset)      (classmethod, 如需 annotate,
+  该关联改为 Prefetch 并使用返回的 queryset)
+"""
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.relations import (
+    ManyRelatedField,
+    PrimaryKeyRelatedField,
+    RelatedField,
+)
+
+
+class PrefetchPlan:
+    """
+    Query plan for one model: select_related paths plus nested Prefetch plans.
+
+    ``prefetch`` maps a lookup (relative to ``model``) to a child PrefetchPlan,
+    or to None for plain string lookups (e.g. GenericForeignKey).
+    """
+
+    def __init__(self, model, queryset_hook=None):
+        self.model = model
+        self.queryset_hook = queryset_hook
+        self.select_related = set()
+        self.prefetch = {}
+
+    # ========================
+    # Build
+    # ========================
+    @classmethod
+    def from_serializer(cls, serializer, model=None):
+        """Build a plan from a serializer instance (or a ListSerializer)."""
+        if isinstance(serializer, serializers.ListSerializer):
+            serializer = serializer.child
+        model = model or serializer.Meta.model
+        plan = cls(model)
+        plan._walk(serializer, model, "")
+        return plan
+
+    def _walk(self, serializer, model, prefix):
+        for lookup in getattr(serializer, "select_related_hints", ()):
+            self._add_path(model, prefix, lookup.split("__"), None)
+
+        for lookup in getattr(serializer, "prefetch_related_hints", ()):
+            self.prefetch.setdefault(prefix + lookup, None)
+
+        for field in serializer.fields.values():
+            if field.write_only:
+                continue
+
+            if isinstance(field, serializers.ListSerializer):
+                nested = field.child
+            elif isinstance(field, serializers.BaseSerializer):
+                nested = field
+            else:
+                nested = None
+
+            attrs = field.source_attrs
+            if not attrs:
+                # source="*": nested serializer over the same object
+                if nested is not None:
+                    self._walk(nested, model, prefix)
+                continue
+
+            # PrimaryKeyRelatedField only reads "<fk>_id", no query needed
+            if isinstance(field, PrimaryKeyRelatedField) and len(attrs) == 1:
+                continue
+
+            # Plain attribute on this model
+            if (
+                nested is None
+                and len(attrs) == 1
+                and not isinstance(field, (RelatedField, ManyRelatedField))
+            ):
+                continue
+
+            self._add_path(model, prefix, attrs, nested)
+
+    def _add_path(self, model, prefix, attrs, nested):
+        for index, attr in enumerate(attrs):
+            try:
+                model_field = model._meta.get_field(attr)
+            except FieldDoesNotExist:
+                # property / method: nothing more can be inferred
+                return
+            if not model_field.is_relation:
+                return
+
+            path = prefix + "__".join(attrs[: index + 1])
+            related_model = model_field.related_model
+
+            # GenericForeignKey: only plain string prefetch is supported
+            if related_model is None:
+                self.prefetch.setdefault(path, None)
+                return
+
+            remaining = attrs[index + 1 :]
+            hook = getattr(nested, "setup_prefetch_queryset", None) if not remaining else None
+
+            if model_field.one_to_many or model_field.many_to_many or hook:
+                child = self.prefetch.get(path)
+                if child is None:
+                    child = PrefetchPlan(related_model, queryset_hook=hook)
+                    self.prefetch[path] = child
+                if remaining:
+                    child._add_path(related_model, "", remaining, nested)
+                elif nested is not None:
+                    child._walk(nested, related_model, "")
+                return
+
+            self.select_related.add(path)
+            model = related_model
+
+        if nested is not None:
+            self._walk(nested, model, prefix + "__".join(attrs) + "__")
+
+    # ========================
+    # Apply
+    # ========================
+    def apply(self, queryset):
+        """Apply this plan to a queryset of ``self.model``."""
+        if self.queryset_hook:
+            queryset = self.queryset_hook(queryset)
+
+        if self.select_related:
+            queryset = queryset.select_related(*sorted(self.select_related))
+
+        lookups = []
+        for lookup, child in sorted(self.prefetch.items()):
+            if child is None:
+                lookups.append(lookup)
+            else:
+                lookups.append(
+                    Prefetch(
+                        lookup,
+                        queryset=child.apply(child.model._default_manager.all()),
+                    )
+                )
+        if lookups:
+            queryset = queryset.prefetch_related(*lookups)
+
+        return queryset
+
+
+class PrefetchPlanMixin:
+    """
+    ViewSet mixin applying the serializer-derived PrefetchPlan in get_queryset().
+
+    Works with role-based ``get_serializer_class()``: each serializer class
+    gets its own plan, built once and cached on the view class.
+
+    Configuration:
+    - prefetch_plan_actions: actions the plan is applied to (read actions by
+      default; write paths keep plain querysets so nested writes never see
+      stale prefetch caches)
+    """
+
+    prefetch_plan_actions = {"list", "retrieve"}
+
+    def get_prefetch_plan(self):
+        serializer_class = self.get_serializer_class()
+        cache = self.__class__.__dict__.get("_prefetch_plan_cache")
+        if cache is None:
+            cache = {}
+            setattr(self.__class__, "_prefetch_plan_cache", cache)
+
+        plan = cache.get(serializer_class)
+        if plan is None:
+            plan = PrefetchPlan.from_serializer(serializer_class())
+            cache[serializer_class] = plan
+        return plan
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if getattr(self, "action", None) not in self.prefetch_plan_actions:
+            return queryset
+        return self.get_prefetch_plan().apply(queryset)
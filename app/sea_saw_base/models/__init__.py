@@ -10,6 +10,13 @@ from .base_attachment import BaseAttachment
 from .base_order import AbstractOrderBase
 from .base_item import AbstarctItemBase
 from .field import Field, FieldType
+from .code_sequence import CodeSequence, SequentialCodeMixin
+from .field_tracking import FieldTrackingMixin
+from .search_document import (
+    SearchDocumentMixin,
+    follow_related_changes,
+    search_document_field,
+)
 from .enums import (
     UnitType,
     CurrencyType,
@@ -23,6 +30,12 @@ __all__ = [
     "BaseAttachment",
     "Field",
     "FieldType",
+    "CodeSequence",
+    "SequentialCodeMixin",
+    "FieldTrackingMixin",
+    "SearchDocumentMixin",
+    "search_document_field",
+    "follow_related_changes",
     # Abstract Models
     "AbstractOrderBase",
     "AbstarctItemBase",
@@ -0,0 +1,64 @@
+"""
+Field Tracking - detect field changes without re-reading the row
+
+Sub-entity signals used to fetch the stored row in pre_save
+(``Model.all_objects.get(pk=...)``) just to compare its status, doubling
+the queries of every save. FieldTrackingMixin remembers the loaded values
+of ``tracked_fields`` when the instance comes from the database (from_db),
+so post_save receivers can ask ``instance.has_changed("status")`` for free.
+
+Loaded values are re-recorded after each save() / refresh_from_db(), so a
+second save compares against what the first one wrote.
+"""
+
+
+class FieldTrackingMixin:
+    """
+    Model mixin tracking changes of ``tracked_fields`` since load / last save.
+
+    Subclasses set:
+    - tracked_fields: e.g. ("status",)
+    """
+
+    tracked_fields = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._remember_loaded_values()
+        return instance
+
+    def _remember_loaded_values(self, fields=None):
+        loaded = self.__dict__.setdefault("_loaded_values", {})
+        for name in self.tracked_fields:
+            attname = self._meta.get_field(name).attname
+            if (fields is None or name in fields or attname in fields) and (
+                attname in self.__dict__
+            ):
+                loaded[name] = self.__dict__[attname]
+
+    def loaded_value(self, name, default=None):
+        """Value of tracked field ``name`` when loaded / last saved."""
+        return self.__dict__.get("_loaded_values", {}).get(name, default)
+
+    def has_changed(self, name):
+        """
+        Whether tracked field ``name`` differs from its loaded / last saved value.
+
+        Unsaved instances and fields that were never loaded (deferred) report
+        no change.
+        """
+        loaded = self.__dict__.get("_loaded_values", {})
+        if name not in loaded:
+            return False
+        attname = self._meta.get_field(name).attname
+        return self.__dict__.get(attname, loaded[name]) != loaded[name]
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # post_save receivers have seen the old values by now
+        self._remember_loaded_values(kwargs.get("update_fields"))
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using, fields, from_queryset)
+        self._remember_loaded_values(fields)
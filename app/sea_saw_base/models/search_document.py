@@ -0,0 +1,192 @@
+"""
+Search Document - Denormalized, trigram-indexed search text per record
+
+列表接口的 SearchFilter 会把 search_fields 编译成跨 JOIN 的 icontains OR 条件,
+无法使用索引。SearchDocumentMixin 在 save() 时把这些字段 (含关联字段, 如
+order.order_code / contact.name) 拼接成一列小写文本 search_document;
+PostgreSQL 上该列建有 pg_trgm GIN 索引 (见 search_document_operations),
+SearchDocumentFilter 对其做 LIKE '%term%' 查询即可命中索引。
+
+关联对象变更 (例如联系人改名) 通过 follow_related_changes() 在各应用的
+signals 中登记, 变更时调用 rebuild_search_documents() 刷新;
+全量重建使用 rebuild_search_documents 命令。
+"""
+
+from django.db import migrations, models
+from django.db.models.signals import post_init, post_save
+from django.utils.translation import gettext_lazy as _
+
+SEPARATOR = "\n"
+
+
+def build_search_document(instance, sources):
+    """Join the values at ``sources`` (attribute paths) into one lower-cased text."""
+    values = []
+    for path in sources:
+        value = instance
+        for attr in path.split("."):
+            # Missing reverse one-to-one raises an AttributeError subclass
+            value = getattr(value, attr, None)
+            if value is None:
+                break
+        if value not in (None, ""):
+            values.append(str(value))
+    return SEPARATOR.join(values).lower()
+
+
+def _related_paths(sources):
+    """select_related() paths needed to build documents in bulk."""
+    return sorted(
+        {path.rsplit(".", 1)[0].replace(".", "__") for path in sources if "." in path}
+    )
+
+
+def search_document_field():
+    return models.TextField(
+        blank=True,
+        default="",
+        editable=False,
+        verbose_name=_("Search Document"),
+        help_text=_("Lower-cased search text maintained on save."),
+    )
+
+
+class SearchDocumentMixin:
+    """
+    Model mixin maintaining ``search_document`` from ``search_document_sources``.
+
+    Subclasses set:
+    - search_document_sources: attribute paths, e.g. ("order_code", "contact.name")
+    - search_document = search_document_field()
+    """
+
+    search_document_sources = ()
+
+    @classmethod
+    def _search_document_roots(cls):
+        """Concrete field names the document depends on (first path segment)."""
+        roots = set()
+        for path in cls.search_document_sources:
+            field = cls._meta.get_field(path.split(".", 1)[0])
+            roots.update({field.name, field.attname})
+        return roots
+
+    def build_search_document(self):
+        return build_search_document(self, self.search_document_sources)
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None:
+            self.search_document = self.build_search_document()
+        elif self._search_document_roots().intersection(update_fields):
+            document = self.build_search_document()
+            if document != self.search_document:
+                self.search_document = document
+                kwargs["update_fields"] = [*update_fields, "search_document"]
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def rebuild_search_documents(cls, queryset=None, *, batch_size=500):
+        """
+        Recompute documents of ``queryset`` (all rows if None), writing changed ones.
+
+        Returns:
+            int: Number of rows updated
+        """
+        if queryset is None:
+            queryset = cls._base_manager.all()
+        queryset = queryset.select_related(*_related_paths(cls.search_document_sources))
+        queryset = queryset.order_by("pk")
+
+        changed = []
+        updated = 0
+        for instance in queryset.iterator(chunk_size=batch_size):
+            document = instance.build_search_document()
+            if document != instance.search_document:
+                instance.search_document = document
+                changed.append(instance)
+            if len(changed) >= batch_size:
+                updated += cls._base_manager.bulk_update(changed, ["search_document"])
+                changed = []
+        if changed:
+            updated += cls._base_manager.bulk_update(changed, ["search_document"])
+        return updated
+
+
+# (source model, field) → [(dependent model, lookup to the source)]
+_followed = {}
+
+
+def follow_related_changes(dependent, source, field, lookup):
+    """
+    Rebuild ``dependent`` documents when ``source.<field>`` changes.
+
+    Example: follow_related_changes(Order, Contact, "name", "contact")
+    """
+    key = (source, field)
+    if key not in _followed:
+        _followed[key] = []
+        loaded_attr = f"_search_loaded_{field}"
+
+        def remember(sender, instance, **kwargs):
+            # __dict__ lookup: never triggers a query for deferred fields
+            setattr(instance, loaded_attr, instance.__dict__.get(field))
+
+        def rebuild(sender, instance, created, **kwargs):
+            current = getattr(instance, field)
+            if not created and getattr(instance, loaded_attr, None) != current:
+                for model, related_lookup in _followed[key]:
+                    model.rebuild_search_documents(
+                        model._base_manager.filter(**{related_lookup: instance.pk})
+                    )
+            setattr(instance, loaded_attr, current)
+
+        post_init.connect(remember, sender=source, weak=False)
+        post_save.connect(rebuild, sender=source, weak=False)
+
+    _followed[key].append((dependent, lookup))
+
+
+def search_document_operations(app_label, model_name, sources, index_name):
+    """
+    Migration operations for a newly added ``search_document`` column:
+    backfill existing rows, then add a pg_trgm GIN index on PostgreSQL.
+
+    ``sources`` is frozen in the migration (historical models have no mixin).
+    The index is skipped on other databases, where SearchDocumentFilter keeps
+    the field-by-field SearchFilter.
+    """
+
+    def backfill(apps, schema_editor):
+        model = apps.get_model(app_label, model_name)
+        queryset = model._base_manager.select_related(*_related_paths(sources))
+        batch = []
+        for instance in queryset.order_by("pk").iterator(chunk_size=500):
+            instance.search_document = build_search_document(instance, sources)
+            batch.append(instance)
+            if len(batch) >= 500:
+                model._base_manager.bulk_update(batch, ["search_document"])
+                batch = []
+        if batch:
+            model._base_manager.bulk_update(batch, ["search_document"])
+
+    def create_index(apps, schema_editor):
+        if schema_editor.connection.vendor != "postgresql":
+            return
+        table = apps.get_model(app_label, model_name)._meta.db_table
+        # Shared by several apps: created if missing, never dropped here
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS "{index_name}" ON "{table}" '
+            f'USING gin ("search_document" gin_trgm_ops)'
+        )
+
+    def drop_index(apps, schema_editor):
+        if schema_editor.connection.vendor != "postgresql":
+            return
+        schema_editor.execute(f'DROP INDEX IF EXISTS "{index_name}"')
+
+    return [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+        migrations.RunPython(create_index, drop_index),
+    ]
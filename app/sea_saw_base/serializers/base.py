@@ -4,6 +4,8 @@ from drf_writable_nested.serializers import WritableNestedModelSerializer
 from rest_framework import serializers
 from rest_framework.serializers import ListSerializer
 
+from ..utils import DeferredRecompute
+
 DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
 DATE_FORMAT = "%Y-%m-%d"
 
@@ -181,6 +183,18 @@ class BaseSerializer(WritableNestedModelSerializer):
 
         return instance
 
+    # --------------------------
+    # Save
+    # --------------------------
+    def save(self, **kwargs):
+        """
+        Nested item saves only mark their parents dirty; order / purchase
+        totals and pipeline summaries are recomputed once, in the same
+        transaction, when the outermost save() returns.
+        """
+        with DeferredRecompute.scope():
+            return super().save(**kwargs)
+
     # --------------------------
     # Create
     # --------------------------
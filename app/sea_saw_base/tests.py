@@ -1,3 +1,366 @@
-from django.test import TestCase
+import time
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from sea_saw_auth.models import Role, User
+from sea_saw_crm.filters import AccountFilter
+from sea_saw_crm.models import Account, Contact
+from sea_saw_finance.models import Payment, PaymentType
+from sea_saw_pipeline.models import Pipeline
+from sea_saw_procurement.models import PurchaseOrder
+from sea_saw_production.models import ProductionOrder
+from sea_saw_sales.filters import OrderFilter
+from sea_saw_sales.models import Order
+from sea_saw_warehouse.models import OutboundOrder
+
+from .models import CodeSequence, Field
+from .utils import CacheGeneration, ContentTypeRegistry
+
+
+class CodeSequenceTests(TestCase):
+
+    def setUp(self):
+        self.year = timezone.now().year
+
+    def test_codes_are_sequential_per_prefix(self):
+        first = Order.objects.create()
+        second = Order.objects.create()
+        pipeline = Pipeline.objects.create(order=first)
+
+        self.assertEqual(first.order_code, f"SO{self.year}-000001")
+        self.assertEqual(second.order_code, f"SO{self.year}-000002")
+        self.assertEqual(pipeline.pipeline_code, f"PL{self.year}-000001")
+
+    def test_counter_is_seeded_from_existing_codes(self):
+        """Soft-deleted rows and gaps no longer produce duplicate codes."""
+        Order.objects.create(order_code=f"SO{self.year}-000007").delete()
+
+        order = Order.objects.create()
+        self.assertEqual(order.order_code, f"SO{self.year}-000008")
+
+    def test_reserve_codes_returns_a_contiguous_range(self):
+        codes = Order.reserve_codes(3)
+
+        self.assertEqual(
+            codes,
+            [f"SO{self.year}-00000{i}" for i in (1, 2, 3)],
+        )
+        self.assertEqual(
+            CodeSequence.objects.get(prefix="SO", year=self.year).last_value, 3
+        )
+        self.assertEqual(Order.objects.create().order_code, f"SO{self.year}-000004")
+
+    def test_reset_sequences_resyncs_code_counters(self):
+        Order.objects.create()
+        Order.objects.create(order_code=f"SO{self.year}-000042")
+
+        call_command("reset_sequences", "--codes-only", stdout=StringIO())
+
+        self.assertEqual(
+            CodeSequence.objects.get(prefix="SO", year=self.year).last_value, 42
+        )
+
+
+class SearchDocumentTests(TestCase):
+
+    def setUp(self):
+        self.contact = Contact.objects.create(name="Ocean Trading")
+        self.order = Order.objects.create(contact=self.contact, comment="Frozen Squid")
+        self.pipeline = Pipeline.objects.create(order=self.order, remark="Rush")
+        Pipeline.objects.create(order=Order.objects.create(comment="Shrimp"))
+        self.client = APIClient()
+        self.client.force_authenticate(
+            user=User.objects.create_user(
+                username="admin", role=Role.objects.get(role_name="ADMIN")
+            )
+        )
+
+    def _search(self, url, term):
+        response = self.client.get(url, {"search": term})
+        self.assertEqual(response.status_code, 200, response.content)
+        return sorted(row["id"] for row in response.json()["results"])
+
+    def test_document_is_built_on_save(self):
+        self.assertEqual(
+            self.order.search_document,
+            f"{self.order.order_code.lower()}\nfrozen squid\nocean trading",
+        )
+        self.assertIn(self.order.order_code.lower(), self.pipeline.search_document)
+        self.assertIn("ocean trading", self.pipeline.search_document)
+
+        outbound = OutboundOrder.objects.create(
+            pipeline=self.pipeline, container_no="MSKU1"
+        )
+        self.assertIn("msku1", outbound.search_document)
+
+    def test_related_changes_rebuild_documents(self):
+        self.contact.name = "Harbour Foods"
+        self.contact.save()
+        self.order.order_code = "SO-RENAMED"
+        self.order.save(update_fields=["order_code"])
+
+        self.order.refresh_from_db()
+        self.pipeline.refresh_from_db()
+        self.assertIn("harbour foods", self.order.search_document)
+        self.assertIn("so-renamed", self.pipeline.search_document)
+        self.assertIn("harbour foods", self.pipeline.search_document)
+
+    def test_document_backend_matches_field_backend(self):
+        for url in ("/api/pipeline/pipelines/", "/api/sales/orders/"):
+            for term in ("ocean", "SQUID", self.order.order_code, "ocean squid", "nope"):
+                with override_settings(SEARCH_BACKEND="fields"):
+                    expected = self._search(url, term)
+                with override_settings(SEARCH_BACKEND="document"):
+                    self.assertEqual(self._search(url, term), expected, (url, term))
+
+        with override_settings(SEARCH_BACKEND="document"):
+            pipelines = self._search("/api/pipeline/pipelines/", "ocean rush")
+        self.assertEqual(pipelines, [self.pipeline.pk])
+
+    def test_rebuild_command(self):
+        Order.objects.update(search_document="")
+        call_command("rebuild_search_documents", stdout=StringIO())
+        self.order.refresh_from_db()
+        self.assertIn("frozen squid", self.order.search_document)
+
+
+class BaseFilterTests(TestCase):
+
+    def test_dynamic_filters_are_compiled_per_class(self):
+        self.assertIn("order_code__icontains_ex", OrderFilter.base_filters)
+        self.assertIn("order_date__range", OrderFilter.base_filters)
+
+        first, second = OrderFilter(), OrderFilter()
+        name = "order_code__icontains"
+        self.assertIsNot(first.filters[name], second.filters[name])
+        self.assertIsNot(first.filters[name], OrderFilter.base_filters[name])
+        self.assertIs(first.filters[name].parent, first)
+        self.assertIs(first.form.__class__, second.form.__class__)
+
+    def test_compiled_filters_still_filter(self):
+        kept = Order.objects.create(order_code="SO-KEEP")
+        Order.objects.create(order_code="SO-DROP")
+
+        filterset = OrderFilter(
+            data={"order_code__icontains_ex": "drop"}, queryset=Order.objects.all()
+        )
+        self.assertTrue(filterset.is_valid(), filterset.errors)
+        self.assertEqual(list(filterset.qs), [kept])
+
+    def test_method_filters_are_bound_to_the_instance(self):
+        supplier = Account.objects.create(account_name="Fish Co")
+        Account.objects.create(account_name="Other Co")
+        PurchaseOrder.objects.create(supplier=supplier)
+
+        filterset = AccountFilter(
+            data={"roles": "supplier"}, queryset=Account.objects.all()
+        )
+        self.assertTrue(filterset.is_valid(), filterset.errors)
+        self.assertEqual(list(filterset.qs), [supplier])
+
+
+class MetadataCacheTests(TestCase):
+
+    URL = "/api/sales/orders/"
+
+    def setUp(self):
+        cache.clear()
+        ContentTypeRegistry.invalidate()
+        self.client = APIClient()
+        self.client.force_authenticate(
+            user=User.objects.create_user(
+                username="admin", role=Role.objects.get(role_name="ADMIN")
+            )
+        )
+
+    def _options(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.options(self.URL)
+        self.assertEqual(response.status_code, 200, response.content)
+        field_queries = [
+            query for query in ctx.captured_queries
+            if Field._meta.db_table in query["sql"]
+        ]
+        return response.json(), len(field_queries)
+
+    def test_second_request_is_served_from_cache(self):
+        cold, cold_queries = self._options()
+        self.assertEqual(cold_queries, 1)  # one Field query for the whole tree
+
+        warm, warm_queries = self._options()
+        self.assertEqual(warm_queries, 0)
+        self.assertEqual(warm, cold)
+
+    def test_field_change_invalidates(self):
+        self._options()
+        Field.objects.create(
+            field_name="order_code",
+            content_type=ContentType.objects.get_for_model(Order),
+            extra_info={"placeholder": "SO..."},
+        )
+        data, queries = self._options()
+        self.assertEqual(queries, 1)
+        self.assertEqual(
+            data["actions"]["POST"]["order_code"]["placeholder"], "SO..."
+        )
+
+    def test_prebuild_command_warms_cache(self):
+        call_command("prebuild_metadata_cache", "--role", "ADMIN", stdout=StringIO())
+        _, queries = self._options()
+        self.assertEqual(queries, 0)
+
+
+class CacheGenerationTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.generation = CacheGeneration("sea_saw_base:tests:generation")
+
+    def test_bump_moves_forward(self):
+        first = self.generation.current()
+        self.assertEqual(self.generation.current(), first)
+        self.assertGreater(self.generation.bump(), first)
+
+    def test_lost_counter_never_goes_back(self):
+        self.generation.current()
+        stale = self.generation.bump()
+        cache.clear()
+        self.assertGreater(self.generation.current(), stale)
+
+        cache.clear()
+        self.assertGreater(self.generation.bump(), stale)
+
+
+class ContentTypeRegistryTests(TestCase):
+
+    def setUp(self):
+        ContentTypeRegistry.invalidate()
+        ContentTypeRegistry.preload()
+
+    def _queries(self, table, func):
+        with CaptureQueriesContext(connection) as ctx:
+            result = func()
+        return result, sum(table in query["sql"] for query in ctx.captured_queries)
+
+    def test_content_type_lookups_are_served_from_memory(self):
+        content_type_table = ContentType._meta.db_table
+        order = Order.objects.create()
+        pipeline = Pipeline.objects.create(order=order)
+        content_type_id = ContentType.objects.get_for_model(OutboundOrder).pk
+
+        payment = Payment(
+            pipeline=pipeline,
+            content_type_id=content_type_id,
+            object_id=1,
+            payment_date="2024-02-01",
+            amount=10,
+        )
+        _, queries = self._queries(content_type_table, payment.save)
+        self.assertEqual(queries, 0)
+        self.assertEqual(payment.payment_type, PaymentType.OUTBOUND_PAYMENT)
+
+        client = APIClient()
+        client.force_authenticate(user=User.objects.create_user(username="viewer"))
+        response, queries = self._queries(
+            content_type_table, lambda: client.get("/api/base/content-types/")
+        )
+        self.assertEqual(queries, 0)
+        self.assertEqual(response.json()["outboundorder"], content_type_id)
+
+    def test_field_extra_info_refreshes_on_change(self):
+        field_table = Field._meta.db_table
+        content_type = ContentType.objects.get_for_model(Order)
+
+        info, queries = self._queries(field_table, ContentTypeRegistry.field_extra_info)
+        self.assertEqual(queries, 1)
+        self.assertNotIn(content_type.pk, info)
+
+        _, queries = self._queries(field_table, ContentTypeRegistry.field_extra_info)
+        self.assertEqual(queries, 0)
+
+        field = Field.objects.create(
+            field_name="order_code",
+            content_type=content_type,
+            extra_info={"placeholder": "SO..."},
+        )
+        info = ContentTypeRegistry.field_extra_info()
+        self.assertEqual(info[content_type.pk]["order_code"], {"placeholder": "SO..."})
+
+        field.extra_info = {"placeholder": "SO-"}
+        field.save()
+        info = ContentTypeRegistry.field_extra_info()
+        self.assertEqual(info[content_type.pk]["order_code"], {"placeholder": "SO-"})
+
+    def test_field_extra_info_expires(self):
+        content_type = ContentType.objects.get_for_model(Order)
+        ContentTypeRegistry.field_extra_info()
+
+        # Written without signals: only the TTL picks it up
+        Field.objects.bulk_create(
+            [Field(field_name="order_code", content_type=content_type, extra_info={})]
+        )
+        self.assertNotIn(content_type.pk, ContentTypeRegistry.field_extra_info())
+
+        expired = time.monotonic() + ContentTypeRegistry.FIELD_INFO_TTL
+        with mock.patch.object(time, "monotonic", return_value=expired):
+            info = ContentTypeRegistry.field_extra_info()
+        self.assertEqual(info[content_type.pk]["order_code"], {})
+
+
+class FieldTrackingTests(TestCase):
+    """Sub-entity status changes are detected without re-reading the row."""
+
+    def setUp(self):
+        self.pipeline = Pipeline.objects.create(order=Order.objects.create())
+
+    def test_has_changed_follows_loaded_value(self):
+        order = ProductionOrder.objects.create(pipeline=self.pipeline)
+        self.assertFalse(order.has_changed("status"))
+
+        order = ProductionOrder.objects.get(pk=order.pk)
+        loaded_status = order.status
+        order.status = "completed"
+        self.assertTrue(order.has_changed("status"))
+        self.assertEqual(order.loaded_value("status"), loaded_status)
+
+        order.save()
+        self.assertFalse(order.has_changed("status"))
+        self.assertEqual(order.loaded_value("status"), "completed")
+
+        ProductionOrder.objects.filter(pk=order.pk).update(status="cancelled")
+        order.refresh_from_db()
+        self.assertEqual(order.loaded_value("status"), "cancelled")
+
+    def _save_status(self, model):
+        order = model.objects.get(pk=model.objects.create(pipeline=self.pipeline).pk)
+        order.status = "completed"
+        with CaptureQueriesContext(connection) as ctx:
+            order.save(update_fields=["status"])
+        return [query["sql"] for query in ctx.captured_queries]
+
+    def test_status_change_saves_with_one_query(self):
+        for model in (ProductionOrder, OutboundOrder):
+            with self.subTest(model.__name__):
+                queries = self._save_status(model)
+                self.assertEqual(len(queries), 1, queries)
+                self.assertTrue(queries[0].startswith("UPDATE"))
+
+    def test_status_change_does_not_reread_row(self):
+        # PurchaseOrder.save() also recomputes totals; the row itself is not re-read
+        table = PurchaseOrder._meta.db_table
+        queries = self._save_status(PurchaseOrder)
+        rereads = [
+            sql
+            for sql in queries
+            if sql.startswith("SELECT") and f'FROM "{table}" WHERE' in sql
+        ]
+        self.assertEqual(rereads, [])
@@ -13,6 +13,9 @@ from .file_upload import (
     order_file_path,
     outbound_file_path,
 )
+from .deferred_recompute import DeferredRecompute
+from .cache_generation import CacheGeneration
+from .content_type_registry import ContentTypeRegistry
 
 __all__ = [
     "get_upload_path",
@@ -23,4 +26,7 @@ __all__ = [
     "contract_file_path",
     "order_file_path",
     "outbound_file_path",
+    "DeferredRecompute",
+    "CacheGeneration",
+    "ContentTypeRegistry",
 ]
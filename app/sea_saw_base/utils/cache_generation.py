@@ -0,0 +1,44 @@
+"""
+Cache Generation - shared version counter for invalidating cache families
+
+元数据、ContentType 注册表、仪表盘统计和角色可见性都把一个 generation 编入
+缓存键 (或进程内缓存的版本), 失效时递增 generation, 旧键自然过期。
+
+计数器保存在共享 cache 中。cache 被清空 / 淘汰 / 重启后计数器从当前时间
+(纳秒) 重新开始, 而不是从 1: 新值总大于之前发出的任何值, 已被持有的旧版本
+(进程内缓存、旧缓存键) 不会因计数器回绕而重新变为"当前"。
+"""
+
+import time
+
+from django.core.cache import cache
+
+
+class CacheGeneration:
+    """Monotonic version counter stored under ``key`` in the default cache."""
+
+    def __init__(self, key):
+        self.key = key
+
+    @staticmethod
+    def _seed():
+        # Above every value handed out before the counter was lost
+        return time.time_ns()
+
+    def current(self):
+        """Current generation (seeds the counter if it is missing)."""
+        value = cache.get(self.key)
+        if value is None:
+            cache.add(self.key, self._seed(), timeout=None)
+            value = cache.get(self.key)
+        return value
+
+    def bump(self):
+        """Start a new generation; everything versioned with older ones is stale."""
+        try:
+            return cache.incr(self.key)
+        except ValueError:
+            # Missing: reseeding already moves past every earlier generation
+            if not cache.add(self.key, self._seed(), timeout=None):
+                return cache.incr(self.key)
+            return cache.get(self.key)
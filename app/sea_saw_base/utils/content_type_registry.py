@@ -0,0 +1,115 @@
+"""
+ContentType Registry - process-wide ContentType / Field.extra_info lookups
+
+附件、付款、元数据和 ContentTypeView 在热路径上反复解析 ContentType 与 Field 行:
+- Payment.save() / Attachment.save() 读取 self.content_type.model, 只设置了
+  content_type_id 时每次保存都会查询 django_content_type
+- BaseMetadata 每次构建都会查询整张 Field 表
+
+ContentTypeRegistry 在进程内首次使用时一次性预加载所有 sea_saw_* 模型的
+ContentType (写入 Django ContentTypeManager 的进程级缓存, 迁移 / flush 时
+由 Django 清空), 之后按模型 / id 解析均不再查询。
+
+Field.extra_info 映射同样缓存在进程内, 以共享缓存中的 generation 标记版本:
+Field 保存 / 删除时 (signals.py) invalidate() 递增 generation, 所有进程在
+下一次读取时重新加载。映射另有 FIELD_INFO_TTL 秒的有效期: 绕过信号的写入
+(queryset.update / 直接改库) 或丢失的 generation 最多延迟这么久生效。
+"""
+
+import threading
+import time
+from collections import defaultdict
+
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+
+from .cache_generation import CacheGeneration
+
+APP_LABEL_PREFIX = "sea_saw_"
+
+
+class ContentTypeRegistry:
+    """In-memory ContentType and Field.extra_info lookups shared by the process."""
+
+    CACHE_PREFIX = "sea_saw_base:content_type_registry"
+    # Upper bound on how long a process serves its Field.extra_info map
+    FIELD_INFO_TTL = 5 * 60
+
+    _lock = threading.Lock()
+    _preloaded = False
+    # (generation, loaded at (monotonic), {content_type_id: {field_name: extra_info}})
+    _field_info = (None, 0.0, {})
+
+    # =====================================================
+    # ContentTypes
+    # =====================================================
+    @classmethod
+    def business_models(cls):
+        return [
+            model
+            for model in apps.get_models()
+            if model._meta.app_label.startswith(APP_LABEL_PREFIX)
+        ]
+
+    @classmethod
+    def preload(cls):
+        """Load the ContentTypes of every business model with one query."""
+        ContentType.objects.get_for_models(*cls.business_models())
+        cls._preloaded = True
+
+    @classmethod
+    def get_for_model(cls, model):
+        """ContentType of ``model`` (class or instance), without a query once warm."""
+        if not cls._preloaded:
+            cls.preload()
+        return ContentType.objects.get_for_model(model)
+
+    @classmethod
+    def get_for_id(cls, content_type_id):
+        if not cls._preloaded:
+            cls.preload()
+        return ContentType.objects.get_for_id(content_type_id)
+
+    @classmethod
+    def model_name(cls, content_type_id):
+        """``ContentType.model`` of ``content_type_id`` (e.g. "purchaseorder")."""
+        return cls.get_for_id(content_type_id).model
+
+    # =====================================================
+    # Field.extra_info
+    # =====================================================
+    field_generation = CacheGeneration(f"{CACHE_PREFIX}:field_generation")
+
+    @classmethod
+    def invalidate(cls):
+        """Drop the Field.extra_info map in this and (via generation) every process."""
+        cls._field_info = (None, 0.0, {})
+        cls.field_generation.bump()
+
+    @classmethod
+    def field_extra_info(cls):
+        """
+        Field.extra_info of every model.
+
+        Returns:
+            dict: content_type_id → {field_name: extra_info} (treat as read-only)
+        """
+        from sea_saw_base.models import Field
+
+        generation = cls.field_generation.current()
+        loaded_generation, loaded_at, field_info = cls._field_info
+        if (
+            loaded_generation == generation
+            and time.monotonic() - loaded_at < cls.FIELD_INFO_TTL
+        ):
+            return field_info
+
+        with cls._lock:
+            field_info = defaultdict(dict)
+            for content_type_id, field_name, extra_info in Field.objects.values_list(
+                "content_type_id", "field_name", "extra_info"
+            ):
+                field_info[content_type_id][field_name] = extra_info
+            field_info = dict(field_info)
+            cls._field_info = (generation, time.monotonic(), field_info)
+        return field_info
@@ -0,0 +1,74 @@
+"""
+Deferred Recompute - collect dirty parent ids, recompute once per scope
+
+OrderItem.save() / PurchaseItem.save() 原先每次都重新聚合父单据的 total_amount
+并刷新 Pipeline 财务汇总, 通过嵌套序列化器保存 50 条明细就会执行 50+ 次全量聚合。
+
+这里按名称登记批量重算函数 (ids → None):
+- 作用域外: mark_dirty() 立即重算 (与原行为一致)
+- 作用域内: 只记录脏 id, 最外层作用域结束时在同一事务内每个 id 重算一次
+
+    with DeferredRecompute.scope():
+        serializer.save()
+
+作用域自身是一个 transaction.atomic() 块, 重算与触发它的写入一同提交或回滚。
+重算过程中再标记的 id (例如订单总额 → Pipeline 汇总) 会在同一次 flush 中处理。
+"""
+
+import threading
+from contextlib import contextmanager
+
+from django.db import transaction
+
+
+class DeferredRecompute:
+    """Registry of batch recompute functions plus the per-thread dirty sets."""
+
+    _recomputers = {}
+    _state = threading.local()
+
+    @classmethod
+    def register(cls, name, func):
+        """Register ``func(ids)`` as the recompute function for ``name``."""
+        cls._recomputers[name] = func
+
+    @classmethod
+    def _pending(cls):
+        return getattr(cls._state, "pending", None)
+
+    @classmethod
+    def mark_dirty(cls, name, pk):
+        """Recompute ``pk`` now, or once at the end of the active scope."""
+        if not pk:
+            return
+        pending = cls._pending()
+        if pending is None:
+            cls._recomputers[name]({pk})
+        else:
+            pending.setdefault(name, set()).add(pk)
+
+    @classmethod
+    @contextmanager
+    def scope(cls, using=None):
+        """Defer recomputes until the outermost scope exits (re-entrant)."""
+        if cls._pending() is not None:
+            yield
+            return
+
+        cls._state.pending = {}
+        try:
+            with transaction.atomic(using=using):
+                yield
+                cls._flush()
+        finally:
+            cls._state.pending = None
+
+    @classmethod
+    def _flush(cls):
+        pending = cls._pending()
+        # A recompute may mark further ids: loop until nothing is pending
+        while pending:
+            for name, func in list(cls._recomputers.items()):
+                ids = pending.pop(name, None)
+                if ids:
+                    func(ids)
@@ -5,7 +5,8 @@ Provides ContentType IDs for different models.
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.contrib.contenttypes.models import ContentType
+
+from ..utils import ContentTypeRegistry
 
 
 class ContentTypeView(APIView):
@@ -27,11 +28,11 @@ class ContentTypeView(APIView):
         from sea_saw_pipeline.models import Pipeline
 
         content_types = {
-            "order": ContentType.objects.get_for_model(Order).id,
-            "pipeline": ContentType.objects.get_for_model(Pipeline).id,
-            "purchaseorder": ContentType.objects.get_for_model(PurchaseOrder).id,
-            "productionorder": ContentType.objects.get_for_model(ProductionOrder).id,
-            "outboundorder": ContentType.objects.get_for_model(OutboundOrder).id,
+            "order": ContentTypeRegistry.get_for_model(Order).id,
+            "pipeline": ContentTypeRegistry.get_for_model(Pipeline).id,
+            "purchaseorder": ContentTypeRegistry.get_for_model(PurchaseOrder).id,
+            "productionorder": ContentTypeRegistry.get_for_model(ProductionOrder).id,
+            "outboundorder": ContentTypeRegistry.get_for_model(OutboundOrder).id,
         }
 
         return Response(content_types)
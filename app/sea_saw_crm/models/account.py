@@ -82,15 +82,47 @@ class Account(BaseModel):
     def __str__(self):
         return self.account_name or _("Unnamed Account")
 
+    # role flag → reverse relation checked for existence
+    ROLE_RELATIONS = {
+        "is_customer": "orders",
+        "is_supplier": "purchase_orders",
+    }
+
+    @classmethod
+    def annotate_roles(cls, queryset):
+        """
+        Annotate role flags as EXISTS subqueries so that is_customer /
+        is_supplier / roles can be read without one query per account.
+        """
+        annotations = {}
+        for flag, relation in cls.ROLE_RELATIONS.items():
+            descriptor = getattr(cls, relation, None)
+            if descriptor is None:
+                continue
+            related_model = descriptor.rel.related_model
+            annotations[f"_{flag}"] = models.Exists(
+                related_model._default_manager.filter(
+                    **{descriptor.field.name: models.OuterRef("pk")}
+                )
+            )
+        return queryset.annotate(**annotations)
+
+    def _role_flag(self, flag) -> bool:
+        annotated = self.__dict__.get(f"_{flag}")
+        if annotated is not None:
+            return annotated
+        relation = self.ROLE_RELATIONS[flag]
+        if hasattr(self, relation):
+            return getattr(self, relation).exists()
+        return False
+
     @property
     def is_customer(self) -> bool:
         """
         Returns True if this account has any sales orders associated.
         An account is considered a customer if it has Order relationships.
         """
-        if hasattr(self, "orders"):
-            return self.orders.exists()
-        return False
+        return self._role_flag("is_customer")
 
     @property
     def is_supplier(self) -> bool:
@@ -98,9 +130,7 @@ class Account(BaseModel):
         Returns True if this account has any purchase orders associated.
         An account is considered a supplier if it has PurchaseOrder relationships.
         """
-        if hasattr(self, "purchase_orders"):
-            return self.purchase_orders.exists()
-        return False
+        return self._role_flag("is_supplier")
 
     @property
     def roles(self) -> list:
@@ -59,7 +59,7 @@ class BankAccountPermission(permissions.BasePermission):
         owner = getattr(account, "owner", None)
         if not owner:
             return False
-        get_users = getattr(user, "get_all_visible_users", None)
-        if not callable(get_users):
+        get_user_ids = getattr(user, "get_visible_user_ids", None)
+        if not callable(get_user_ids):
             return False
-        return owner in get_users()
+        return owner.pk in get_user_ids()
@@ -52,7 +52,7 @@ class ContactPermission(permissions.BasePermission):
         owner = getattr(obj, "owner", None)
         if not owner:
             return False
-        get_users = getattr(owner, "get_all_visible_users", None)
-        if not callable(get_users):
+        get_user_ids = getattr(owner, "get_visible_user_ids", None)
+        if not callable(get_user_ids):
             return False
-        return user in get_users()
+        return user.pk in get_user_ids()
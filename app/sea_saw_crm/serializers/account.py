@@ -19,6 +19,11 @@ class AccountMinimalSerializer(BaseSerializer):
         """Return computed roles based on business relationships."""
         return obj.roles
 
+    @classmethod
+    def setup_prefetch_queryset(cls, queryset):
+        """PrefetchPlan hook: annotate role flags so get_roles issues no query."""
+        return Account.annotate_roles(queryset)
+
 
 # Import ContactMinimalSerializer after AccountMinimalSerializer is defined
 # This avoids circular import issues
@@ -32,7 +32,7 @@ class BaseStatsAPIView(APIView):
     def get_queryset(self):
         """根据用户权限获取数据集"""
         user = self.request.user
-        user_groups = set(user.groups.values_list("name", flat=True))
+        user_groups = user.get_group_names()
         base_queryset = self.model.objects.all().only("created_at")
 
         if user.is_superuser or user.is_staff:
@@ -81,7 +81,7 @@ class OrderStats(BaseStatsAPIView):
     model = Order
 
     def get(self, request):
-        user_groups = set(request.user.groups.values_list("name", flat=True))
+        user_groups = request.user.get_group_names()
 
         data = {
             "orders_count_by_month": self.get_stats(
@@ -165,7 +165,7 @@ class OrderStatsByMonth(APIView):
             )
 
         user = self.request.user
-        user_groups = user.groups.values_list("name", flat=True)
+        user_groups = user.get_group_names()
 
         if user.is_superuser or user.is_staff or "Production" in user_groups:
             queryset = self.model.objects.all()
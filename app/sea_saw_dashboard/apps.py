@@ -5,3 +5,6 @@ class SeaSawDashboardConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "sea_saw_dashboard"
     verbose_name = "Dashboard"
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,31 @@
+"""
+Dashboard signals module.
+
+Overview cache maintenance:
+Cached overview stats (OrderOverviewStats) only count active (confirmed)
+orders. Saving an active order, or any save that changes an order's status
+(confirm / cancel / revert to draft, always saved with update_fields
+containing "status"), invalidates every cached overview. Soft delete goes
+through save() and is covered the same way.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from sea_saw_sales.models import Order
+
+from .stats import OrderOverviewStats
+
+
+@receiver(post_save, sender=Order)
+def invalidate_overview_on_order_save(sender, instance, update_fields, **kwargs):
+    if instance.status in OrderOverviewStats.ACTIVE_STATUSES or (
+        update_fields is not None and "status" in update_fields
+    ):
+        OrderOverviewStats.invalidate()
+
+
+@receiver(post_delete, sender=Order)
+def invalidate_overview_on_order_delete(sender, instance, **kwargs):
+    if instance.status in OrderOverviewStats.ACTIVE_STATUSES:
+        OrderOverviewStats.invalidate()
@@ -0,0 +1,144 @@
+"""
+Order Overview Stats - one grouped query per visibility scope, cached
+
+原实现每次请求执行四条聚合查询 (数量/金额 × 按月/按年), 并在 SQL 中用
+Concat/LPad/Cast 拼接期间字符串。这里:
+- 一条 TruncMonth 分组查询同时取得每月订单数与金额, 按年汇总在 Python 中完成
+- 结果按可见范围 (全部 / 某组可见用户) 缓存, TTL 较短 (DASHBOARD_CACHE_TIMEOUT)
+- 订单确认 / 状态变更时递增 generation, 旧缓存键自然失效 (见 signals.py)
+
+注意: Order.update_total_amount() 使用 QuerySet.update(), 不发送信号, 金额变化
+在 TTL 过期后才反映到仪表盘。
+"""
+
+import hashlib
+from datetime import date
+from decimal import Decimal
+
+from dateutil.relativedelta import relativedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, DecimalField, Sum, Value
+from django.db.models.functions import Coalesce, TruncMonth
+from django.utils import timezone
+
+from sea_saw_base.utils import CacheGeneration
+from sea_saw_sales.models.enums import OrderStatusType
+
+ZERO = Decimal("0.0")
+
+
+class OrderOverviewStats:
+    """
+    Monthly order counts / amounts for the dashboard home page.
+
+    Usage:
+        stats = OrderOverviewStats.for_scope(queryset, scope)
+        stats.by_month("count")     # [{"date": "2026-01", "total": ...}, ...]
+        stats.by_year("amount")     # [{"date": "2024", "total": ...}, ...]
+    """
+
+    ACTIVE_STATUSES = [OrderStatusType.CONFIRMED]
+    MONTH_LOOKBACK = 12
+    YEAR_LOOKBACK = 3
+    CACHE_PREFIX = "sea_saw_dashboard:overview"
+    generation = CacheGeneration(f"{CACHE_PREFIX}:generation")
+
+    def __init__(self, months, today):
+        # {date(year, month, 1): (count, amount)}
+        self.months = months
+        self.today = today
+
+    # ========================
+    # Query
+    # ========================
+    @classmethod
+    def _since(cls, today):
+        month_start = today.replace(day=1) - relativedelta(months=cls.MONTH_LOOKBACK - 1)
+        year_start = date(today.year - (cls.YEAR_LOOKBACK - 1), 1, 1)
+        return min(month_start, year_start)
+
+    @classmethod
+    def _query_months(cls, queryset, today):
+        rows = (
+            queryset.filter(
+                status__in=cls.ACTIVE_STATUSES, order_date__gte=cls._since(today)
+            )
+            .annotate(month=TruncMonth("order_date"))
+            .values("month")
+            .annotate(
+                count=Count("pk"),
+                amount=Coalesce(
+                    Sum("total_amount"), Value(ZERO), output_field=DecimalField()
+                ),
+            )
+            .order_by()
+        )
+        return {row["month"]: (row["count"], row["amount"]) for row in rows}
+
+    # ========================
+    # Cache
+    # ========================
+    @staticmethod
+    def scope_for_user_ids(user_ids):
+        """Cache scope of a queryset limited to the owners in ``user_ids``."""
+        joined = ",".join(str(pk) for pk in sorted(user_ids))
+        return "users:" + hashlib.md5(joined.encode()).hexdigest()
+
+    @classmethod
+    def invalidate(cls):
+        """Drop every cached overview (an order was confirmed / changed status)."""
+        cls.generation.bump()
+
+    @classmethod
+    def for_scope(cls, queryset, scope, today=None):
+        """
+        Stats of ``queryset`` (already limited to what the user may see).
+
+        ``scope`` identifies that visibility limit ("all", "users:<hash>", ...);
+        users sharing a scope share the cached result. The current month is
+        part of the key so lookback windows roll over on month change.
+        """
+        today = today or timezone.localdate()
+        key = (
+            f"{cls.CACHE_PREFIX}:{cls.generation.current()}:"
+            f"{today:%Y-%m}:{scope}"
+        )
+        months = cache.get(key)
+        if months is None:
+            months = cls._query_months(queryset, today)
+            cache.set(key, months, settings.DASHBOARD_CACHE_TIMEOUT)
+        return cls(months, today)
+
+    # ========================
+    # Output
+    # ========================
+    @staticmethod
+    def _value(count, amount, measure):
+        return Decimal(count) if measure == "count" else amount
+
+    def by_month(self, measure):
+        """Last MONTH_LOOKBACK months (oldest first), zero-filled."""
+        current = self.today.replace(day=1)
+        result = []
+        for i in range(self.MONTH_LOOKBACK - 1, -1, -1):
+            month = current - relativedelta(months=i)
+            count, amount = self.months.get(month, (0, ZERO))
+            result.append(
+                {"date": f"{month:%Y-%m}", "total": self._value(count, amount, measure)}
+            )
+        return result
+
+    def by_year(self, measure):
+        """Last YEAR_LOOKBACK calendar years (oldest first), zero-filled."""
+        totals = {}
+        for month, (count, amount) in self.months.items():
+            totals[month.year] = totals.get(month.year, ZERO) + self._value(
+                count, amount, measure
+            )
+        return [
+            {"date": str(year), "total": totals.get(year, ZERO)}
+            for year in range(
+                self.today.year - self.YEAR_LOOKBACK + 1, self.today.year + 1
+            )
+        ]
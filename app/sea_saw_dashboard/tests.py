@@ -0,0 +1,95 @@
+from decimal import Decimal
+
+from dateutil.relativedelta import relativedelta
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from sea_saw_auth.models import Role, User
+from sea_saw_sales.models import Order
+
+URL = "/api/dashboard/overview/"
+
+
+class OverviewStatsTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.today = timezone.localdate()
+        self.staff = User.objects.create_user(username="boss", is_staff=True)
+        self.seller = User.objects.create_user(username="seller")
+        self.seller.role = Role.objects.get(role_name="SALES")
+        self.seller.save()
+        self.seller.groups.add(Group.objects.get_or_create(name="Sale")[0])
+        self.other = User.objects.create_user(username="other-seller")
+
+        self._order(self.today, 100, owner=self.seller)
+        self._order(self.today, 50, owner=self.other)
+        self._order(self.today - relativedelta(months=2), 25, owner=self.seller)
+        self._order(self.today - relativedelta(years=2), 10, owner=self.seller)
+        # Not counted: draft, and older than every lookback window
+        self._order(self.today, 999, owner=self.seller, status="draft")
+        self._order(self.today - relativedelta(years=5), 999, owner=self.seller)
+
+    def _order(self, order_date, amount, owner, status="confirmed"):
+        order = Order.objects.create(order_date=order_date, status=status, owner=owner)
+        Order.objects.filter(pk=order.pk).update(total_amount=Decimal(amount))
+        return order
+
+    def _get(self, user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        response = client.get(URL)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    @staticmethod
+    def _totals(rows):
+        return {row["date"]: row["total"] for row in rows}
+
+    def test_periods_are_aggregated_in_python(self):
+        data = self._get(self.staff)
+
+        months = self._totals(data["orders_count_by_month"])
+        self.assertEqual(len(months), 12)
+        self.assertEqual(months[f"{self.today:%Y-%m}"], 2)
+        two_months_ago = self.today - relativedelta(months=2)
+        self.assertEqual(months[f"{two_months_ago:%Y-%m}"], 1)
+
+        years = self._totals(data["orders_total_amount_by_year"])
+        self.assertEqual(list(years), [str(self.today.year - i) for i in (2, 1, 0)])
+        self.assertEqual(years[str(self.today.year - 2)], Decimal("10"))
+        self.assertEqual(sum(years.values()), Decimal("185"))
+
+    def test_one_aggregate_query_then_cached(self):
+        with CaptureQueriesContext(connection) as cold:
+            self._get(self.staff)
+        orders_table = Order._meta.db_table
+        self.assertEqual(
+            sum(orders_table in query["sql"] for query in cold.captured_queries), 1
+        )
+
+        with CaptureQueriesContext(connection) as warm:
+            self._get(self.staff)
+        self.assertFalse(
+            any(orders_table in query["sql"] for query in warm.captured_queries)
+        )
+
+    def test_confirming_an_order_invalidates(self):
+        before = self._totals(self._get(self.staff)["orders_count_by_month"])
+        draft = Order.objects.get(status="draft")
+        draft.status = "confirmed"
+        draft.save(update_fields=["status", "updated_at"])
+
+        after = self._totals(self._get(self.staff)["orders_count_by_month"])
+        key = f"{self.today:%Y-%m}"
+        self.assertEqual(after[key], before[key] + 1)
+
+    def test_sale_scope_only_counts_visible_owners(self):
+        self._get(self.staff)  # warm the "all" scope
+        months = self._totals(self._get(self.seller)["orders_total_amount_by_month"])
+        self.assertEqual(months[f"{self.today:%Y-%m}"], Decimal("100"))
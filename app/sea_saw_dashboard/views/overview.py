@@ -1,22 +1,10 @@
-from decimal import Decimal
-
-from dateutil.relativedelta import relativedelta
-from django.db.models import Sum, F, Value, DecimalField, CharField
-from django.db.models.functions import (
-    Coalesce,
-    ExtractYear,
-    ExtractMonth,
-    Cast,
-    Concat,
-    LPad,
-)
-from django.utils.timezone import now
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from sea_saw_sales.models import Order
-from sea_saw_sales.models.enums import OrderStatusType
+
+from ..stats import OrderOverviewStats
 
 
 class OverviewStatsView(APIView):
@@ -30,98 +18,42 @@ class OverviewStatsView(APIView):
       - 近 12 个月订单数量（按月，仅 active/completed）
       - 近 3 年订单数量（按年，仅 active/completed）
       - 近 3 年订单总额（按年，非生产角色可见）
+
+    所有期间由一条按月分组的查询算出, 结果按可见范围缓存 (见 OrderOverviewStats)。
     """
 
     permission_classes = [IsAuthenticated]
 
-    ACTIVE_STATUSES = [OrderStatusType.CONFIRMED]
-
-    def _get_order_queryset(self, user_groups):
+    def _get_order_scope(self, user_groups):
+        """(订单 queryset, 缓存范围键)"""
         user = self.request.user
         qs = Order.objects.filter(deleted__isnull=True)
 
         if user.is_superuser or user.is_staff:
-            return qs
+            return qs, "all"
         if "Sale" in user_groups:
-            return qs.filter(owner__in=user.get_all_visible_users())
-        if "Production" in user_groups:
-            return qs
-        return qs.none()
-
-    @staticmethod
-    def _annotate_period(queryset, period):
-        if period == "month":
-            return queryset.annotate(
-                date=Concat(
-                    Cast(ExtractYear("order_date"), output_field=CharField()),
-                    Value("-"),
-                    LPad(
-                        Cast(ExtractMonth("order_date"), output_field=CharField()),
-                        2,
-                        Value("0"),
-                    ),
-                    output_field=CharField(),
-                )
+            user_ids = user.get_visible_user_ids()
+            return (
+                qs.filter(owner_id__in=user_ids),
+                OrderOverviewStats.scope_for_user_ids(user_ids),
             )
-        return queryset.annotate(
-            date=Cast(ExtractYear("order_date"), output_field=CharField())
-        )
-
-    @staticmethod
-    def _generate_periods(period, lookback):
-        """生成所有应返回的时间段标签，用于补零。"""
-        current = now()
-        if period == "month":
-            return [
-                f"{(current - relativedelta(months=i)).year}-{(current - relativedelta(months=i)).month:02d}"
-                for i in range(lookback - 1, -1, -1)
-            ]
-        return [
-            str((current - relativedelta(years=i)).year)
-            for i in range(lookback - 1, -1, -1)
-        ]
-
-    def _aggregate(self, queryset, expression, period, lookback):
-        since = (now() - relativedelta(**{f"{period}s": lookback})).date()
-        qs = self._annotate_period(queryset.filter(order_date__gte=since), period)
-        results = {
-            row["date"]: row["total"]
-            for row in qs.values("date").annotate(
-                total=Coalesce(
-                    Sum(expression, output_field=DecimalField()), Decimal("0.0")
-                )
-            )
-        }
-        periods = self._generate_periods(period, lookback)
-        return [{"date": p, "total": results.get(p, Decimal("0.0"))} for p in periods]
+        if "Production" in user_groups:
+            return qs, "all"
+        return qs.none(), "none"
 
     def get(self, request):
-        user_groups = set(request.user.groups.values_list("name", flat=True))
-        order_qs = self._get_order_queryset(user_groups)
-        active_order_qs = order_qs.filter(status__in=self.ACTIVE_STATUSES)
+        user_groups = request.user.get_group_names()
+        order_qs, scope = self._get_order_scope(user_groups)
+        stats = OrderOverviewStats.for_scope(order_qs, scope)
 
         data = {
-            "orders_count_by_month": self._aggregate(
-                active_order_qs, Value(1), period="month", lookback=12
-            ),
-            "orders_count_by_year": self._aggregate(
-                active_order_qs, Value(1), period="year", lookback=3
-            ),
+            "orders_count_by_month": stats.by_month("count"),
+            "orders_count_by_year": stats.by_year("count"),
         }
 
         # 生产组单独查看时不显示财务数据
         if user_groups != {"Production"}:
-            data["orders_total_amount_by_month"] = self._aggregate(
-                active_order_qs,
-                Coalesce(F("total_amount"), Decimal("0.0")),
-                period="month",
-                lookback=12,
-            )
-            data["orders_total_amount_by_year"] = self._aggregate(
-                active_order_qs,
-                Coalesce(F("total_amount"), Decimal("0.0")),
-                period="year",
-                lookback=3,
-            )
+            data["orders_total_amount_by_month"] = stats.by_month("amount")
+            data["orders_total_amount_by_year"] = stats.by_year("amount")
 
         return Response(data)
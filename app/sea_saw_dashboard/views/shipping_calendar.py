@@ -86,7 +86,7 @@ class ShippingCalendarView(APIView):
 
     def get(self, request):
         today = date.today()
-        user_groups = set(request.user.groups.values_list("name", flat=True))
+        user_groups = request.user.get_group_names()
 
         year = int(request.query_params.get("year", today.year))
         month = int(request.query_params.get("month", today.month))
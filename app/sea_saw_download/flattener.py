@@ -0,0 +1,128 @@
+"""
+Flatten Plan - compiled serializer → CSV column layout
+
+utilis.traverse / flatten_header 每一行都递归遍历序列化器、拼接前缀字符串,
+并用 combine_lists 生成中间字典的笛卡尔积。FlattenPlan 按序列化器类编译一次:
+- columns: 字段路径 (与 flatten_header 的键一致) 及其列序号
+- 叶子字段 → 列序号; 嵌套序列化器 → 子计划; many=True → 列表展开
+之后每条记录只按计划写入同一个行缓冲区, 逐行产出 tuple, 笛卡尔展开语义与
+traverse 相同 (后出现的多值字段在外层循环)。
+"""
+
+from django.utils.translation import gettext as _
+from rest_framework.serializers import ListSerializer, ModelSerializer
+
+
+class _Node:
+    """Compiled layout of one ModelSerializer level."""
+
+    __slots__ = ("leaves", "children", "span")
+
+    def __init__(self):
+        # (data key, column index)
+        self.leaves = []
+        # (data key, child node, many)
+        self.children = []
+        # (first, last + 1) column range owned by this node
+        self.span = (0, 0)
+
+    def clear(self, row):
+        first, last = self.span
+        row[first:last] = [None] * (last - first)
+
+    def fill(self, data, row):
+        """Write ``data`` into ``row``; yield once per expanded row."""
+        for key, index in self.leaves:
+            row[index] = data.get(key)
+        yield from self._expand(data, row, len(self.children) - 1)
+
+    def _expand(self, data, row, position):
+        # Later children form the outer loops, matching combine_lists()
+        if position < 0:
+            yield
+            return
+
+        key, child, many = self.children[position]
+        value = data.get(key)
+        items = (value or ()) if many else ((value,) if value is not None else ())
+
+        expanded = False
+        for item in items:
+            for _filled in child.fill(item, row):
+                expanded = True
+                yield from self._expand(data, row, position - 1)
+
+        if not expanded:
+            # Empty list / null relation: leave the columns blank
+            child.clear(row)
+            yield from self._expand(data, row, position - 1)
+
+
+class FlattenPlan:
+    """
+    Column plan for a serializer class.
+
+    Usage:
+        plan = FlattenPlan.for_serializer(OrderSerializerForDownload)
+        plan.headers()                         # {path: translated label}
+        for row in plan.iter_rows(data): ...   # data = serializer.data item
+    """
+
+    _cache = {}
+
+    def __init__(self, serializer):
+        self.paths = []
+        self.labels = []
+        self.root = self._compile(serializer, "")
+
+    @classmethod
+    def for_serializer(cls, serializer_class):
+        """Compile once per serializer class."""
+        plan = cls._cache.get(serializer_class)
+        if plan is None:
+            plan = cls(serializer_class())
+            cls._cache[serializer_class] = plan
+        return plan
+
+    # ========================
+    # Compile
+    # ========================
+    def _compile(self, serializer, prefix):
+        node = _Node()
+        first = len(self.paths)
+
+        for key, field in serializer.fields.items():
+            path = f"{prefix}.{key}" if prefix else key
+            many = isinstance(field, ListSerializer)
+            nested = field.child if many else field
+
+            if isinstance(nested, ModelSerializer):
+                child = self._compile(nested, path)
+                if not field.write_only:
+                    node.children.append((key, child, many))
+                continue
+
+            index = len(self.paths)
+            self.paths.append(path)
+            self.labels.append(nested.label)
+            if not field.write_only:
+                node.leaves.append((key, index))
+
+        node.span = (first, len(self.paths))
+        return node
+
+    # ========================
+    # Output
+    # ========================
+    def headers(self):
+        """{字段路径: 字段标签}, translated in the active language."""
+        return {
+            path: _(label) if label else path
+            for path, label in zip(self.paths, self.labels)
+        }
+
+    def iter_rows(self, data):
+        """Yield one tuple per flattened row of a single serialized record."""
+        row = [None] * len(self.paths)
+        for _filled in self.root.fill(data, row):
+            yield tuple(row)
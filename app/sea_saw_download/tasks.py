@@ -1,20 +1,29 @@
 import logging
 import os
+import time
 from datetime import timedelta
 
-import pandas as pd
 from celery import shared_task
+from celery.exceptions import SoftTimeLimitExceeded
 from django.conf import settings
 from django.db import models
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from django.utils.translation import activate
 
+from sea_saw_download.exporter import StreamingCSVExporter
 from sea_saw_download.models import DownloadTask
-from sea_saw_download.utilis import dynamic_import_model, flatten, dynamic_import_serializer
+from sea_saw_download.utilis import (
+    dynamic_import_model,
+    dynamic_import_serializer,
+    import_xlsx_bulk_export,
+)
 
 logger = logging.getLogger(__name__)
 
+# Minimum seconds between two progress writes of a running export
+PROGRESS_INTERVAL = 2.0
+
 
 def split_class_path(class_path):
     """Split 'app_name.ClassName' into (app_name, class_name)."""
@@ -25,8 +34,9 @@ def split_class_path(class_path):
 @shared_task(bind=True)
 def generate_csv_task(self, model_cls, serializer_cls, filters, ordering, task):
     """
-    Generate a CSV file for the filtered data using pandas with chunked processing.
-    Processes data in chunks to avoid memory issues with large datasets.
+    Generate a CSV file for the filtered data.
+    Streams keyset-paginated pages through a single open csv writer (see
+    StreamingCSVExporter), so memory and per-page cost stay flat for large exports.
     """
     activate("zh-hans")
 
@@ -39,11 +49,12 @@ def generate_csv_task(self, model_cls, serializer_cls, filters, ordering, task):
         app_name, serializer_name = split_class_path(serializer_cls)
         serializer = dynamic_import_serializer(app_name, serializer_name)
 
-        total_count = model.objects.filter(**filters).count()
+        queryset = model.objects.filter(**filters)
+        total_count = queryset.count()
         task_obj.total_records = total_count
-        task_obj.save()
+        task_obj.save(update_fields=["total_records"])
 
-        MAX_RECORDS = 100000
+        MAX_RECORDS = settings.DOWNLOAD_MAX_RECORDS
         if total_count > MAX_RECORDS:
             task_obj.status = DownloadTask.Status.FAILED
             task_obj.error_message = (
@@ -61,36 +72,93 @@ def generate_csv_task(self, model_cls, serializer_cls, filters, ordering, task):
         task_obj.save()
         return {"error": str(e)}
 
+    def report_progress(processed, total):
+        # queryset.update: one UPDATE, no full-row save per page
+        DownloadTask.objects.filter(pk=task_obj.pk).update(processed_records=processed)
+        self.update_state(
+            state='PROGRESS',
+            meta={
+                'current': processed,
+                'total': total,
+                'percentage': int((processed / total) * 100) if total else 0
+            }
+        )
+
     try:
-        CHUNK_SIZE = 1000
-        first_chunk = True
+        exporter = StreamingCSVExporter(
+            queryset,
+            serializer,
+            ordering=ordering,
+            chunk_size=settings.DOWNLOAD_CHUNK_SIZE,
+        )
+        processed = exporter.write(
+            task["file_path"], total=total_count, progress_callback=report_progress
+        )
 
-        for offset in range(0, total_count, CHUNK_SIZE):
-            task_obj.processed_records = offset
-            task_obj.save()
+        task_obj.status = DownloadTask.Status.COMPLETED
+        task_obj.completed_at = timezone.now()
+        task_obj.processed_records = processed
+        task_obj.expires_at = timezone.now() + timedelta(days=7)
+        task_obj.download_url = (
+            f"{settings.MEDIA_URL.rstrip('/')}/downloads/{task_obj.file_name}"
+        )
+        task_obj.save()
+
+        return task_obj.pk
+
+    except SoftTimeLimitExceeded:
+        task_obj.status = DownloadTask.Status.FAILED
+        task_obj.error_message = "导出超时，请缩小筛选范围后重试"
+        task_obj.save()
+        return {"error": task_obj.error_message}
 
+    except Exception as e:
+        task_obj.status = DownloadTask.Status.FAILED
+        task_obj.error_message = str(e)
+        task_obj.save()
+        return {"error": str(e)}
+
+
+@shared_task(bind=True)
+def generate_xlsx_bulk_task(self, kind, ids, task):
+    """
+    Generate a multi-sheet contract XLSX (one sheet per record) in the worker.
+    Progress is reported through DownloadTask like the CSV export.
+    """
+    task_obj = get_object_or_404(DownloadTask, pk=task["pk"])
+
+    try:
+        model, generator = import_xlsx_bulk_export(kind)
+        queryset = model.objects.filter(pk__in=ids)
+        total_count = len(ids)
+        task_obj.total_records = total_count
+        task_obj.save(update_fields=["total_records"])
+
+        os.makedirs(os.path.dirname(task["file_path"]), exist_ok=True)
+
+        last_report = 0.0
+
+        def report_progress(processed, total):
+            nonlocal last_report
+            now = time.monotonic()
+            if processed < total and now - last_report < PROGRESS_INTERVAL:
+                return
+            last_report = now
+            DownloadTask.objects.filter(pk=task_obj.pk).update(
+                processed_records=processed
+            )
             self.update_state(
                 state='PROGRESS',
                 meta={
-                    'current': offset,
-                    'total': total_count,
-                    'percentage': int((offset / total_count) * 100) if total_count > 0 else 0
+                    'current': processed,
+                    'total': total,
+                    'percentage': int((processed / total) * 100) if total else 0
                 }
             )
 
-            queryset = model.objects.filter(**filters).order_by(*ordering)[offset:offset + CHUNK_SIZE]
-            data, headers = flatten(queryset, serializer)
-
-            df = pd.DataFrame.from_records(data)
-            df = df.rename(columns=headers)
-            df.to_csv(
-                task["file_path"],
-                mode='a',
-                header=first_chunk,
-                index=False,
-                encoding="utf-8-sig"
-            )
-            first_chunk = False
+        buf = generator(queryset, progress_callback=report_progress)
+        with open(task["file_path"], "wb") as handle:
+            handle.write(buf.getbuffer())
 
         task_obj.status = DownloadTask.Status.COMPLETED
         task_obj.completed_at = timezone.now()
@@ -1 +1,240 @@
-# Create your tests here.
+import csv
+import os
+import tempfile
+from unittest import mock
+
+from celery.exceptions import SoftTimeLimitExceeded
+from django.db.models import F
+from django.test import TestCase
+from openpyxl import load_workbook
+from rest_framework.test import APIClient
+
+from sea_saw_auth.models import Role, User
+from sea_saw_sales.models import Order, OrderItem
+from sea_saw_sales.serializers import OrderItemSerializer, OrderSerializerForDownload
+
+from .exporter import KeysetPaginator, StreamingCSVExporter
+from .flattener import FlattenPlan
+from .models import DownloadTask
+from .tasks import generate_csv_task, generate_xlsx_bulk_task
+from .utilis import flatten_header, traverse
+
+
+class OrderWithTwoItemListsSerializer(OrderSerializerForDownload):
+    """Two many=True fields on one level: rows are their Cartesian product."""
+
+    items_again = OrderItemSerializer(source="order_items", many=True, read_only=True)
+
+    class Meta(OrderSerializerForDownload.Meta):
+        fields = OrderSerializerForDownload.Meta.fields + ["items_again"]
+        read_only_fields = fields
+
+
+class KeysetPaginatorTests(TestCase):
+
+    def setUp(self):
+        # Two NULL dates and a duplicated date exercise the tie-breakers
+        dates = ["2024-03-01", None, "2024-01-01", "2024-03-01", None, "2024-02-01"]
+        for date in dates:
+            Order.objects.create(order_date=date)
+
+    def _paged_ids(self, ordering):
+        paginator = KeysetPaginator(Order.objects.all(), ordering, page_size=2)
+        return [order.pk for page in paginator.pages() for order in page]
+
+    def test_pages_match_plain_ordering(self):
+        cases = {
+            ("order_date",): [F("order_date").asc(nulls_last=True), "pk"],
+            ("-order_date",): [F("order_date").desc(nulls_last=True), "pk"],
+            (): ["pk"],
+            ("-id",): ["-pk"],
+        }
+        for ordering, order_by in cases.items():
+            with self.subTest(ordering=ordering):
+                expected = list(
+                    Order.objects.order_by(*order_by).values_list("pk", flat=True)
+                )
+                self.assertEqual(self._paged_ids(ordering), expected)
+
+    def test_page_query_count_is_constant(self):
+        paginator = KeysetPaginator(Order.objects.all(), ["order_date"], page_size=2)
+        pages = paginator.pages()
+        for _ in range(3):
+            with self.assertNumQueries(1):
+                next(pages)
+
+
+class StreamingCSVExporterTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="exporter")
+        for index in range(5):
+            order = Order.objects.create(order_date="2024-01-01", owner=self.user)
+            for _ in range(index % 3):
+                OrderItem.objects.create(
+                    order=order, order_qty=1, gross_weight=1, unit_price=2
+                )
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.file_path = os.path.join(self.directory.name, "orders.csv")
+
+    def _read(self):
+        with open(self.file_path, encoding="utf-8-sig", newline="") as handle:
+            return list(csv.reader(handle))
+
+    def test_writes_one_row_per_item_with_fixed_columns(self):
+        exporter = StreamingCSVExporter(
+            Order.objects.all(), OrderSerializerForDownload, ["id"], chunk_size=2
+        )
+        progress = []
+        processed = exporter.write(
+            self.file_path, total=5, progress_callback=lambda *args: progress.append(args)
+        )
+
+        rows = self._read()
+        header, body = rows[0], rows[1:]
+        self.assertEqual(processed, 5)
+        self.assertEqual(len(header), len(exporter.get_headers()))
+        # Orders without items still produce one row: 1 + 1 + 2 + 1 + 1
+        self.assertEqual(len(body), 6)
+        self.assertTrue(all(len(row) == len(header) for row in body))
+        self.assertEqual(progress[-1], (5, 5))
+
+    def test_task_exports_and_batches_progress(self):
+        task = DownloadTask.objects.create(
+            user=self.user, file_name="orders.csv", file_path=self.file_path
+        )
+        with mock.patch.object(generate_csv_task, "update_state") as update_state:
+            generate_csv_task.apply(
+                args=(
+                    "sea_saw_sales.Order",
+                    "sea_saw_sales.OrderSerializerForDownload",
+                    {},
+                    ["-order_date"],
+                    {"pk": task.pk, "file_path": self.file_path},
+                )
+            )
+
+        task.refresh_from_db()
+        self.assertEqual(task.status, DownloadTask.Status.COMPLETED)
+        self.assertEqual(task.processed_records, 5)
+        self.assertEqual(task.total_records, 5)
+        # Fast export: only the final progress report is sent
+        self.assertEqual(update_state.call_count, 1)
+        self.assertEqual(len(self._read()), 7)
+
+    def test_task_reports_soft_time_limit(self):
+        task = DownloadTask.objects.create(
+            user=self.user, file_name="orders.csv", file_path=self.file_path
+        )
+        with mock.patch.object(
+            StreamingCSVExporter, "write", side_effect=SoftTimeLimitExceeded()
+        ):
+            generate_csv_task.apply(
+                args=(
+                    "sea_saw_sales.Order",
+                    "sea_saw_sales.OrderSerializerForDownload",
+                    {},
+                    ["id"],
+                    {"pk": task.pk, "file_path": self.file_path},
+                )
+            )
+
+        task.refresh_from_db()
+        self.assertEqual(task.status, DownloadTask.Status.FAILED)
+        self.assertTrue(task.error_message)
+
+
+class FlattenPlanTests(TestCase):
+
+    def setUp(self):
+        self.empty = Order.objects.create()
+        self.full = Order.objects.create()
+        for qty in (1, 2, 3):
+            OrderItem.objects.create(order=self.full, order_qty=qty, unit_price=1)
+
+    def _assert_matches_traverse(self, serializer_class):
+        plan = FlattenPlan.for_serializer(serializer_class)
+        serializer = serializer_class(Order.objects.order_by("pk"), many=True)
+        headers = flatten_header(serializer)
+        self.assertEqual(plan.headers(), headers)
+
+        expected = [
+            tuple(row.get(path) for path in headers)
+            for row in traverse(serializer.data, serializer)
+        ]
+        rows = [row for data in serializer.data for row in plan.iter_rows(data)]
+        self.assertEqual(rows, expected)
+        return rows
+
+    def test_rows_match_traverse(self):
+        rows = self._assert_matches_traverse(OrderSerializerForDownload)
+        self.assertEqual(len(rows), 1 + 3)
+
+    def test_cartesian_expansion_matches_traverse(self):
+        rows = self._assert_matches_traverse(OrderWithTwoItemListsSerializer)
+        self.assertEqual(len(rows), 1 + 3 * 3)
+
+    def test_plan_is_compiled_once(self):
+        self.assertIs(
+            FlattenPlan.for_serializer(OrderSerializerForDownload),
+            FlattenPlan.for_serializer(OrderSerializerForDownload),
+        )
+
+
+class BulkXlsxExportTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="admin-export", is_staff=True)
+        self.user.role = Role.objects.get(role_name="ADMIN")
+        self.user.save()
+        self.orders = [Order.objects.create() for _ in range(3)]
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_async_request_enqueues_download_task(self):
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        ids = [order.pk for order in self.orders]
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            response = client.post(
+                "/api/sales/orders/export-sales-contract-bulk/",
+                {"ids": ids, "async": True},
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, 202, response.content)
+        task = DownloadTask.objects.get(pk=response.json()["task_id"])
+        self.assertTrue(task.file_name.endswith(".xlsx"))
+        self.assertEqual(len(callbacks), 1)
+
+    def test_task_writes_workbook_and_completes(self):
+        file_path = os.path.join(self.directory.name, "contracts.xlsx")
+        task = DownloadTask.objects.create(
+            user=self.user, file_name="contracts.xlsx", file_path=file_path
+        )
+        with mock.patch.object(generate_xlsx_bulk_task, "update_state"):
+            generate_xlsx_bulk_task.apply(
+                args=(
+                    "sales_contract",
+                    [order.pk for order in self.orders],
+                    {"pk": task.pk, "file_path": file_path},
+                )
+            )
+
+        task.refresh_from_db()
+        self.assertEqual(task.status, DownloadTask.Status.COMPLETED)
+        self.assertEqual(task.processed_records, 3)
+        self.assertEqual(len(load_workbook(file_path).sheetnames), 3)
+
+    def test_unknown_export_kind_is_rejected(self):
+        file_path = os.path.join(self.directory.name, "x.xlsx")
+        task = DownloadTask.objects.create(
+            user=self.user, file_name="x.xlsx", file_path=file_path
+        )
+        generate_xlsx_bulk_task.apply(
+            args=("os.system", [1], {"pk": task.pk, "file_path": file_path})
+        )
+        task.refresh_from_db()
+        self.assertEqual(task.status, DownloadTask.Status.FAILED)
@@ -89,6 +89,14 @@ ALLOWED_SERIALIZERS = {
     'sea_saw_download': ['DownloadTaskSerializer'],
 }
 
+# 异步批量 XLSX 导出: kind → (模型, 生成函数所在模块, 生成函数名)
+XLSX_BULK_EXPORTS = {
+    'sales_contract': ('sea_saw_sales.Order', 'sea_saw_sales.sc', 'generate_sc_bulk_xlsx'),
+    'purchase_contract': (
+        'sea_saw_procurement.PurchaseOrder', 'sea_saw_procurement.pc', 'generate_pc_bulk_xlsx'
+    ),
+}
+
 
 def _whitelist_check(name, allowed_map, kind):
     """校验 app_name 和 class_name 是否在白名单中，不通过则抛出 ValueError。"""
@@ -128,3 +136,16 @@ def dynamic_import_serializer(app_name, serializer_name):
         raise ImportError(f"Failed to import serializer {serializer_name} from {app_name}: {e}")
     except AttributeError:
         raise AttributeError(f"Serializer {serializer_name} not found in {app_name}.serializers")
+
+
+def import_xlsx_bulk_export(kind):
+    """按 kind 返回 (模型类, 批量生成函数)，仅允许 XLSX_BULK_EXPORTS 中登记的导出。"""
+    if kind not in XLSX_BULK_EXPORTS:
+        raise ValueError(
+            f"Security Error: XLSX export '{kind}' is not allowed. "
+            f"Allowed: {list(XLSX_BULK_EXPORTS.keys())}"
+        )
+    model_path, module_path, generator_name = XLSX_BULK_EXPORTS[kind]
+    model = dynamic_import_model(*model_path.split("."))
+    generator = getattr(importlib.import_module(module_path), generator_name)
+    return model, generator
@@ -21,11 +21,11 @@ class DownloadTaskView(DownloadView):
         if user.is_superuser or user.is_staff:
             return filters
 
-        user_groups = set(user.groups.values_list("name", flat=True))
+        user_groups = user.get_group_names()
         if "Production" in user_groups:
             return filters
 
         # 非管理员：仅返回可见用户的数据
-        visible_user_pks = [u.pk for u in user.get_all_visible_users()]
+        visible_user_pks = sorted(user.get_visible_user_ids())
         filters["owner__pk__in"] = visible_user_pks
         return filters
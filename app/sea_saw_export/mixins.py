@@ -1,7 +1,14 @@
 """Reusable ViewSet mixin for single and bulk XLSX export actions."""
 
+import os
+import uuid
+
+from django.conf import settings
 from django.http import FileResponse
+from django.utils import timezone
+from rest_framework import status
 from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
 
 XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
 
@@ -29,18 +36,56 @@ class ExportViewSetMixin:
         buf = generator_fn(obj)
         return self._export_response(buf, get_filename_fn(obj))
 
-    def _export_bulk(self, generator_fn, get_filename_fn, ids):
+    def _is_async_export(self):
+        """``{"async": true}`` in the body or ``?async=true`` selects async mode."""
+        value = self.request.data.get("async", self.request.query_params.get("async"))
+        return str(value).lower() in ("1", "true", "yes")
+
+    def _export_bulk(self, generator_fn, get_filename_fn, ids, export_kind=None):
         """Handle a bulk export action.
 
         Args:
             generator_fn: callable(queryset) -> BytesIO
             get_filename_fn: callable(queryset) -> str
             ids: list of primary keys from request.data
+            export_kind: key in sea_saw_download XLSX_BULK_EXPORTS; enables
+                async mode (generation in a Celery worker, tracked by DownloadTask)
         """
         if not ids:
             raise ValidationError({"ids": "This field is required."})
         qs = self.get_queryset().filter(pk__in=ids)
         if not qs.exists():
             raise ValidationError({"ids": "No matching records found."})
+        if export_kind and self._is_async_export():
+            return self._enqueue_bulk_export(export_kind, qs, get_filename_fn(qs))
         buf = generator_fn(qs)
         return self._export_response(buf, get_filename_fn(qs))
+
+    def _enqueue_bulk_export(self, export_kind, qs, filename):
+        """Create a DownloadTask and hand the generation to the worker."""
+        from sea_saw_download.models import DownloadTask
+        from sea_saw_download.serializers import DownloadTaskSerializer
+        from sea_saw_download.tasks import generate_xlsx_bulk_task
+
+        user = self.request.user
+        stem, _ = os.path.splitext(filename)
+        timestamp = timezone.now().strftime("%Y%m%d%H%M%S")
+        file_name = f"{user.username}/{stem}_{timestamp}_{uuid.uuid4().hex}.xlsx"
+
+        task = DownloadTask.objects.create(
+            user=user,
+            file_name=file_name,
+            file_path=os.path.join(settings.MEDIA_ROOT, "downloads", file_name),
+            status=DownloadTask.Status.PROCESSING,
+        )
+
+        # Only ids that passed this view's queryset (permissions) are exported
+        ids = list(qs.values_list("pk", flat=True))
+        generate_xlsx_bulk_task.delay_on_commit(
+            export_kind, ids, DownloadTaskSerializer(task).data
+        )
+
+        return Response(
+            {"task_id": task.id, "message": "下载任务已创建。"},
+            status=status.HTTP_202_ACCEPTED,
+        )
@@ -0,0 +1,103 @@
+import zipfile
+from io import BytesIO
+
+from django.test import TestCase
+
+from sea_saw_sales.models import Order, OrderItem
+from sea_saw_sales.sc import generate_sc_bulk_xlsx, generate_sc_xlsx
+from sea_saw_sales.sc.generator import SC_CONFIG, TEMPLATE_PATH
+
+from .xlsx import PRODUCT_FIRST_ROW, fix_copied_sheet, setup_product_rows
+from .xlsx.template_cache import _templates, load_template
+
+
+def _sheet_parts(buf):
+    """Workbook parts except docProps (which carry save timestamps)."""
+    archive = zipfile.ZipFile(buf)
+    return {
+        name: archive.read(name)
+        for name in archive.namelist()
+        if not name.startswith("docProps/")
+    }
+
+
+class TemplateCacheTests(TestCase):
+
+    def test_clone_saves_like_a_fresh_load(self):
+        from openpyxl import load_workbook
+
+        fresh, cloned = BytesIO(), BytesIO()
+        load_workbook(TEMPLATE_PATH, rich_text=True).save(fresh)
+        load_template(TEMPLATE_PATH).save(cloned)
+        self.assertEqual(_sheet_parts(fresh), _sheet_parts(cloned))
+
+    def test_clones_do_not_leak_into_the_cache(self):
+        wb = load_template(TEMPLATE_PATH)
+        wb["TEMPLATE"]["B4"] = "CHANGED"
+        cached = _templates[TEMPLATE_PATH][1]
+        self.assertNotEqual(cached["TEMPLATE"]["B4"].value, "CHANGED")
+        self.assertNotEqual(load_template(TEMPLATE_PATH)["TEMPLATE"]["B4"].value, "CHANGED")
+
+    def test_generated_contracts_are_stable(self):
+        order = Order.objects.create(order_code="SO-CACHE-1")
+        OrderItem.objects.create(order=order, product_name="Shrimp", order_qty=2, unit_price=3)
+
+        first = _sheet_parts(generate_sc_xlsx(order))
+        second = _sheet_parts(generate_sc_xlsx(order))
+        self.assertEqual(first, second)
+
+    def test_bulk_reports_progress_per_sheet(self):
+        orders = [Order.objects.create() for _ in range(3)]
+        progress = []
+        generate_sc_bulk_xlsx(orders, progress_callback=lambda *args: progress.append(args))
+        self.assertEqual(progress, [(1, 3), (2, 3), (3, 3)])
+
+
+class SetupProductRowsTests(TestCase):
+
+    def _sheet(self):
+        wb = load_template(TEMPLATE_PATH)
+        template_ws = wb[SC_CONFIG.template_sheet]
+        ws = wb.copy_worksheet(template_ws)
+        fix_copied_sheet(template_ws, ws, SC_CONFIG)
+        return template_ws, ws
+
+    def test_rows_below_products_move_as_a_block(self):
+        for n_products in (2, 3, 200):
+            with self.subTest(n_products=n_products):
+                template_ws, ws = self._sheet()
+                shift = n_products - 1
+                total_row = setup_product_rows(ws, n_products, SC_CONFIG)
+                self.assertEqual(total_row, SC_CONFIG.total_row_offset + shift)
+
+                moved = {
+                    (rng.min_col, rng.min_row + shift, rng.max_col, rng.max_row + shift)
+                    for rng in template_ws.merged_cells.ranges
+                    if rng.min_row > PRODUCT_FIRST_ROW
+                }
+                merged = {rng.bounds for rng in ws.merged_cells.ranges}
+                self.assertLessEqual(moved, merged)
+
+                source = template_ws.cell(row=total_row - shift, column=6)
+                target = ws.cell(row=total_row, column=6)
+                self.assertEqual(target.value, source.value)
+                self.assertEqual(target._style, source._style)
+                self.assertEqual(
+                    ws.row_dimensions[total_row].height,
+                    template_ws.row_dimensions[total_row - shift].height,
+                )
+
+    def test_product_rows_share_the_template_row_layout(self):
+        template_ws, ws = self._sheet()
+        setup_product_rows(ws, 200, SC_CONFIG)
+
+        merged = {rng.coord for rng in ws.merged_cells.ranges}
+        reference = template_ws.cell(row=PRODUCT_FIRST_ROW, column=6)
+        for row in range(PRODUCT_FIRST_ROW, PRODUCT_FIRST_ROW + 200):
+            self.assertIn(f"B{row}:C{row}", merged)
+            self.assertIn(f"D{row}:E{row}", merged)
+            self.assertEqual(ws.cell(row=row, column=6)._style, reference._style)
+            self.assertEqual(
+                ws.row_dimensions[row].height,
+                template_ws.row_dimensions[PRODUCT_FIRST_ROW].height,
+            )
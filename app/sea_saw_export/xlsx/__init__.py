@@ -1,6 +1,7 @@
 from .config import DocConfig, PRODUCT_FIRST_ROW
 from .writer import setup_product_rows, fill_product_row, fill_header
 from .builder import fix_copied_sheet
+from .template_cache import load_template
 
 __all__ = [
     "DocConfig",
@@ -9,4 +10,5 @@ __all__ = [
     "fill_product_row",
     "fill_header",
     "fix_copied_sheet",
+    "load_template",
 ]
@@ -0,0 +1,48 @@
+"""Parsed workbook template cache (one parse per process, in-memory clones)."""
+
+import os
+import threading
+from copy import deepcopy
+
+from openpyxl import load_workbook
+from openpyxl.utils.indexed_list import IndexedList
+
+_templates = {}
+_lock = threading.Lock()
+
+
+def _copy_indexed_list(source):
+    # IndexedList does not survive deepcopy (its lookup dict is lost and
+    # duplicates get re-indexed), which corrupts cell style ids on save
+    clone = IndexedList()
+    list.extend(clone, source)
+    clone._dict = dict(source._dict)
+    clone.clean = source.clean
+    return clone
+
+
+def clone_workbook(wb):
+    """Independent in-memory copy of an openpyxl Workbook."""
+    clone = deepcopy(wb)
+    for name, value in vars(wb).items():
+        if isinstance(value, IndexedList):
+            setattr(clone, name, _copy_indexed_list(value))
+    return clone
+
+
+def load_template(path):
+    """
+    Return a fresh copy of the template workbook at ``path``.
+
+    The file is parsed once per process (re-parsed if its mtime changes);
+    callers get a clone they are free to modify.
+    """
+    mtime = os.path.getmtime(path)
+    cached = _templates.get(path)
+    if cached is None or cached[0] != mtime:
+        with _lock:
+            cached = _templates.get(path)
+            if cached is None or cached[0] != mtime:
+                cached = (mtime, load_workbook(path, rich_text=True))
+                _templates[path] = cached
+    return clone_workbook(cached[1])
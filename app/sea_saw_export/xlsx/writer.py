@@ -2,13 +2,18 @@
 
 from copy import copy
 
+from openpyxl.cell.cell import Cell, MergedCell
 from openpyxl.styles import Font, Border, PatternFill
-from openpyxl.utils import get_column_letter
-from openpyxl.cell.cell import MergedCell
+from openpyxl.worksheet.merge import MergedCellRange
 
+from .builder import shift_images_down
 from .config import PRODUCT_FIRST_ROW
 from .utils import parse_date, specs_to_multiline, safe_str
 
+# Columns written for every product row, and the merges of a product row
+PRODUCT_COLUMNS = range(2, 10)
+PRODUCT_MERGES = ("B{row}:C{row}", "D{row}:E{row}")
+
 
 def _write_cell(ws, row, col, value):
     """Write value to a cell, resolving merged ranges to their top-left corner."""
@@ -31,56 +36,107 @@ def _copy_cell_style(src, dst):
 
 
 def shift_rows_down(ws, from_row, shift_by):
-    """Move all rows >= from_row downward by shift_by rows."""
+    """
+    Move all rows >= from_row downward by shift_by rows in a single pass.
+
+    Cell objects are re-keyed in ws._cells (value and style travel with the
+    cell, no per-cell style copies); merged ranges, row heights and images
+    anchored below from_row are remapped once.
+    """
     if shift_by <= 0:
         return
 
-    to_shift = []
-    for rng in list(ws.merged_cells.ranges):
-        if rng.min_row >= from_row:
-            to_shift.append((rng.min_col, rng.min_row, rng.max_col, rng.max_row))
-            ws.unmerge_cells(str(rng))
-
-    for r in range(ws.max_row, from_row - 1, -1):
-        for c in range(1, ws.max_column + 1):
-            src = ws.cell(row=r, column=c)
-            dst = ws.cell(row=r + shift_by, column=c)
-            dst.value = src.value
-            _copy_cell_style(src, dst)
-            src.value = None
-            src.font = Font()
-            src.border = Border()
-            src.fill = PatternFill()
-        ws.row_dimensions[r + shift_by].height = ws.row_dimensions[r].height
-
-    for min_col, min_row, max_col, max_row in to_shift:
-        ws.merge_cells(
-            f"{get_column_letter(min_col)}{min_row + shift_by}"
-            f":{get_column_letter(max_col)}{max_row + shift_by}"
-        )
+    cells = ws._cells
+    vacated = []
+    for row, col in sorted((key for key in cells if key[0] >= from_row), reverse=True):
+        cell = cells.pop((row, col))
+        cell.row = row + shift_by
+        cells[(row + shift_by, col)] = cell
+        if row < from_row + shift_by:
+            vacated.append(cell)
+
+    # Opened rows keep number format / alignment but lose font, border, fill
+    blank = None
+    for cell in vacated:
+        if isinstance(cell, MergedCell):
+            continue
+        dst = Cell(ws, row=cell.row - shift_by, column=cell.column)
+        if cell.has_style:
+            dst._style = copy(cell._style)
+            if blank is None:
+                dst.font, dst.border, dst.fill = Font(), Border(), PatternFill()
+                blank = dst._style
+            else:
+                dst._style.fontId = blank.fontId
+                dst._style.borderId = blank.borderId
+                dst._style.fillId = blank.fillId
+        cells[(dst.row, dst.column)] = dst
+
+    # CellRange hashes on its bounds: take every moving range out of the set
+    # first, otherwise a shifted range collides with the one still below it
+    ranges = ws.merged_cells.ranges
+    moving = [rng for rng in ranges if rng.min_row >= from_row]
+    ranges.difference_update(moving)
+    for rng in moving:
+        rng.shift(row_shift=shift_by)
+    ranges.update(moving)
+
+    dims = ws.row_dimensions
+    for r in sorted((r for r in dims if r >= from_row), reverse=True):
+        dims[r + shift_by].height = dims[r].height
+
+    shift_images_down(ws, from_row, shift_by)
+
+
+def _clone_row(ws, src_row, dst_row, columns):
+    """Give dst_row the same cell types (Cell / MergedCell) and styles as src_row."""
+    cells = ws._cells
+    for c in columns:
+        src = cells.get((src_row, c))
+        if src is None:
+            continue
+        if isinstance(src, MergedCell):
+            dst = MergedCell(ws, row=dst_row, column=c)
+        else:
+            dst = Cell(ws, row=dst_row, column=c)
+        dst._style = copy(src._style)
+        cells[(dst_row, c)] = dst
 
 
 def setup_product_rows(ws, n_products, cfg):
     """
     Ensure ws has n_products product rows starting at PRODUCT_FIRST_ROW.
     Returns the actual Total row number after expansion.
+
+    The first inserted row is built from the template product row (style copy
+    + merges); every further row clones that row's style arrays and merges.
     """
     if n_products > 1:
-        shift_rows_down(ws, PRODUCT_FIRST_ROW + 1, n_products - 1)
+        first_new = PRODUCT_FIRST_ROW + 1
+        last_new = PRODUCT_FIRST_ROW + n_products - 1
+        shift_rows_down(ws, first_new, n_products - 1)
 
-    ref_row = PRODUCT_FIRST_ROW
-    for i in range(1, n_products):
-        r = PRODUCT_FIRST_ROW + i
+        # One scan: drop merges overlapping the freshly opened rows
         for rng in list(ws.merged_cells.ranges):
-            if rng.min_row <= r <= rng.max_row:
+            if rng.min_row <= last_new and rng.max_row >= first_new:
                 ws.unmerge_cells(str(rng))
-        for c in range(2, 10):
-            new_cell = ws.cell(row=r, column=c)
+
+        ref_row = PRODUCT_FIRST_ROW
+        for c in PRODUCT_COLUMNS:
+            new_cell = ws.cell(row=first_new, column=c)
             new_cell.value = None
             _copy_cell_style(ws.cell(row=ref_row, column=c), new_cell)
-        ws.merge_cells(f"B{r}:C{r}")
-        ws.merge_cells(f"D{r}:E{r}")
-        ws.row_dimensions[r].height = ws.row_dimensions[ref_row].height
+        for merge in PRODUCT_MERGES:
+            ws.merge_cells(merge.format(row=first_new))
+        height = ws.row_dimensions[ref_row].height
+        ws.row_dimensions[first_new].height = height
+
+        ranges = ws.merged_cells.ranges
+        for r in range(first_new + 1, last_new + 1):
+            for merge in PRODUCT_MERGES:
+                ranges.add(MergedCellRange(ws, merge.format(row=r)))
+            _clone_row(ws, first_new, r, PRODUCT_COLUMNS)
+            ws.row_dimensions[r].height = height
 
     return cfg.total_row_offset + (n_products - 1)
 
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class SeaSawFinanceConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "sea_saw_finance"
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.2 on 2026-10-17 01:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_pipeline_owner(apps, schema_editor):
+    Payment = apps.get_model("sea_saw_finance", "Payment")
+    Pipeline = apps.get_model("sea_saw_pipeline", "Pipeline")
+
+    Payment._base_manager.update(
+        pipeline_owner_id=models.Subquery(
+            Pipeline._base_manager.filter(pk=models.OuterRef("pipeline_id")).values(
+                "owner_id"
+            )[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sea_saw_finance', '0002_fix_payment_type_from_content_type'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='payment',
+            name='pipeline_owner',
+            field=models.ForeignKey(blank=True, editable=False, help_text='Owner of the pipeline, copied on save for visibility filtering', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Pipeline Owner'),
+        ),
+        migrations.RunPython(backfill_pipeline_owner, migrations.RunPython.noop),
+    ]
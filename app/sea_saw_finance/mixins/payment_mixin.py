@@ -4,10 +4,11 @@ Payment-related mixins for views
 Updated to support the new Payment model with Pipeline integration
 and all payment types (Order, PurchaseOrder, ProductionOrder, OutboundOrder).
 """
-from django.contrib.contenttypes.models import ContentType
-from django.db import models
+from django.conf import settings
 from rest_framework.exceptions import PermissionDenied, ValidationError
 
+from sea_saw_base.utils import ContentTypeRegistry
+
 
 class PaymentRoleSerializerMixin:
     """
@@ -51,63 +52,39 @@ class PaymentQuerysetFilterMixin:
         from sea_saw_warehouse.models import OutboundOrder
 
         return {
-            "order": ContentType.objects.get_for_model(Order),
-            "purchase_order": ContentType.objects.get_for_model(PurchaseOrder),
-            "production_order": ContentType.objects.get_for_model(ProductionOrder),
-            "outbound_order": ContentType.objects.get_for_model(OutboundOrder),
+            "order": ContentTypeRegistry.get_for_model(Order),
+            "purchase_order": ContentTypeRegistry.get_for_model(PurchaseOrder),
+            "production_order": ContentTypeRegistry.get_for_model(ProductionOrder),
+            "outbound_order": ContentTypeRegistry.get_for_model(OutboundOrder),
         }
 
     def filter_queryset_by_ownership(self, queryset, user):
         """
-        Filter payments to only show those related to objects owned by the user.
+        Filter payments to those of pipelines owned by users visible to ``user``
+        (self, descendant roles, peers of a peer-visible role).
         Used for SALE role users.
 
+        One predicate on the indexed pipeline FK (or, with
+        PAYMENT_OWNER_FILTER = "denormalized", on Payment.pipeline_owner)
+        instead of per-entity id lists, matching CanManagePayment's
+        object-level check.
+
         Args:
             queryset: Payment queryset to filter
             user: User to filter by ownership
 
         Returns:
-            Filtered queryset showing only payments for user-owned entities
+            Filtered queryset showing only payments of visible pipelines
         """
-        from sea_saw_sales.models import Order
-        from sea_saw_production.models import ProductionOrder
-        from sea_saw_procurement.models import PurchaseOrder
-        from sea_saw_warehouse.models import OutboundOrder
-
-        content_types = self.get_payment_related_content_types()
-
-        # Get IDs of entities owned by user
-        owned_order_ids = Order.objects.filter(owner=user).values_list("id", flat=True)
-        owned_purchase_order_ids = PurchaseOrder.objects.filter(owner=user).values_list(
-            "id", flat=True
-        )
-        owned_production_order_ids = ProductionOrder.objects.filter(
-            owner=user
-        ).values_list("id", flat=True)
-        owned_outbound_order_ids = OutboundOrder.objects.filter(owner=user).values_list(
-            "id", flat=True
-        )
-
-        # Build Q objects for each entity type
-        q_filters = (
-            models.Q(
-                content_type=content_types["order"], object_id__in=owned_order_ids
-            )
-            | models.Q(
-                content_type=content_types["purchase_order"],
-                object_id__in=owned_purchase_order_ids,
-            )
-            | models.Q(
-                content_type=content_types["production_order"],
-                object_id__in=owned_production_order_ids,
-            )
-            | models.Q(
-                content_type=content_types["outbound_order"],
-                object_id__in=owned_outbound_order_ids,
-            )
+        visible_user_ids = (
+            user.get_visible_user_ids()
+            if callable(getattr(user, "get_visible_user_ids", None))
+            else {user.pk}
         )
 
-        return queryset.filter(q_filters)
+        if settings.PAYMENT_OWNER_FILTER == "denormalized":
+            return queryset.filter(pipeline_owner_id__in=visible_user_ids)
+        return queryset.filter(pipeline__owner_id__in=visible_user_ids)
 
 
 class PaymentContentTypeHelperMixin:
@@ -149,7 +126,7 @@ class PaymentContentTypeHelperMixin:
 
         model_class = model_map.get(model_name)
         if model_class:
-            return ContentType.objects.get_for_model(model_class)
+            return ContentTypeRegistry.get_for_model(model_class)
         return None
 
     def get_content_type_from_params(self):
@@ -7,6 +7,7 @@ from django.contrib.contenttypes.models import ContentType
 
 from sea_saw_base.models import BaseModel
 from sea_saw_base.models import CurrencyType
+from sea_saw_base.utils import ContentTypeRegistry
 from .enums import PaymentMethodType, PaymentType
 
 
@@ -80,6 +81,19 @@ class Payment(BaseModel):
         help_text=_("The business pipeline this payment belongs to"),
     )
 
+    # Pipeline.owner 的冗余副本, save() 时维护; SALE 列表按可见用户过滤时无需 JOIN
+    # (PAYMENT_OWNER_FILTER = "denormalized", 见 PaymentQuerysetFilterMixin)
+    pipeline_owner = models.ForeignKey(
+        "sea_saw_auth.User",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="+",
+        verbose_name=_("Pipeline Owner"),
+        help_text=_("Owner of the pipeline, copied on save for visibility filtering"),
+    )
+
     # GenericForeignKey绑定具体的子流程实体 (Order, PurchaseOrder, ProductionOrder, OutboundOrder)
     content_type = models.ForeignKey(
         ContentType,
@@ -157,8 +171,8 @@ class Payment(BaseModel):
 
     def save(self, *args, **kwargs):
         # Always derive payment_type from content_type when available
-        if self.content_type:
-            model_name = self.content_type.model
+        if self.content_type_id:
+            model_name = ContentTypeRegistry.model_name(self.content_type_id)
             if model_name == "order":
                 self.payment_type = PaymentType.ORDER_PAYMENT
             elif model_name == "purchaseorder":
@@ -170,6 +184,14 @@ class Payment(BaseModel):
             else:
                 self.payment_type = PaymentType.ORDER_PAYMENT
 
+        # Keep the denormalized pipeline owner in step with the pipeline
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or {"pipeline", "pipeline_id"} & set(update_fields):
+            pipeline_owner_id = self.pipeline.owner_id if self.pipeline_id else None
+            if update_fields is not None and pipeline_owner_id != self.pipeline_owner_id:
+                kwargs["update_fields"] = [*update_fields, "pipeline_owner"]
+            self.pipeline_owner_id = pipeline_owner_id
+
         # Generate payment code if not set
         if not self.payment_code:
             # Prefix based on payment type
@@ -189,3 +211,24 @@ class Payment(BaseModel):
 
     def __str__(self):
         return f"{self.payment_code} - {self.amount} {self.currency}"
+
+    @classmethod
+    def sync_pipeline_owner(cls, pipeline_ids=None):
+        """
+        Copy Pipeline.owner onto pipeline_owner of payments of ``pipeline_ids``
+        (all payments if None). Needed after bulk pipeline owner changes.
+
+        Returns:
+            int: Number of payments updated
+        """
+        from sea_saw_pipeline.models import Pipeline
+
+        owner = models.Subquery(
+            Pipeline.all_objects.filter(pk=models.OuterRef("pipeline_id")).values(
+                "owner_id"
+            )[:1]
+        )
+        queryset = cls._base_manager.all()
+        if pipeline_ids is not None:
+            queryset = queryset.filter(pipeline_id__in=pipeline_ids)
+        return queryset.update(pipeline_owner_id=owner)
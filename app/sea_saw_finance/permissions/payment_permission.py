@@ -56,12 +56,12 @@ class CanManagePayment(BasePermission):
             return False
 
         # 检查是否为当前用户或其下属的 pipeline
-        visible_users = (
-            user.get_all_visible_users()
-            if callable(getattr(user, "get_all_visible_users", None))
-            else [user]
+        visible_user_ids = (
+            user.get_visible_user_ids()
+            if callable(getattr(user, "get_visible_user_ids", None))
+            else {user.pk}
         )
-        if pipeline.owner not in visible_users:
+        if pipeline.owner_id not in visible_user_ids:
             return False
 
         # 只读请求始终允许（在通过以上检查后）
@@ -41,6 +41,9 @@ class PaymentNestedSerializer(
 
     attachment_model = Attachment
 
+    # PrefetchPlan hint: get_related_order_code reads the GenericForeignKey
+    prefetch_related_hints = ["related_object"]
+
     class Meta(BaseSerializer.Meta):
         model = Payment
         fields = [
@@ -0,0 +1,33 @@
+"""
+Finance signals module.
+
+Payment.pipeline_owner mirrors Pipeline.owner (see Payment.save). When a
+pipeline changes owner, the copies on its payments are refreshed.
+Bulk operations (QuerySet.update) bypass signals and must call
+Payment.sync_pipeline_owner() explicitly.
+"""
+
+from django.db.models.signals import post_init, post_save
+
+from sea_saw_pipeline.models import Pipeline
+
+from .models import Payment
+
+# owner_id as loaded from the database (set on post_init)
+LOADED_OWNER_ATTR = "_payment_loaded_owner_id"
+
+
+def remember_pipeline_owner(sender, instance, **kwargs):
+    # __dict__ lookup: never triggers a query for deferred fields
+    setattr(instance, LOADED_OWNER_ATTR, instance.__dict__.get("owner_id"))
+
+
+def sync_payment_pipeline_owner(sender, instance, created, **kwargs):
+    previous = getattr(instance, LOADED_OWNER_ATTR, None)
+    if not created and previous != instance.owner_id:
+        Payment.sync_pipeline_owner([instance.pk])
+    setattr(instance, LOADED_OWNER_ATTR, instance.owner_id)
+
+
+post_init.connect(remember_pipeline_owner, sender=Pipeline)
+post_save.connect(sync_payment_pipeline_owner, sender=Pipeline)
@@ -1,3 +1,81 @@
-from django.test import TestCase
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from sea_saw_auth.models import Role, User
+from sea_saw_pipeline.models import Pipeline
+from sea_saw_sales.models import Order
+
+from .models import Payment
+
+
+class PaymentOwnershipFilterTests(TestCase):
+    """SALE payment lists follow pipeline ownership and the role hierarchy."""
+
+    URL = "/api/finance/payments/"
+
+    def setUp(self):
+        manager_role = Role.objects.create(role_name="Sales Lead", role_type="SALE")
+        sale_role = Role.objects.create(
+            role_name="Sales Rep", role_type="SALE", parent=manager_role
+        )
+        self.manager = User.objects.create_user(username="lead", role=manager_role)
+        self.seller = User.objects.create_user(username="rep", role=sale_role)
+        self.other = User.objects.create_user(
+            username="other",
+            role=Role.objects.create(role_name="Other Sales", role_type="SALE"),
+        )
+
+        self.seller_payment = self._create_payment(self.seller)
+        self.other_payment = self._create_payment(self.other)
+
+    def _create_payment(self, owner):
+        order = Order.objects.create(owner=owner)
+        pipeline = Pipeline.objects.create(order=order, owner=owner)
+        return Payment.objects.create(
+            pipeline=pipeline,
+            content_type=ContentType.objects.get_for_model(Order),
+            object_id=order.pk,
+            payment_date="2024-02-01",
+            amount=10,
+        )
+
+    def _visible_codes(self, user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        response = client.get(self.URL)
+        self.assertEqual(response.status_code, 200, response.content)
+        data = response.json()
+        rows = data["results"] if isinstance(data, dict) else data
+        return {row["payment_code"] for row in rows}
+
+    def test_visibility_follows_role_hierarchy(self):
+        for filter_mode in ("pipeline", "denormalized"):
+            with self.subTest(filter_mode), override_settings(
+                PAYMENT_OWNER_FILTER=filter_mode
+            ):
+                self.assertEqual(
+                    self._visible_codes(self.seller), {self.seller_payment.payment_code}
+                )
+                self.assertEqual(
+                    self._visible_codes(self.manager),
+                    {self.seller_payment.payment_code},
+                )
+                self.assertEqual(
+                    self._visible_codes(self.other), {self.other_payment.payment_code}
+                )
+
+    def test_pipeline_owner_is_denormalized(self):
+        payment = self.seller_payment
+        self.assertEqual(payment.pipeline_owner_id, self.seller.pk)
+
+        pipeline = Pipeline.objects.get(pk=payment.pipeline_id)
+        pipeline.owner = self.other
+        pipeline.save()
+        payment.refresh_from_db()
+        self.assertEqual(payment.pipeline_owner_id, self.other.pk)
+
+        Pipeline.objects.filter(pk=pipeline.pk).update(owner=self.seller)
+        self.assertEqual(Payment.sync_pipeline_owner([pipeline.pk]), 1)
+        payment.refresh_from_db()
+        self.assertEqual(payment.pipeline_owner_id, self.seller.pk)
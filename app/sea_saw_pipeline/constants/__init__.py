@@ -6,6 +6,8 @@ from .pipeline_constants import (
     PIPELINE_STATE_MACHINE_BY_TYPE,
     PIPELINE_ROLE_ALLOWED_TARGET_STATES,
     PIPELINE_STATUS_PRIORITY,
+    PIPELINE_TRANSITION_TABLE,
+    PIPELINE_TRANSITIONS_BY_ROLE,
     PipelineStatus,
     PipelineTypeAccess,
 )
@@ -23,6 +25,8 @@ __all__ = [
     "PIPELINE_STATE_MACHINE_BY_TYPE",
     "PIPELINE_ROLE_ALLOWED_TARGET_STATES",
     "PIPELINE_STATUS_PRIORITY",
+    "PIPELINE_TRANSITION_TABLE",
+    "PIPELINE_TRANSITIONS_BY_ROLE",
     "PipelineStatus",
     "PipelineTypeAccess",
     "SubEntityStatus",
@@ -247,3 +247,26 @@ class PipelineTypeAccess:
         PipelineType.PURCHASE_FLOW,
         PipelineType.HYBRID_FLOW,
     }
+
+
+def _build_transition_table():
+    """Intersect every state-machine node with every role's allowed targets."""
+    table = {}
+    for pipeline_type, state_machine in PIPELINE_STATE_MACHINE_BY_TYPE.items():
+        for status, targets in state_machine.items():
+            for role, role_targets in PIPELINE_ROLE_ALLOWED_TARGET_STATES.items():
+                allowed = targets if "*" in role_targets else targets & role_targets
+                table[(pipeline_type, status, role)] = frozenset(allowed)
+    return table
+
+
+# 预计算的流转表 - (pipeline_type, status, role_type) → 允许的目标状态
+# 导入时由状态机与角色权限一次性求交得到, get_allowed_actions 直接查表
+PIPELINE_TRANSITION_TABLE = _build_transition_table()
+
+# 每个角色可操作的状态 - role_type → {(pipeline_type, status): 非空的目标状态}
+# 用于 ?actionable_by_me=true 在 SQL 中过滤 (目标的前置条件见 PipelineStateService)
+PIPELINE_TRANSITIONS_BY_ROLE = {}
+for (_type, _status, _role), _targets in PIPELINE_TRANSITION_TABLE.items():
+    if _targets:
+        PIPELINE_TRANSITIONS_BY_ROLE.setdefault(_role, {})[(_type, _status)] = _targets
@@ -5,6 +5,7 @@ from django_filters import rest_framework as filters
 
 from sea_saw_base.filtersets import BaseFilter, DateTimeAwareFilter
 from sea_saw_pipeline.models.pipeline import Pipeline
+from sea_saw_pipeline.services import ClosureStateService, PipelineStateService
 
 
 class PipelineFilter(BaseFilter):
@@ -16,12 +17,16 @@ class PipelineFilter(BaseFilter):
     - Related entities: account, contact
     - Finance: total_amount, paid_amount
     - Audit fields: owner, created_by, updated_by, created_at, updated_at
+    - actionable_by_me: pipelines the current user can transition
     """
 
     # Exact-match filters for FK IDs sent by the frontend selector
     account_id = filters.NumberFilter(field_name="account", lookup_expr="exact")
     contact_id = filters.NumberFilter(field_name="contact", lookup_expr="exact")
 
+    # Pipelines with at least one allowed action for the current user's role
+    actionable_by_me = filters.BooleanFilter(method="filter_actionable_by_me")
+
     filter_fields = {
         "pipeline_code": {
             "filter_type": filters.CharFilter,
@@ -86,3 +91,10 @@ class PipelineFilter(BaseFilter):
     class Meta:
         model = Pipeline
         fields = []
+
+    def filter_actionable_by_me(self, queryset, name, value):
+        user = getattr(self.request, "user", None)
+        condition = PipelineStateService.actionable_condition(user)
+        # Closure prerequisites are checked on the annotated counts
+        queryset = ClosureStateService.annotate(queryset)
+        return queryset.filter(condition) if value else queryset.exclude(condition)
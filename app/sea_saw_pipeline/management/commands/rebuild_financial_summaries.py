@@ -0,0 +1,57 @@
+"""
+Management command to rebuild PipelineFinancialSummary rows from scratch.
+
+Usage:
+    python manage.py rebuild_financial_summaries
+    python manage.py rebuild_financial_summaries --pipeline 12 --pipeline 15
+    python manage.py rebuild_financial_summaries --purge
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from sea_saw_pipeline.models import PipelineFinancialSummary
+from sea_saw_pipeline.services import FinancialSummaryService
+
+
+class Command(BaseCommand):
+    help = "Rebuild the materialized financial summary of all pipelines (or specific ones)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--pipeline",
+            type=int,
+            action="append",
+            dest="pipelines",
+            help="Only rebuild the summary of this pipeline id (repeatable)",
+        )
+        parser.add_argument(
+            "--purge",
+            action="store_true",
+            help="Delete all existing summaries before rebuilding",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of pipelines refreshed per transaction (default: 500)",
+        )
+
+    def handle(self, *args, **options):
+        pipeline_ids = options.get("pipelines")
+
+        if options.get("purge"):
+            with transaction.atomic():
+                qs = PipelineFinancialSummary.objects.all()
+                if pipeline_ids:
+                    qs = qs.filter(pipeline_id__in=pipeline_ids)
+                deleted, _ = qs.delete()
+            self.stdout.write(f"  Purged {deleted} summary row(s)")
+
+        count = FinancialSummaryService.rebuild(
+            pipeline_ids, batch_size=options["batch_size"]
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Done. Rebuilt {count} financial summary(ies).")
+        )
@@ -6,7 +6,8 @@ Pipeline Model Manager - Handles Pipeline creation and sub-entity management
 - 从Pipeline创建Order (reverse operation)
 - 从Pipeline创建ProductionOrder/PurchaseOrder/OutboundOrder
 - 自动复制OrderItems到对应的Items
-- 幂等控制和状态管理
+- 一次调用批量创建多个子实体 (create_sub_entities, HYBRID_FLOW 一次建齐三类)
+- 幂等控制和状态管理 (子实体是否存在读取 ClosureStateService, 每个 pipeline 至多一次查询)
 """
 
 from sea_saw_base.manager import BaseModelManager
@@ -27,6 +28,19 @@ class PipelineModelManager(BaseModelManager):
     - State management integration
     """
 
+    @staticmethod
+    def _closure_total(pipeline, order_type):
+        """Number of live sub-entities of ``order_type`` (see ClosureStateService)."""
+        from ..services.closure_state_service import ClosureStateService
+
+        return ClosureStateService.get(pipeline)[order_type][0]
+
+    @staticmethod
+    def _reset_closure_state(pipeline):
+        from ..services.closure_state_service import ClosureStateService
+
+        ClosureStateService.reset(pipeline)
+
     # ========================
     # Create Pipeline
     # ========================
@@ -216,6 +230,7 @@ class PipelineModelManager(BaseModelManager):
     def _copy_order_items(self, target_order, source_order, user=None):
         """Copy OrderItems from source order to target order"""
         from sea_saw_sales.models import OrderItem
+        from ..services.financial_summary_service import FinancialSummaryService
 
         items = [
             OrderItem(
@@ -244,6 +259,9 @@ class PipelineModelManager(BaseModelManager):
 
         if items:
             OrderItem.objects.bulk_create(items)
+            # bulk_create bypasses OrderItem.save() and post_save signals
+            target_order.update_total_amount()
+            FinancialSummaryService.refresh_for_order(target_order.pk)
 
     # ========================
     # Create ProductionOrder
@@ -279,7 +297,30 @@ class PipelineModelManager(BaseModelManager):
         Returns:
             ProductionOrder instance
         """
-        from sea_saw_production.models import ProductionOrder
+        self._validate_production_order(pipeline, force)
+
+        production = self._new_production_order(
+            pipeline,
+            user=user,
+            planned_date=planned_date,
+            start_date=start_date,
+            remark=remark,
+            **extra_fields,
+        )
+
+        self._reset_closure_state(pipeline)
+
+        # Auto-copy OrderItems to ProductionItems
+        if copy_items:
+            self._create_production_items(production, pipeline.order, user)
+
+        # Auto-update pipeline status based on pipeline_type
+        if auto_update_status:
+            self._auto_transition_pipeline_for_production(pipeline, user)
+
+        return production
+
+    def _validate_production_order(self, pipeline, force=False):
         from ..models.pipeline import PipelineType
 
         # Validate pipeline type
@@ -289,14 +330,22 @@ class PipelineModelManager(BaseModelManager):
             )
 
         # Idempotency check
-        if (
-            not force
-            and pipeline.production_orders.filter(deleted__isnull=True).exists()
-        ):
+        if not force and self._closure_total(pipeline, "production"):
             raise ValidationError("ProductionOrder already exists for this pipeline")
 
-        # Create ProductionOrder
-        production = ProductionOrder.objects.create_with_user(
+    def _new_production_order(
+        self,
+        pipeline,
+        *,
+        user=None,
+        planned_date=None,
+        start_date=None,
+        remark=None,
+        **extra_fields,
+    ):
+        from sea_saw_production.models import ProductionOrder
+
+        return ProductionOrder.objects.create_with_user(
             user=user,
             pipeline=pipeline,
             related_order=pipeline.order,  # For backward compatibility
@@ -306,29 +355,27 @@ class PipelineModelManager(BaseModelManager):
             **extra_fields,
         )
 
-        # Auto-copy OrderItems to ProductionItems
-        if copy_items:
-            self._create_production_items(production, pipeline.order, user)
-
-        # Auto-update pipeline status based on pipeline_type
-        if auto_update_status:
-            self._auto_transition_pipeline_for_production(pipeline, user)
+    def _production_transition_target(self, pipeline):
+        """Status the pipeline moves to once production starts (None: stay)."""
+        from ..models.pipeline import PipelineType, PipelineStatusType
 
-        return production
+        # Determine target status based on pipeline type
+        if pipeline.status != PipelineStatusType.ORDER_CONFIRMED:
+            return None
+        if pipeline.pipeline_type == PipelineType.PRODUCTION_FLOW:
+            return PipelineStatusType.IN_PRODUCTION
+        if pipeline.pipeline_type == PipelineType.HYBRID_FLOW:
+            return PipelineStatusType.IN_PURCHASE_AND_PRODUCTION
+        return None
 
     def _auto_transition_pipeline_for_production(self, pipeline, user=None):
         """Auto-transition pipeline status when production order is created."""
-        from ..models.pipeline import PipelineType, PipelineStatusType
-        from ..services.pipeline_state_service import PipelineStateService
+        self._apply_auto_transition(
+            pipeline, self._production_transition_target(pipeline), user
+        )
 
-        # Determine target status based on pipeline type
-        target_status = None
-        if pipeline.pipeline_type == PipelineType.PRODUCTION_FLOW:
-            if pipeline.status == PipelineStatusType.ORDER_CONFIRMED:
-                target_status = PipelineStatusType.IN_PRODUCTION
-        elif pipeline.pipeline_type == PipelineType.HYBRID_FLOW:
-            if pipeline.status == PipelineStatusType.ORDER_CONFIRMED:
-                target_status = PipelineStatusType.IN_PURCHASE_AND_PRODUCTION
+    def _apply_auto_transition(self, pipeline, target_status, user=None):
+        from ..services.pipeline_state_service import PipelineStateService
 
         if target_status:
             PipelineStateService.transition(
@@ -340,8 +387,20 @@ class PipelineModelManager(BaseModelManager):
     def _create_production_items(self, production, order, user=None):
         """Copy OrderItems to ProductionItems"""
         from sea_saw_production.models import ProductionItem
+        from sea_saw_sales.services import FulfillmentLedgerService
 
-        items = [
+        items = self._build_production_items(production, order.order_items.all(), user)
+
+        if items:
+            ProductionItem.objects.bulk_create(items)
+            # bulk_create bypasses the fulfillment ledger signals
+            FulfillmentLedgerService.refresh([item.order_item_id for item in items])
+
+    def _build_production_items(self, production, order_items, user=None):
+        """Unsaved ProductionItems copied from ``order_items``"""
+        from sea_saw_production.models import ProductionItem
+
+        return [
             ProductionItem(
                 production_order=production,
                 order_item=oi,
@@ -360,12 +419,9 @@ class PipelineModelManager(BaseModelManager):
                 owner=user,
                 created_by=user,
             )
-            for oi in order.order_items.all()
+            for oi in order_items
         ]
 
-        if items:
-            ProductionItem.objects.bulk_create(items)
-
     # ========================
     # Create PurchaseOrder
     # ========================
@@ -400,9 +456,35 @@ class PipelineModelManager(BaseModelManager):
         Returns:
             PurchaseOrder instance
         """
-        from sea_saw_procurement.models import PurchaseOrder
+        existing_count = self._validate_purchase_order(pipeline, force)
+        order = pipeline.order
+
+        purchase = self._new_purchase_order(
+            pipeline,
+            # If this will be the only purchase order under the pipeline, reuse order_code
+            use_order_code=existing_count == 0,
+            user=user,
+            supplier=supplier,
+            contact=contact,
+            purchase_date=purchase_date,
+            **extra_fields,
+        )
+
+        self._reset_closure_state(pipeline)
+
+        # Auto-copy OrderItems to PurchaseItems
+        if copy_items:
+            self._create_purchase_items(purchase, order, user)
+
+        # Auto-update pipeline status based on pipeline_type
+        if auto_update_status:
+            self._auto_transition_pipeline_for_purchase(pipeline, user)
+
+        return purchase
+
+    def _validate_purchase_order(self, pipeline, force=False):
+        """Validate a new PurchaseOrder; returns the number of existing ones."""
         from ..models.pipeline import PipelineType
-        from django.utils import timezone
 
         # Validate pipeline type
         if pipeline.pipeline_type == PipelineType.PRODUCTION_FLOW:
@@ -412,17 +494,27 @@ class PipelineModelManager(BaseModelManager):
             )
 
         # Idempotency check
-        if not force and pipeline.purchase_orders.filter(deleted__isnull=True).exists():
+        existing_count = self._closure_total(pipeline, "purchase")
+        if not force and existing_count:
             raise ValidationError("PurchaseOrder already exists for this pipeline")
+        return existing_count
 
-        order = pipeline.order
-
-        # If this will be the only purchase order under the pipeline, reuse order_code
-        existing_count = pipeline.purchase_orders.filter(deleted__isnull=True).count()
-        use_order_code = existing_count == 0
+    def _new_purchase_order(
+        self,
+        pipeline,
+        *,
+        use_order_code,
+        user=None,
+        supplier=None,
+        contact=None,
+        purchase_date=None,
+        **extra_fields,
+    ):
+        from sea_saw_procurement.models import PurchaseOrder
+        from django.utils import timezone
 
-        # Create PurchaseOrder
-        purchase = PurchaseOrder.objects.create_with_user(
+        order = pipeline.order
+        return PurchaseOrder.objects.create_with_user(
             user=user,
             pipeline=pipeline,
             related_order=order,  # For backward compatibility
@@ -444,42 +536,45 @@ class PipelineModelManager(BaseModelManager):
             **extra_fields,
         )
 
-        # Auto-copy OrderItems to PurchaseItems
-        if copy_items:
-            self._create_purchase_items(purchase, order, user)
-
-        # Auto-update pipeline status based on pipeline_type
-        if auto_update_status:
-            self._auto_transition_pipeline_for_purchase(pipeline, user)
-
-        return purchase
-
-    def _auto_transition_pipeline_for_purchase(self, pipeline, user=None):
-        """Auto-transition pipeline status when purchase order is created."""
+    def _purchase_transition_target(self, pipeline):
+        """Status the pipeline moves to once purchasing starts (None: stay)."""
         from ..models.pipeline import PipelineType, PipelineStatusType
-        from ..services.pipeline_state_service import PipelineStateService
 
         # Determine target status based on pipeline type
-        target_status = None
+        if pipeline.status != PipelineStatusType.ORDER_CONFIRMED:
+            return None
         if pipeline.pipeline_type == PipelineType.PURCHASE_FLOW:
-            if pipeline.status == PipelineStatusType.ORDER_CONFIRMED:
-                target_status = PipelineStatusType.IN_PURCHASE
-        elif pipeline.pipeline_type == PipelineType.HYBRID_FLOW:
-            if pipeline.status == PipelineStatusType.ORDER_CONFIRMED:
-                target_status = PipelineStatusType.IN_PURCHASE_AND_PRODUCTION
+            return PipelineStatusType.IN_PURCHASE
+        if pipeline.pipeline_type == PipelineType.HYBRID_FLOW:
+            return PipelineStatusType.IN_PURCHASE_AND_PRODUCTION
+        return None
 
-        if target_status:
-            PipelineStateService.transition(
-                pipeline=pipeline,
-                target_status=target_status,
-                user=user,
-            )
+    def _auto_transition_pipeline_for_purchase(self, pipeline, user=None):
+        """Auto-transition pipeline status when purchase order is created."""
+        self._apply_auto_transition(
+            pipeline, self._purchase_transition_target(pipeline), user
+        )
 
     def _create_purchase_items(self, purchase, order, user=None):
         """Copy OrderItems to PurchaseItems"""
         from sea_saw_procurement.models import PurchaseItem
+        from sea_saw_sales.services import FulfillmentLedgerService
+        from ..services.financial_summary_service import FinancialSummaryService
 
-        items = [
+        items = self._build_purchase_items(purchase, order.order_items.all(), user)
+
+        if items:
+            PurchaseItem.objects.bulk_create(items)
+            # bulk_create bypasses PurchaseItem.save() and post_save signals
+            purchase.update_total_amount()
+            FinancialSummaryService.refresh(purchase.pipeline_id)
+            FulfillmentLedgerService.refresh([item.order_item_id for item in items])
+
+    def _build_purchase_items(self, purchase, order_items, user=None):
+        """Unsaved PurchaseItems copied from ``order_items``"""
+        from sea_saw_procurement.models import PurchaseItem
+
+        return [
             PurchaseItem(
                 purchase_order=purchase,
                 order_item=oi,
@@ -502,12 +597,9 @@ class PipelineModelManager(BaseModelManager):
                 owner=user,
                 created_by=user,
             )
-            for oi in order.order_items.all()
+            for oi in order_items
         ]
 
-        if items:
-            PurchaseItem.objects.bulk_create(items)
-
     # ========================
     # Create OutboundOrder
     # ========================
@@ -548,34 +640,80 @@ class PipelineModelManager(BaseModelManager):
         Returns:
             OutboundOrder instance
         """
-        from sea_saw_warehouse.models import OutboundOrder
+        self._validate_outbound_order(pipeline, force)
+        order = pipeline.order
 
-        # Validate prerequisites (production or purchase must exist)
-        production_orders = pipeline.production_orders.filter(deleted__isnull=True)
-        purchase_orders = pipeline.purchase_orders.filter(deleted__isnull=True)
+        outbound = self._new_outbound_order(
+            pipeline,
+            user=user,
+            outbound_date=outbound_date,
+            container_no=container_no,
+            seal_no=seal_no,
+            destination_port=destination_port,
+            logistics_provider=logistics_provider,
+            remark=remark,
+            **extra_fields,
+        )
+
+        self._reset_closure_state(pipeline)
+
+        # Auto-copy OrderItems to OutboundItems
+        if copy_items:
+            self._create_outbound_items(outbound, order, user)
+
+        # Auto-update pipeline status based on pipeline_type
+        if auto_update_status:
+            self._auto_transition_pipeline_for_outbound(pipeline, user)
+
+        return outbound
 
+    def _validate_outbound_order(self, pipeline, force=False, creating=()):
+        """
+        Validate a new OutboundOrder.
+
+        ``creating``: sub-entity types created in the same batch, which satisfy
+        the production / purchase prerequisite.
+        """
+        # Validate prerequisites (production or purchase must exist)
         if not force:
             from ..models.pipeline import PipelineType
 
             if pipeline.pipeline_type == PipelineType.PRODUCTION_FLOW:
-                if not production_orders.exists():
+                if "production" not in creating and not self._closure_total(
+                    pipeline, "production"
+                ):
                     raise ValidationError(
                         "Must create ProductionOrder before OutboundOrder in PRODUCTION_FLOW"
                     )
             elif pipeline.pipeline_type == PipelineType.PURCHASE_FLOW:
-                if not purchase_orders.exists():
+                if "purchase" not in creating and not self._closure_total(
+                    pipeline, "purchase"
+                ):
                     raise ValidationError(
                         "Must create PurchaseOrder before OutboundOrder in PURCHASE_FLOW"
                     )
 
         # Idempotency check
-        if not force and pipeline.outbound_orders.filter(deleted__isnull=True).exists():
+        if not force and self._closure_total(pipeline, "outbound"):
             raise ValidationError("OutboundOrder already exists for this pipeline")
 
-        order = pipeline.order
+    def _new_outbound_order(
+        self,
+        pipeline,
+        *,
+        user=None,
+        outbound_date=None,
+        container_no=None,
+        seal_no=None,
+        destination_port=None,
+        logistics_provider=None,
+        remark=None,
+        **extra_fields,
+    ):
+        from sea_saw_warehouse.models import OutboundOrder
 
-        # Create OutboundOrder
-        outbound = OutboundOrder.objects.create_with_user(
+        order = pipeline.order
+        return OutboundOrder.objects.create_with_user(
             user=user,
             pipeline=pipeline,
             outbound_date=outbound_date,
@@ -587,43 +725,43 @@ class PipelineModelManager(BaseModelManager):
             **extra_fields,
         )
 
-        # Auto-copy OrderItems to OutboundItems
-        if copy_items:
-            self._create_outbound_items(outbound, order, user)
-
-        # Auto-update pipeline status based on pipeline_type
-        if auto_update_status:
-            self._auto_transition_pipeline_for_outbound(pipeline, user)
-
-        return outbound
-
-    def _auto_transition_pipeline_for_outbound(self, pipeline, user=None):
-        """Auto-transition pipeline status when outbound order is created."""
+    def _outbound_transition_target(self, pipeline):
+        """Status the pipeline moves to once outbound starts (None: stay)."""
         from ..models.pipeline import PipelineStatusType
-        from ..services.pipeline_state_service import PipelineStateService
 
         # Outbound can be created from production_completed, purchase_completed,
         # or purchase_and_production_completed states
-        target_status = None
         if pipeline.status in (
             PipelineStatusType.PRODUCTION_COMPLETED,
             PipelineStatusType.PURCHASE_COMPLETED,
             PipelineStatusType.PURCHASE_AND_PRODUCTION_COMPLETED,
         ):
-            target_status = PipelineStatusType.IN_OUTBOUND
+            return PipelineStatusType.IN_OUTBOUND
+        return None
 
-        if target_status:
-            PipelineStateService.transition(
-                pipeline=pipeline,
-                target_status=target_status,
-                user=user,
-            )
+    def _auto_transition_pipeline_for_outbound(self, pipeline, user=None):
+        """Auto-transition pipeline status when outbound order is created."""
+        self._apply_auto_transition(
+            pipeline, self._outbound_transition_target(pipeline), user
+        )
 
     def _create_outbound_items(self, outbound, order, user=None):
         """Copy OrderItems to OutboundItems"""
         from sea_saw_warehouse.models import OutboundItem
+        from sea_saw_sales.services import FulfillmentLedgerService
 
-        items = [
+        items = self._build_outbound_items(outbound, order.order_items.all(), user)
+
+        if items:
+            OutboundItem.objects.bulk_create(items)
+            # bulk_create bypasses the fulfillment ledger signals
+            FulfillmentLedgerService.refresh([item.order_item_id for item in items])
+
+    def _build_outbound_items(self, outbound, order_items, user=None):
+        """Unsaved OutboundItems copied from ``order_items``"""
+        from sea_saw_warehouse.models import OutboundItem
+
+        return [
             OutboundItem(
                 outbound_order=outbound,
                 order_item=oi,
@@ -642,8 +780,143 @@ class PipelineModelManager(BaseModelManager):
                 owner=user,
                 created_by=user,
             )
-            for oi in order.order_items.all()
+            for oi in order_items
         ]
 
-        if items:
-            OutboundItem.objects.bulk_create(items)
+    # ========================
+    # Create several sub-entities at once
+    # ========================
+    SUB_ENTITY_TYPES = ("production", "purchase", "outbound")
+
+    @transaction.atomic
+    def create_sub_entities(
+        self,
+        *,
+        pipeline,
+        sub_entities,
+        user=None,
+        copy_items=True,
+        force=False,
+        auto_update_status=False,
+    ):
+        """
+        Create production / purchase / outbound orders of the pipeline in one go
+
+        Compared with calling create_<type>_order() once per type, order items
+        are loaded once, the items of every sub-order are bulk-created, totals /
+        financial summary / fulfillment ledger are recomputed once, and at most
+        one status transition is applied.
+
+        Args:
+            pipeline: The parent Pipeline instance
+            sub_entities: {order_type: fields} with order_type in SUB_ENTITY_TYPES;
+                fields are the keyword arguments of the matching
+                create_<type>_order() (e.g. {"production": {"planned_date": ...}})
+            user: User creating the sub-entities
+            copy_items: Whether to copy OrderItems to the sub-entity items
+            force: Skip prerequisite / idempotency checks
+            auto_update_status: Whether to auto-transition pipeline status
+
+        Returns:
+            dict: order_type → created instance
+
+        Raises:
+            ValidationError: Unknown type, or a check failed (nothing is created)
+        """
+        from sea_saw_base.utils import DeferredRecompute
+
+        existing_purchases, target_status = self._prepare_sub_entities(
+            pipeline, sub_entities, force
+        )
+        order_items = list(pipeline.order.order_items.all()) if copy_items else []
+        created = {}
+
+        with DeferredRecompute.scope():
+            if "production" in sub_entities:
+                created["production"] = self._new_production_order(
+                    pipeline, user=user, **sub_entities["production"]
+                )
+            if "purchase" in sub_entities:
+                created["purchase"] = self._new_purchase_order(
+                    pipeline,
+                    use_order_code=existing_purchases == 0,
+                    user=user,
+                    **sub_entities["purchase"],
+                )
+            if "outbound" in sub_entities:
+                created["outbound"] = self._new_outbound_order(
+                    pipeline, user=user, **sub_entities["outbound"]
+                )
+            self._reset_closure_state(pipeline)
+
+            if order_items:
+                self._copy_sub_entity_items(pipeline, created, order_items, user)
+
+        if auto_update_status:
+            self._apply_auto_transition(pipeline, target_status, user)
+
+        return created
+
+    def _prepare_sub_entities(self, pipeline, sub_entities, force):
+        """
+        Validate a create_sub_entities() request before anything is written.
+
+        Returns:
+            tuple: (existing purchase order count or None, transition target or None)
+
+        Raises:
+            ValidationError: Unknown type, or a check failed
+        """
+        unknown = set(sub_entities) - set(self.SUB_ENTITY_TYPES)
+        if unknown:
+            raise ValidationError(
+                f"Unknown sub-entity types: {', '.join(sorted(unknown))}"
+            )
+        if not sub_entities:
+            raise ValidationError("No sub-entities requested")
+
+        existing_purchases = None
+        if "production" in sub_entities:
+            self._validate_production_order(pipeline, force)
+        if "purchase" in sub_entities:
+            existing_purchases = self._validate_purchase_order(pipeline, force)
+        if "outbound" in sub_entities:
+            self._validate_outbound_order(pipeline, force, creating=sub_entities)
+
+        # Transition targets are decided on the status before creation
+        targets = {
+            "production": self._production_transition_target,
+            "purchase": self._purchase_transition_target,
+            "outbound": self._outbound_transition_target,
+        }
+        for order_type in self.SUB_ENTITY_TYPES:
+            if order_type in sub_entities:
+                return existing_purchases, targets[order_type](pipeline)
+        return existing_purchases, None
+
+    def _copy_sub_entity_items(self, pipeline, created, order_items, user):
+        """Bulk-create the items of the ``created`` sub-entities from ``order_items``."""
+        from sea_saw_base.utils import DeferredRecompute
+        from sea_saw_procurement.models import PurchaseItem, PurchaseOrder
+        from sea_saw_production.models import ProductionItem
+        from sea_saw_sales.services import FulfillmentLedgerService
+        from sea_saw_warehouse.models import OutboundItem
+        from ..services.financial_summary_service import FinancialSummaryService
+
+        builders = {
+            "production": (ProductionItem, self._build_production_items),
+            "purchase": (PurchaseItem, self._build_purchase_items),
+            "outbound": (OutboundItem, self._build_outbound_items),
+        }
+        for order_type, instance in created.items():
+            item_model, build = builders[order_type]
+            item_model.objects.bulk_create(build(instance, order_items, user))
+
+        # bulk_create bypasses item save() / signals: recompute once at scope exit
+        if "purchase" in created:
+            DeferredRecompute.mark_dirty(
+                PurchaseOrder.TOTAL_AMOUNT_RECOMPUTE, created["purchase"].pk
+            )
+            FinancialSummaryService.schedule_refresh(pipeline.pk)
+        for order_item in order_items:
+            FulfillmentLedgerService.schedule_refresh(order_item.pk)
@@ -0,0 +1,29 @@
+# Generated by Django 5.1.2 on 2026-10-17 00:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sea_saw_pipeline', '0002_pipeline_stage_timestamps'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PipelineFinancialSummary',
+            fields=[
+                ('pipeline', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='financial_summary', serialize=False, to='sea_saw_pipeline.pipeline', verbose_name='Pipeline')),
+                ('order_total_amount', models.DecimalField(blank=True, decimal_places=2, help_text="SUM of order item total_price of the pipeline's order", max_digits=20, null=True, verbose_name='Order Total Amount')),
+                ('purchase_order_total_amount', models.DecimalField(blank=True, decimal_places=2, help_text='SUM of purchase item total_price over active purchase orders', max_digits=20, null=True, verbose_name='Purchase Order Total Amount')),
+                ('received_order_total_amount', models.DecimalField(blank=True, decimal_places=5, help_text='SUM of active payments with type=order_payment', max_digits=20, null=True, verbose_name='Received Order Total Amount')),
+                ('paid_purchase_order_total_amount', models.DecimalField(blank=True, decimal_places=5, help_text='SUM of active payments with type=purchase_payment', max_digits=20, null=True, verbose_name='Paid Purchase Order Total Amount')),
+                ('refreshed_at', models.DateTimeField(auto_now=True, verbose_name='Refreshed At')),
+            ],
+            options={
+                'verbose_name': 'Pipeline Financial Summary',
+                'verbose_name_plural': 'Pipeline Financial Summaries',
+            },
+        ),
+    ]
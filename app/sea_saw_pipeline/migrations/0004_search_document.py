@@ -0,0 +1,26 @@
+# Generated by Django 5.1.2 on 2026-10-17 01:25
+
+from django.db import migrations, models
+
+from sea_saw_base.models.search_document import search_document_operations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sea_saw_pipeline', '0003_pipelinefinancialsummary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pipeline',
+            name='search_document',
+            field=models.TextField(blank=True, default='', editable=False, help_text='Lower-cased search text maintained on save.', verbose_name='Search Document'),
+        ),
+        *search_document_operations(
+            "sea_saw_pipeline",
+            "pipeline",
+            ("pipeline_code", "remark", "order.order_code", "contact.name"),
+            "pipeline_search_trgm",
+        ),
+    ]
@@ -2,6 +2,18 @@
 Sea-Saw Pipeline Models
 """
 
-from .pipeline import Pipeline, PipelineStatusType, PipelineType, ActiveEntityType
+from .pipeline import (
+    Pipeline,
+    PipelineFinancialSummary,
+    PipelineStatusType,
+    PipelineType,
+    ActiveEntityType,
+)
 
-__all__ = ["Pipeline", "PipelineStatusType", "PipelineType", "ActiveEntityType"]
+__all__ = [
+    "Pipeline",
+    "PipelineFinancialSummary",
+    "PipelineStatusType",
+    "PipelineType",
+    "ActiveEntityType",
+]
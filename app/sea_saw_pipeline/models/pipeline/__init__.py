@@ -3,6 +3,13 @@ Pipeline models - Business process orchestration
 """
 
 from .pipeline import Pipeline
+from .financial_summary import PipelineFinancialSummary
 from .enums import PipelineStatusType, PipelineType, ActiveEntityType
 
-__all__ = ["Pipeline", "PipelineStatusType", "PipelineType", "ActiveEntityType"]
+__all__ = [
+    "Pipeline",
+    "PipelineFinancialSummary",
+    "PipelineStatusType",
+    "PipelineType",
+    "ActiveEntityType",
+]
@@ -0,0 +1,81 @@
+"""
+PipelineFinancialSummary - 每个 Pipeline 的财务汇总物化表
+
+由 FinancialSummaryService 在 OrderItem / PurchaseOrder / PurchaseItem / Payment
+变更时于同一事务内刷新, Admin/Sales 序列化器直接读取, 避免逐行 aggregate。
+"""
+
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class PipelineFinancialSummary(models.Model):
+    """
+    Materialized financial rollup for a single Pipeline.
+
+    All amount fields are nullable so that "no data" (e.g. no purchase orders
+    yet) stays distinguishable from a zero total, matching the semantics of
+    the previous per-row aggregates.
+    """
+
+    pipeline = models.OneToOneField(
+        "sea_saw_pipeline.Pipeline",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="financial_summary",
+        verbose_name=_("Pipeline"),
+    )
+
+    order_total_amount = models.DecimalField(
+        max_digits=20,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        verbose_name=_("Order Total Amount"),
+        help_text=_("SUM of order item total_price of the pipeline's order"),
+    )
+
+    purchase_order_total_amount = models.DecimalField(
+        max_digits=20,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        verbose_name=_("Purchase Order Total Amount"),
+        help_text=_("SUM of purchase item total_price over active purchase orders"),
+    )
+
+    received_order_total_amount = models.DecimalField(
+        max_digits=20,
+        decimal_places=5,
+        null=True,
+        blank=True,
+        verbose_name=_("Received Order Total Amount"),
+        help_text=_("SUM of active payments with type=order_payment"),
+    )
+
+    paid_purchase_order_total_amount = models.DecimalField(
+        max_digits=20,
+        decimal_places=5,
+        null=True,
+        blank=True,
+        verbose_name=_("Paid Purchase Order Total Amount"),
+        help_text=_("SUM of active payments with type=purchase_payment"),
+    )
+
+    refreshed_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name=_("Refreshed At"),
+    )
+
+    class Meta:
+        verbose_name = _("Pipeline Financial Summary")
+        verbose_name_plural = _("Pipeline Financial Summaries")
+
+    def __str__(self):
+        return f"FinancialSummary(pipeline={self.pipeline_id})"
+
+    @property
+    def purchase_margin(self):
+        if self.order_total_amount is None or self.purchase_order_total_amount is None:
+            return None
+        return self.order_total_amount - self.purchase_order_total_amount
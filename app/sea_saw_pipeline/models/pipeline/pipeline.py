@@ -15,17 +15,21 @@ Pipeline负责:
 """
 
 from django.db import models
-from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from decimal import Decimal
 from django.db.models import Sum
 
-from sea_saw_base.models import BaseModel
+from sea_saw_base.models import (
+    BaseModel,
+    SearchDocumentMixin,
+    SequentialCodeMixin,
+    search_document_field,
+)
 from .enums import PipelineStatusType, PipelineType, ActiveEntityType
 from ...manager.pipeline_model_manager import PipelineModelManager
 
 
-class Pipeline(BaseModel):
+class Pipeline(SearchDocumentMixin, SequentialCodeMixin, BaseModel):
     """
     Pipeline - Business Process Orchestration Model
 
@@ -38,6 +42,18 @@ class Pipeline(BaseModel):
 
     objects = PipelineModelManager()
 
+    # SequentialCodeMixin: PL{year}-{000001}
+    code_prefix = "PL"
+    code_field = "pipeline_code"
+
+    # SearchDocumentMixin: text matched by SearchDocumentFilter
+    search_document_sources = (
+        "pipeline_code",
+        "remark",
+        "order.order_code",
+        "contact.name",
+    )
+
     pipeline_code = models.CharField(
         max_length=100,
         unique=True,
@@ -204,6 +220,8 @@ class Pipeline(BaseModel):
         help_text=_("Additional notes for this pipeline"),
     )
 
+    search_document = search_document_field()
+
     class Meta:
         verbose_name = _("Pipeline")
         verbose_name_plural = _("Pipelines")
@@ -238,12 +256,6 @@ class Pipeline(BaseModel):
 
         super().save(*args, **kwargs)
 
-    def generate_code(self):
-        """Auto-generate pipeline code"""
-        year = timezone.now().year
-        count = Pipeline.objects.filter(created_at__year=year).count() + 1
-        return f"PL{year}-{count:06d}"
-
     # State Transition Methods
     def transition(self, target_status: str, user=None):
         """
@@ -264,6 +276,18 @@ class Pipeline(BaseModel):
             user=user,
         )
 
+    # Financial Summary
+    def refresh_financial_summary(self):
+        """
+        Recompute the materialized financial summary of this pipeline
+
+        Returns:
+            PipelineFinancialSummary: Refreshed summary
+        """
+        from ...services.financial_summary_service import FinancialSummaryService
+
+        return FinancialSummaryService.refresh(self.pk)
+
     # Sub-Entity Creation Methods
     def create_order(self, user=None, **kwargs):
         """
@@ -309,3 +333,26 @@ class Pipeline(BaseModel):
         return Pipeline.objects.create_outbound_order(
             pipeline=self, user=user, **kwargs
         )
+
+    def create_sub_entities(self, sub_entities, user=None, **kwargs):
+        """
+        Create several sub-entities (production / purchase / outbound) at once
+
+        Returns:
+            dict: order_type → created order
+        """
+        return Pipeline.objects.create_sub_entities(
+            pipeline=self, sub_entities=sub_entities, user=user, **kwargs
+        )
+
+    def clone(self, user=None, **kwargs):
+        """
+        Duplicate this pipeline with its order, items, purchase orders and
+        attachment rows (repeat orders)
+
+        Returns:
+            Pipeline: The new pipeline (status DRAFT, fresh codes)
+        """
+        from ...services.pipeline_clone_service import PipelineCloneService
+
+        return PipelineCloneService.clone(self, user=user, **kwargs)
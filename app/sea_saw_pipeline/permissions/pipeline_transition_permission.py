@@ -12,8 +12,8 @@ class CanTransitionPipeline(BasePermission):
     message = "You do not have permission to transition to this status."
 
     def has_permission(self, request, view):
-        # 只拦 transition 这个 action
-        if view.action != "transition":
+        # 只拦 transition / bulk_transition 这两个 action
+        if view.action not in ("transition", "bulk_transition"):
             return True
 
         role = getattr(request.user.role, "role_type", None)
@@ -1,6 +1,5 @@
 from rest_framework import serializers
 from django.utils.translation import gettext_lazy as _
-from django.db.models import Sum
 
 
 FINANCIAL_SUMMARY_FIELDS = [
@@ -16,9 +15,12 @@ class FinancialSummaryMixin(serializers.Serializer):
     """
     Adds five read-only computed financial fields to Admin and Sales serializers.
 
+    Values are read from the materialized PipelineFinancialSummary
+    (see FinancialSummaryService), so no aggregate query is issued per row.
+
     Fields:
-    - order_total_amount              : Order.total_amount (stored)
-    - purchase_order_total_amount     : SUM of all PurchaseOrder.total_amount
+    - order_total_amount              : SUM of OrderItem.total_price
+    - purchase_order_total_amount     : SUM of all PurchaseOrder items' total_price
     - purchase_margin                 : order_total_amount - purchase_order_total_amount
     - received_order_total_amount     : SUM of payments with type=order_payment
     - paid_purchase_order_total_amount: SUM of payments with type=purchase_payment
@@ -29,6 +31,9 @@ class FinancialSummaryMixin(serializers.Serializer):
     inheritance.
     """
 
+    # PrefetchPlan hint: summary is read by every method field below
+    select_related_hints = ["financial_summary"]
+
     order_total_amount = serializers.SerializerMethodField(
         read_only=True,
         label=_("Order Total Amount"),
@@ -50,31 +55,39 @@ class FinancialSummaryMixin(serializers.Serializer):
         label=_("Paid Purchase Order Total Amount"),
     )
 
-    def get_order_total_amount(self, obj):
+    def _get_financial_summary(self, obj):
+        """
+        Read the materialized PipelineFinancialSummary (select_related by the
+        view). Falls back to an in-memory computation, cached on the instance,
+        for pipelines whose summary has not been built yet.
+        """
+        from ...models import PipelineFinancialSummary
+        from ...services.financial_summary_service import FinancialSummaryService
+
         try:
-            return obj.order.total_amount if obj.order_id else None
-        except Exception:
-            return None
+            return obj.financial_summary
+        except PipelineFinancialSummary.DoesNotExist:
+            pass
+
+        summary = getattr(obj, "_computed_financial_summary", None)
+        if summary is None:
+            summary = PipelineFinancialSummary(
+                pipeline=obj, **FinancialSummaryService.compute(obj.pk)
+            )
+            obj._computed_financial_summary = summary
+        return summary
+
+    def get_order_total_amount(self, obj):
+        return self._get_financial_summary(obj).order_total_amount
 
     def get_purchase_order_total_amount(self, obj):
-        result = obj.purchase_orders.aggregate(total=Sum("total_amount"))
-        return result["total"]
+        return self._get_financial_summary(obj).purchase_order_total_amount
 
     def get_purchase_margin(self, obj):
-        order_amount = self.get_order_total_amount(obj)
-        purchase_amount = self.get_purchase_order_total_amount(obj)
-        if order_amount is None or purchase_amount is None:
-            return None
-        return order_amount - purchase_amount
+        return self._get_financial_summary(obj).purchase_margin
 
     def get_received_order_total_amount(self, obj):
-        result = obj.payments.filter(payment_type="order_payment").aggregate(
-            total=Sum("amount")
-        )
-        return result["total"]
+        return self._get_financial_summary(obj).received_order_total_amount
 
     def get_paid_purchase_order_total_amount(self, obj):
-        result = obj.payments.filter(payment_type="purchase_payment").aggregate(
-            total=Sum("amount")
-        )
-        return result["total"]
+        return self._get_financial_summary(obj).paid_purchase_order_total_amount
@@ -131,8 +131,12 @@ class BasePipelineSerializer(BaseSerializer):
         request = self.context.get("request")
         if not request:
             return []
-        # Use PipelineStateService for state management
-        return PipelineStateService.get_allowed_actions(obj, request.user)
+        # Resolve the role once per serializer (list serializers share the child)
+        if not hasattr(self, "_request_role"):
+            self._request_role = PipelineStateService._get_user_role(request.user)
+        return PipelineStateService.get_allowed_actions(
+            obj, request.user, role=self._request_role
+        )
 
 
 from .financial_summary_mixin import FinancialSummaryMixin, FINANCIAL_SUMMARY_FIELDS
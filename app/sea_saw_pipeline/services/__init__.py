@@ -4,6 +4,16 @@ Pipeline Services
 
 from .pipeline_service import PipelineService
 from .pipeline_state_service import PipelineStateService
+from .closure_state_service import ClosureStateService
 from .status_sync_service import StatusSyncService
+from .financial_summary_service import FinancialSummaryService
+from .pipeline_clone_service import PipelineCloneService
 
-__all__ = ["PipelineService", "PipelineStateService", "StatusSyncService"]
+__all__ = [
+    "PipelineService",
+    "PipelineStateService",
+    "ClosureStateService",
+    "StatusSyncService",
+    "FinancialSummaryService",
+    "PipelineCloneService",
+]
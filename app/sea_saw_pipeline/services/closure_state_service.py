@@ -0,0 +1,141 @@
+"""
+Closure State Service - open / closed / total sub-entity counts per pipeline
+
+状态流转校验 (_require_all_closed)、回滚清理、get_allowed_actions 以及
+PipelineModelManager 的幂等检查都需要知道 Pipeline 下各类子实体
+(production / purchase / outbound) 是否存在、是否全部关闭。原实现每处各自
+exists(), 一次流转要多次查询。
+
+这里把三类子实体的 total / open 计数作为子查询注解一次算出:
+- annotate(queryset): 列表 / 详情 / 流转视图直接在主查询中带出
+- get(pipeline): 读取注解或缓存, 都没有时一次查询补齐并缓存在实例上
+- load_many(pipelines): 批量流转时一次查询补齐所有 pipeline
+子实体被创建或删除后调用 reset(pipeline) 丢弃缓存。
+"""
+
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from ..constants import SubEntityStatus
+
+# Per-instance cache: {order_type: (total, open)}
+CACHE_ATTR = "_closure_state"
+
+
+class ClosureStateService:
+    """Counts of non-deleted production / purchase / outbound orders per pipeline."""
+
+    TYPE_TO_RELATION = {
+        "production": "production_orders",
+        "purchase": "purchase_orders",
+        "outbound": "outbound_orders",
+    }
+
+    CLOSED_STATUSES = {SubEntityStatus.COMPLETED, SubEntityStatus.CANCELLED}
+
+    @staticmethod
+    def _annotation(order_type, kind):
+        return f"closure_{order_type}_{kind}"
+
+    @classmethod
+    def _count_subquery(cls, order_type, open_only):
+        from ..models import Pipeline
+
+        relation_name = cls.TYPE_TO_RELATION[order_type]
+        model = Pipeline._meta.get_field(relation_name).related_model
+        queryset = model._base_manager.filter(
+            pipeline_id=OuterRef("pk"), deleted__isnull=True
+        )
+        if open_only:
+            queryset = queryset.exclude(status__in=cls.CLOSED_STATUSES)
+        count = (
+            queryset.order_by()
+            .values("pipeline_id")
+            .annotate(count=Count("pk"))
+            .values("count")[:1]
+        )
+        return Coalesce(Subquery(count, output_field=IntegerField()), Value(0))
+
+    @classmethod
+    def annotate(cls, queryset):
+        """
+        Annotate ``closure_<type>_total`` / ``closure_<type>_open`` on pipelines.
+
+        A queryset already annotated (e.g. by the view) is returned as is.
+        """
+        if cls._annotation("outbound", "open") in queryset.query.annotations:
+            return queryset
+        annotations = {}
+        for order_type in cls.TYPE_TO_RELATION:
+            annotations[cls._annotation(order_type, "total")] = cls._count_subquery(
+                order_type, open_only=False
+            )
+            annotations[cls._annotation(order_type, "open")] = cls._count_subquery(
+                order_type, open_only=True
+            )
+        return queryset.annotate(**annotations)
+
+    @classmethod
+    def _from_values(cls, values):
+        return {
+            order_type: (
+                values[cls._annotation(order_type, "total")],
+                values[cls._annotation(order_type, "open")],
+            )
+            for order_type in cls.TYPE_TO_RELATION
+        }
+
+    @classmethod
+    def is_loaded(cls, pipeline):
+        """Whether get() can answer without a query."""
+        return getattr(pipeline, CACHE_ATTR, None) is not None or hasattr(
+            pipeline, cls._annotation("outbound", "open")
+        )
+
+    @classmethod
+    def get(cls, pipeline):
+        """
+        Closure state of ``pipeline`` (at most one query, then cached).
+
+        Returns:
+            dict: order_type → (total, open)
+        """
+        state = getattr(pipeline, CACHE_ATTR, None)
+        if state is None:
+            if hasattr(pipeline, cls._annotation("outbound", "open")):
+                state = cls._from_values(vars(pipeline))
+            else:
+                state = cls._query([pipeline.pk]).get(pipeline.pk)
+            setattr(pipeline, CACHE_ATTR, state)
+        return state
+
+    @classmethod
+    def load_many(cls, pipelines):
+        """Fill the closure state of every pipeline not loaded yet (one query)."""
+        missing = [pipeline for pipeline in pipelines if not cls.is_loaded(pipeline)]
+        if missing:
+            states = cls._query([pipeline.pk for pipeline in missing])
+            for pipeline in missing:
+                setattr(pipeline, CACHE_ATTR, states[pipeline.pk])
+
+    @classmethod
+    def reset(cls, pipeline):
+        """Drop cached / annotated counts after sub-entities were created or deleted."""
+        setattr(pipeline, CACHE_ATTR, None)
+        for order_type in cls.TYPE_TO_RELATION:
+            for kind in ("total", "open"):
+                pipeline.__dict__.pop(cls._annotation(order_type, kind), None)
+
+    @classmethod
+    def _query(cls, pipeline_ids):
+        from ..models import Pipeline
+
+        rows = cls.annotate(Pipeline._base_manager.filter(pk__in=pipeline_ids)).values(
+            "pk",
+            *(
+                cls._annotation(order_type, kind)
+                for order_type in cls.TYPE_TO_RELATION
+                for kind in ("total", "open")
+            ),
+        )
+        return {row["pk"]: cls._from_values(row) for row in rows}
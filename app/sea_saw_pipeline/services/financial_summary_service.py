@@ -0,0 +1,273 @@
+"""
+Financial Summary Service - Maintains PipelineFinancialSummary rows
+
+Pipeline 财务汇总的唯一写入口:
+- refresh(): 重新计算单个 Pipeline 的汇总并 upsert（在调用方事务内执行）
+- refresh_many(): 多个 Pipeline 按组聚合后一次 bulk upsert (查询数与数量无关)
+- refresh_for_order(): 通过 Order 定位 Pipeline 后刷新
+- schedule_refresh*(): 经 DeferredRecompute 刷新, 作用域内每个 Pipeline 只刷新一次
+- rebuild(): 全量重建（management command 使用）
+
+汇总值直接基于明细行（OrderItem / PurchaseItem / Payment）计算,
+因此不依赖 Order.total_amount / PurchaseOrder.total_amount 的更新时机。
+"""
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+
+from sea_saw_base.utils import DeferredRecompute
+
+from ..models import Pipeline, PipelineFinancialSummary
+
+
+class FinancialSummaryService:
+    """
+    Service class for computing and persisting per-pipeline financial rollups.
+    """
+
+    # DeferredRecompute keys
+    RECOMPUTE_PIPELINE = "pipeline.financial_summary"
+    RECOMPUTE_ORDER = "pipeline.financial_summary.order"
+    RECOMPUTE_PURCHASE_ORDER = "pipeline.financial_summary.purchase_order"
+
+    # ========================
+    # Compute
+    # ========================
+    @staticmethod
+    def _sum_or_none(result):
+        """
+        aggregate 结果 → 金额:
+        - 无父单据 (count == 0) → None
+        - 有父单据但无明细 → Decimal("0")
+        """
+        if not result["n"]:
+            return None
+        return result["total"] or Decimal("0")
+
+    @classmethod
+    def compute(cls, pipeline_id) -> dict:
+        """
+        Compute summary values for a pipeline (3 aggregate queries).
+
+        Returns:
+            dict: field name → amount (None when there is nothing to sum)
+        """
+        return cls.compute_many([pipeline_id])[pipeline_id]
+
+    @classmethod
+    def compute_many(cls, pipeline_ids) -> dict:
+        """
+        Compute summary values for many pipelines (3 grouped aggregate queries).
+
+        Returns:
+            dict: pipeline id → {field name → amount}, as compute()
+        """
+        from sea_saw_sales.models import Order
+        from sea_saw_procurement.models import PurchaseOrder
+        from sea_saw_finance.models import Payment
+        from sea_saw_finance.models.enums import PaymentType
+
+        pipeline_ids = list(pipeline_ids)
+        empty = {"n": 0, "total": None}
+
+        order_results = {
+            row.pop("pipeline_id"): row
+            for row in Order.objects.filter(
+                pipeline__pk__in=pipeline_ids, deleted__isnull=True
+            )
+            .order_by()
+            .values(pipeline_id=F("pipeline__pk"))
+            .annotate(
+                n=Count("pk", distinct=True), total=Sum("order_items__total_price")
+            )
+        }
+
+        purchase_results = {
+            row.pop("pipeline_id"): row
+            for row in PurchaseOrder.objects.filter(
+                pipeline_id__in=pipeline_ids, deleted__isnull=True
+            )
+            .order_by()
+            .values("pipeline_id")
+            .annotate(
+                n=Count("pk", distinct=True), total=Sum("purchase_items__total_price")
+            )
+        }
+
+        payment_results = {
+            row.pop("pipeline_id"): row
+            for row in Payment.objects.filter(
+                pipeline_id__in=pipeline_ids, deleted__isnull=True
+            )
+            .order_by()
+            .values("pipeline_id")
+            .annotate(
+                received=Sum(
+                    "amount", filter=Q(payment_type=PaymentType.ORDER_PAYMENT)
+                ),
+                paid=Sum("amount", filter=Q(payment_type=PaymentType.PURCHASE_PAYMENT)),
+            )
+        }
+
+        summaries = {}
+        for pipeline_id in pipeline_ids:
+            payment_result = payment_results.get(pipeline_id, {})
+            summaries[pipeline_id] = {
+                "order_total_amount": cls._sum_or_none(
+                    order_results.get(pipeline_id, empty)
+                ),
+                "purchase_order_total_amount": cls._sum_or_none(
+                    purchase_results.get(pipeline_id, empty)
+                ),
+                "received_order_total_amount": payment_result.get("received"),
+                "paid_purchase_order_total_amount": payment_result.get("paid"),
+            }
+        return summaries
+
+    # ========================
+    # Persist
+    # ========================
+    @classmethod
+    @transaction.atomic
+    def refresh(cls, pipeline_id):
+        """
+        Recompute and upsert the summary for one pipeline.
+
+        Runs inside the caller's transaction so the summary commits (or rolls
+        back) together with the rows that changed it.
+
+        Returns:
+            PipelineFinancialSummary | None: None if the pipeline no longer exists
+        """
+        if not pipeline_id:
+            return None
+
+        if not Pipeline.all_objects.filter(pk=pipeline_id).exists():
+            return None
+
+        values = cls.compute(pipeline_id)
+        summary, _ = PipelineFinancialSummary.objects.update_or_create(
+            pipeline_id=pipeline_id, defaults=values
+        )
+        return summary
+
+    @classmethod
+    def refresh_many(cls, pipeline_ids):
+        """
+        Recompute and upsert the summaries of many pipelines in one statement.
+
+        Ids of pipelines that no longer exist are ignored.
+
+        Returns:
+            int: Number of summaries written
+        """
+        existing = sorted(
+            Pipeline.all_objects.filter(pk__in=list(pipeline_ids)).values_list(
+                "pk", flat=True
+            )
+        )
+        if not existing:
+            return 0
+
+        summaries = cls.compute_many(existing)
+        rows = [
+            PipelineFinancialSummary(pipeline_id=pipeline_id, **summaries[pipeline_id])
+            for pipeline_id in existing
+        ]
+        PipelineFinancialSummary.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=["pipeline"],
+            update_fields=list(summaries[existing[0]]) + ["refreshed_at"],
+        )
+        return len(rows)
+
+    @classmethod
+    def refresh_for_order(cls, order_id):
+        """Refresh the summary of the pipeline that owns the given Order."""
+        if not order_id:
+            return None
+
+        pipeline_id = (
+            Pipeline.all_objects.filter(order_id=order_id)
+            .values_list("pk", flat=True)
+            .first()
+        )
+        return cls.refresh(pipeline_id)
+
+    # ========================
+    # Deferred refresh
+    # ========================
+    @classmethod
+    def schedule_refresh(cls, pipeline_id):
+        """Refresh now, or once at the end of the active DeferredRecompute scope."""
+        DeferredRecompute.mark_dirty(cls.RECOMPUTE_PIPELINE, pipeline_id)
+
+    @classmethod
+    def schedule_refresh_for_order(cls, order_id):
+        DeferredRecompute.mark_dirty(cls.RECOMPUTE_ORDER, order_id)
+
+    @classmethod
+    def schedule_refresh_for_purchase_order(cls, purchase_order_id):
+        DeferredRecompute.mark_dirty(cls.RECOMPUTE_PURCHASE_ORDER, purchase_order_id)
+
+    @classmethod
+    def _refresh_many(cls, pipeline_ids):
+        cls.refresh_many(pipeline_ids)
+
+    @classmethod
+    def _refresh_for_orders(cls, order_ids):
+        """Resolve the owning pipelines in one query, then refresh each once."""
+        pipeline_ids = Pipeline.all_objects.filter(order_id__in=order_ids).values_list(
+            "pk", flat=True
+        )
+        for pipeline_id in pipeline_ids:
+            cls.schedule_refresh(pipeline_id)
+
+    @classmethod
+    def _refresh_for_purchase_orders(cls, purchase_order_ids):
+        from sea_saw_procurement.models import PurchaseOrder
+
+        pipeline_ids = PurchaseOrder.all_objects.filter(
+            pk__in=purchase_order_ids
+        ).values_list("pipeline_id", flat=True)
+        for pipeline_id in pipeline_ids:
+            cls.schedule_refresh(pipeline_id)
+
+    @classmethod
+    def rebuild(cls, pipeline_ids=None, *, batch_size=500):
+        """
+        Rebuild summaries from scratch.
+
+        Args:
+            pipeline_ids: Optional iterable limiting the rebuild; all pipelines if None
+            batch_size: Number of pipelines refreshed per transaction
+
+        Returns:
+            int: Number of summaries rebuilt
+        """
+        queryset = Pipeline.all_objects.order_by("pk")
+        if pipeline_ids is not None:
+            queryset = queryset.filter(pk__in=list(pipeline_ids))
+
+        ids = list(queryset.values_list("pk", flat=True))
+        for start in range(0, len(ids), batch_size):
+            with transaction.atomic():
+                cls.refresh_many(ids[start : start + batch_size])
+
+        return len(ids)
+
+
+DeferredRecompute.register(
+    FinancialSummaryService.RECOMPUTE_ORDER,
+    FinancialSummaryService._refresh_for_orders,
+)
+DeferredRecompute.register(
+    FinancialSummaryService.RECOMPUTE_PURCHASE_ORDER,
+    FinancialSummaryService._refresh_for_purchase_orders,
+)
+DeferredRecompute.register(
+    FinancialSummaryService.RECOMPUTE_PIPELINE,
+    FinancialSummaryService._refresh_many,
+)
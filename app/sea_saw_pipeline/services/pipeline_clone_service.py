@@ -0,0 +1,284 @@
+"""
+Pipeline Clone Service - Duplicate pipeline trees for repeat orders
+
+客户每月按相同 SKU 返单。逐个调用 create_order(copy_items=True) 需要在 Python
+里逐字段复制 OrderItem, 且无法复制整个 Pipeline。clone_many() 一次复制多个
+Pipeline 的整棵树:
+
+    Pipeline → Order → OrderItem
+             → PurchaseOrder (含 supplier) → PurchaseItem (order_item 指向新明细)
+             → Attachment 元数据 (Order / PurchaseOrder 的附件, 共用原文件)
+
+- 每张表一次 bulk_create, 单据编号通过 reserve_codes() 每个前缀一次性预留
+- bulk_create 不触发 save() / post_save: search_document 在写入前构建,
+  金额 / 财务汇总 / 履约台账通过 DeferredRecompute 在作用域结束时批量重算
+- 状态、单据编号、审计字段和流程时间戳不复制 (回到模型默认值),
+  生产 / 出库单与付款属于执行记录, 不复制
+"""
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from sea_saw_base.utils import ContentTypeRegistry, DeferredRecompute
+
+from ..models import Pipeline
+from .financial_summary_service import FinancialSummaryService
+
+# Fields never copied: identity, audit and soft-delete state
+BASE_EXCLUDE = {
+    "id",
+    "owner",
+    "created_by",
+    "updated_by",
+    "created_at",
+    "updated_at",
+    "deleted",
+    "deleted_by_cascade",
+}
+
+
+class PipelineCloneService:
+    """Set-based duplication of pipelines with their order, purchases and attachments."""
+
+    # Per model: fields reset to the model default (besides BASE_EXCLUDE)
+    PIPELINE_RESET = {
+        "pipeline_code",
+        "status",
+        "active_entity",
+        "confirmed_at",
+        "completed_at",
+        "cancelled_at",
+        "in_purchase_at",
+        "purchase_completed_at",
+        "in_production_at",
+        "production_completed_at",
+        "in_purchase_and_production_at",
+        "purchase_and_production_completed_at",
+        "in_outbound_at",
+        "outbound_completed_at",
+        "search_document",
+    }
+    ORDER_RESET = {"order_code", "status", "etd", "search_document"}
+    PURCHASE_ORDER_RESET = {"purchase_code", "status", "purchase_date", "etd"}
+
+    @staticmethod
+    def _copy(instance, reset=(), **values):
+        """
+        Unsaved copy of ``instance`` with ``values`` applied.
+
+        Fields in BASE_EXCLUDE / ``reset`` fall back to the model default.
+        Related objects already cached on ``instance`` are shared with the
+        copy, so building search documents needs no extra query.
+        """
+        model = type(instance)
+        data = {}
+        for field in model._meta.concrete_fields:
+            if field.name in BASE_EXCLUDE or field.name in reset or field.name in values:
+                continue
+            if field.is_relation and field.is_cached(instance):
+                data[field.name] = getattr(instance, field.name)
+            else:
+                data[field.attname] = getattr(instance, field.attname)
+        data.update(values)
+        return model(**data)
+
+    @classmethod
+    def clone(cls, pipeline, *, user=None, **options):
+        """Clone one pipeline (see clone_many). Returns the new Pipeline."""
+        return cls.clone_many([pipeline], user=user, **options)[pipeline.pk]
+
+    @classmethod
+    @transaction.atomic
+    def clone_many(
+        cls,
+        pipelines,
+        *,
+        user=None,
+        order_date=None,
+        include_purchase_orders=True,
+        include_attachments=True,
+    ):
+        """
+        Clone many pipelines in one transaction.
+
+        Query count depends on the number of tables copied, not on the
+        number of pipelines / items: totals, financial summaries and the
+        fulfillment ledger of all copies are recomputed set-based at scope exit.
+
+        Args:
+            pipelines: Pipeline instances (or queryset) to clone
+            user: Owner / creator of the copies
+            order_date: Order date of the copies (defaults to today)
+            include_purchase_orders: Copy purchase orders and their items
+            include_attachments: Copy attachment rows (the files are shared)
+
+        Returns:
+            dict: source pipeline id → new Pipeline
+        """
+        from sea_saw_sales.models import Order, OrderItem
+
+        pipeline_ids = [pipeline.pk for pipeline in pipelines]
+        if not pipeline_ids:
+            return {}
+
+        sources = list(
+            Pipeline.objects.filter(pk__in=pipeline_ids, deleted__isnull=True)
+            .select_related("contact", "order__contact")
+            .order_by("pk")
+        )
+        order_date = order_date or timezone.now().date()
+        audit = {"owner": user, "created_by": user}
+
+        with DeferredRecompute.scope():
+            # Orders
+            order_codes = iter(Order.reserve_codes(len(sources)))
+            orders = {}
+            for source in sources:
+                order = cls._copy(
+                    source.order,
+                    cls.ORDER_RESET,
+                    order_code=next(order_codes),
+                    order_date=order_date,
+                    **audit,
+                )
+                order.search_document = order.build_search_document()
+                orders[source.order_id] = order
+            Order.objects.bulk_create(orders.values())
+
+            # Pipelines
+            pipeline_codes = iter(Pipeline.reserve_codes(len(sources)))
+            clones = {}
+            for source in sources:
+                clone = cls._copy(
+                    source,
+                    cls.PIPELINE_RESET,
+                    pipeline_code=next(pipeline_codes),
+                    order=orders[source.order_id],
+                    order_date=order_date,
+                    **audit,
+                )
+                clone.search_document = clone.build_search_document()
+                clones[source.pk] = clone
+            Pipeline.objects.bulk_create(clones.values())
+
+            # Order items
+            source_items = list(
+                OrderItem.objects.filter(
+                    order_id__in=orders, deleted__isnull=True
+                ).order_by("pk")
+            )
+            order_items = {
+                item.pk: cls._copy(item, order=orders[item.order_id], **audit)
+                for item in source_items
+            }
+            OrderItem.objects.bulk_create(order_items.values())
+
+            purchase_orders = {}
+            if include_purchase_orders:
+                purchase_orders = cls._clone_purchase_orders(
+                    clones, orders, order_items, audit
+                )
+
+            if include_attachments:
+                cls._clone_attachments(orders, purchase_orders, audit)
+
+            for order in orders.values():
+                DeferredRecompute.mark_dirty(Order.TOTAL_AMOUNT_RECOMPUTE, order.pk)
+            for clone in clones.values():
+                FinancialSummaryService.schedule_refresh(clone.pk)
+
+        return clones
+
+    @classmethod
+    def _clone_purchase_orders(cls, clones, orders, order_items, audit):
+        """
+        Copy live purchase orders / items of the source pipelines.
+
+        Returns:
+            dict: source purchase order id → new PurchaseOrder
+        """
+        from sea_saw_procurement.models import PurchaseItem, PurchaseOrder
+        from sea_saw_sales.services import FulfillmentLedgerService
+
+        sources = list(
+            PurchaseOrder.objects.filter(
+                pipeline_id__in=clones, deleted__isnull=True
+            ).order_by("pk")
+        )
+        if not sources:
+            return {}
+
+        codes = iter(PurchaseOrder.reserve_codes(len(sources)))
+        purchase_orders = {}
+        for source in sources:
+            values = {}
+            # Legacy link: follow the cloned sales order, keep any other order
+            if source.related_order_id in orders:
+                values["related_order"] = orders[source.related_order_id]
+            purchase_orders[source.pk] = cls._copy(
+                source,
+                cls.PURCHASE_ORDER_RESET,
+                purchase_code=next(codes),
+                pipeline=clones[source.pipeline_id],
+                **values,
+                **audit,
+            )
+        PurchaseOrder.objects.bulk_create(purchase_orders.values())
+
+        items = []
+        for item in PurchaseItem.objects.filter(
+            purchase_order_id__in=purchase_orders, deleted__isnull=True
+        ).order_by("pk"):
+            items.append(
+                cls._copy(
+                    item,
+                    purchase_order=purchase_orders[item.purchase_order_id],
+                    # Items linked to a deleted order item stay unlinked
+                    order_item=order_items.get(item.order_item_id),
+                    **audit,
+                )
+            )
+        PurchaseItem.objects.bulk_create(items)
+
+        # bulk_create bypasses PurchaseItem.save() and post_save signals
+        for purchase_order in purchase_orders.values():
+            DeferredRecompute.mark_dirty(
+                PurchaseOrder.TOTAL_AMOUNT_RECOMPUTE, purchase_order.pk
+            )
+        for item in items:
+            if item.order_item_id:
+                FulfillmentLedgerService.schedule_refresh(item.order_item_id)
+        return purchase_orders
+
+    @classmethod
+    def _clone_attachments(cls, orders, purchase_orders, audit):
+        """Copy attachment rows of the source orders / purchase orders (files shared)."""
+        from sea_saw_attachment.models import Attachment
+        from sea_saw_sales.models import Order
+        from sea_saw_procurement.models import PurchaseOrder
+
+        targets = {}
+        condition = Q()
+        for model, copies in ((Order, orders), (PurchaseOrder, purchase_orders)):
+            if not copies:
+                continue
+            content_type = ContentTypeRegistry.get_for_model(model)
+            condition |= Q(content_type=content_type, object_id__in=copies)
+            for source_id, copy in copies.items():
+                targets[content_type.pk, source_id] = copy.pk
+        if not targets:
+            return
+
+        attachments = [
+            cls._copy(
+                attachment,
+                object_id=targets[attachment.content_type_id, attachment.object_id],
+                file=attachment.file.name,
+                **audit,
+            )
+            for attachment in Attachment.objects.filter(
+                condition, deleted__isnull=True
+            ).order_by("pk")
+        ]
+        Attachment.objects.bulk_create(attachments)
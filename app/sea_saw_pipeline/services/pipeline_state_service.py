@@ -2,9 +2,14 @@
 Pipeline State Service - State Machine for Pipeline Status Transitions
 
 Manages valid state transitions and business rules for Pipeline status changes.
+
+transition() handles one pipeline; transition_many() validates a batch with
+one closure-state query (ClosureStateService) and writes every valid pipeline
+with a single bulk_update.
 """
 
 from django.db import transaction
+from django.db.models import Q
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 
@@ -13,8 +18,11 @@ from ..constants import (
     PIPELINE_STATE_MACHINE_BY_TYPE,
     PIPELINE_ROLE_ALLOWED_TARGET_STATES,
     PIPELINE_STATUS_PRIORITY,
-    SubEntityStatus,
+    PIPELINE_TO_ACTIVE_ENTITY,
+    PIPELINE_TRANSITION_TABLE,
+    PIPELINE_TRANSITIONS_BY_ROLE,
 )
+from .closure_state_service import ClosureStateService
 from .status_sync_service import StatusSyncService
 
 # Rollback threshold priorities
@@ -28,13 +36,18 @@ class PipelineStateService:
     Manages status transitions based on pipeline_type and role_type.
     """
 
-    _TYPE_TO_RELATION = {
-        "production": "production_orders",
-        "purchase": "purchase_orders",
-        "outbound": "outbound_orders",
-    }
+    _TYPE_TO_RELATION = ClosureStateService.TYPE_TO_RELATION
 
-    _CLOSED_STATUSES = {SubEntityStatus.COMPLETED, SubEntityStatus.CANCELLED}
+    _CLOSED_STATUSES = ClosureStateService.CLOSED_STATUSES
+
+    # Target status → sub-entity types that must all be closed beforehand
+    _CLOSURE_REQUIREMENTS = {
+        PipelineStatusType.PRODUCTION_COMPLETED: ("production",),
+        PipelineStatusType.PURCHASE_COMPLETED: ("purchase",),
+        PipelineStatusType.OUTBOUND_COMPLETED: ("outbound",),
+        PipelineStatusType.PURCHASE_AND_PRODUCTION_COMPLETED: ("purchase", "production"),
+        PipelineStatusType.COMPLETED: ("outbound",),
+    }
 
     @classmethod
     def _get_status_priority(cls, status: str) -> int:
@@ -60,14 +73,24 @@ class PipelineStateService:
         Returns:
             dict: Deletion counts for each order type
         """
+        closure_state = (
+            ClosureStateService.get(pipeline)
+            if ClosureStateService.is_loaded(pipeline)
+            else None
+        )
         result = {}
         for order_type in order_types:
             relation_name = cls._TYPE_TO_RELATION.get(order_type)
             if relation_name:
+                if closure_state is not None and not closure_state[order_type][0]:
+                    # Known to have no live rows of this type: skip the DELETE
+                    result[f"deleted_{relation_name}"] = 0
+                    continue
                 relation = getattr(pipeline, relation_name)
                 deleted = relation.filter(deleted__isnull=True).delete()
                 result[f"deleted_{relation_name}"] = deleted[0] if deleted else 0
 
+        ClosureStateService.reset(pipeline)
         return result
 
     @classmethod
@@ -100,7 +123,8 @@ class PipelineStateService:
         should not block pipeline advancement.
 
         Checks both existence (at least one must exist) and that every
-        non-deleted sub-entity has a closed status.
+        non-deleted sub-entity has a closed status, from the pipeline's
+        closure state (annotated, or loaded once with one query).
 
         Args:
             pipeline: The pipeline instance
@@ -110,16 +134,20 @@ class PipelineStateService:
         Raises:
             ValidationError: If no orders exist or any order is still open
         """
-        relation_name = cls._TYPE_TO_RELATION.get(order_type)
-        if not relation_name:
+        if order_type not in cls._TYPE_TO_RELATION:
             return
 
-        qs = getattr(pipeline, relation_name).filter(deleted__isnull=True)
-        if not qs.exists():
+        total, open_count = ClosureStateService.get(pipeline)[order_type]
+        cls._check_closed(order_type, target_status, total > 0, open_count > 0)
+
+    @classmethod
+    def _check_closed(cls, order_type: str, target_status: str, has_orders, has_open):
+        """Raise the _require_all_closed errors from precomputed existence flags."""
+        if not has_orders:
             raise ValidationError(
                 {order_type: f"Must create {order_type} order before {target_status}"}
             )
-        if qs.exclude(status__in=cls._CLOSED_STATUSES).exists():
+        if has_open:
             raise ValidationError(
                 {
                     order_type: f"All {order_type} orders must be completed or cancelled before {target_status}"
@@ -144,26 +172,17 @@ class PipelineStateService:
             ValidationError: If validation fails
         """
         if target_status == PipelineStatusType.ORDER_CONFIRMED:
-            if not pipeline.order:
-                raise ValidationError({"order": "Pipeline must have an order"})
-            if not pipeline.account:
-                raise ValidationError({"account": "Pipeline must have an account"})
-
-        elif target_status == PipelineStatusType.PRODUCTION_COMPLETED:
-            cls._require_all_closed(pipeline, "production", target_status)
+            cls._require_order_and_account(pipeline)
 
-        elif target_status == PipelineStatusType.PURCHASE_COMPLETED:
-            cls._require_all_closed(pipeline, "purchase", target_status)
+        for order_type in cls._CLOSURE_REQUIREMENTS.get(target_status, ()):
+            cls._require_all_closed(pipeline, order_type, target_status)
 
-        elif target_status == PipelineStatusType.OUTBOUND_COMPLETED:
-            cls._require_all_closed(pipeline, "outbound", target_status)
-
-        elif target_status == PipelineStatusType.PURCHASE_AND_PRODUCTION_COMPLETED:
-            cls._require_all_closed(pipeline, "purchase", target_status)
-            cls._require_all_closed(pipeline, "production", target_status)
-
-        elif target_status == PipelineStatusType.COMPLETED:
-            cls._require_all_closed(pipeline, "outbound", target_status)
+    @classmethod
+    def _require_order_and_account(cls, pipeline):
+        if not pipeline.order_id:
+            raise ValidationError({"order": "Pipeline must have an order"})
+        if not pipeline.account_id:
+            raise ValidationError({"account": "Pipeline must have an account"})
 
     @classmethod
     def _get_user_role(cls, user) -> str | None:
@@ -321,29 +340,215 @@ class PipelineStateService:
         return pipeline
 
     @classmethod
-    def get_allowed_actions(cls, pipeline, user) -> list[str]:
+    def _cleanup_documents_on_rollback_many(cls, pipeline_ids, target_status: str):
+        """_cleanup_documents_on_rollback for many pipelines, one delete per type."""
+        from ..models import Pipeline
+
+        target_priority = cls._get_status_priority(target_status)
+        if target_priority <= _PRIORITY_BEFORE_PRODUCTION:
+            order_types = ["production", "purchase", "outbound"]
+        elif target_priority <= _PRIORITY_BEFORE_OUTBOUND:
+            order_types = ["outbound"]
+        else:
+            return
+
+        for order_type in order_types:
+            relation_name = cls._TYPE_TO_RELATION[order_type]
+            model = Pipeline._meta.get_field(relation_name).related_model
+            model.objects.filter(
+                pipeline_id__in=pipeline_ids, deleted__isnull=True
+            ).delete()
+
+    @classmethod
+    def _validate_many(cls, pipelines, target_status: str):
+        """
+        Validate every pipeline like transition() does, without writing.
+
+        Returns:
+            tuple: ({pk: failure result}, [valid pipelines])
+        """
+        failures = {}
+        valid = []
+        for pipeline in pipelines:
+            try:
+                state_machine = cls._get_state_machine(pipeline.pipeline_type)
+                cls._validate_state_transition(
+                    state_machine, pipeline.status, target_status, pipeline.pipeline_type
+                )
+                cls._validate_transition(pipeline, target_status)
+            except ValidationError as exc:
+                failures[pipeline.pk] = {
+                    "id": pipeline.pk,
+                    "success": False,
+                    "errors": exc.message_dict,
+                }
+                continue
+            valid.append(pipeline)
+        return failures, valid
+
+    @classmethod
+    def _apply_status_many(cls, pipelines, target_status: str, user=None) -> list[str]:
+        """
+        Set status, timestamps and active_entity on ``pipelines`` in memory.
+
+        Returns:
+            list[str]: The fields to pass to bulk_update
+        """
+        now = timezone.now()
+        update_fields = ["status", "updated_at", "updated_by"]
+        timestamp_field = cls._STATUS_TIMESTAMP_FIELDS.get(target_status)
+        if timestamp_field:
+            update_fields.append(timestamp_field)
+        active_entity = PIPELINE_TO_ACTIVE_ENTITY.get(target_status)
+        if active_entity is not None:  # None means keep existing
+            update_fields.append("active_entity")
+        for pipeline in pipelines:
+            pipeline.status = target_status
+            pipeline.updated_at = now
+            if timestamp_field:
+                setattr(pipeline, timestamp_field, now)
+            if active_entity is not None:
+                pipeline.active_entity = active_entity
+            if user:
+                pipeline.updated_by = user
+        return update_fields
+
+    @classmethod
+    @transaction.atomic
+    def transition_many(cls, *, pipelines, target_status: str, user=None):
+        """
+        Transition many pipelines to target status in one transaction.
+
+        Every pipeline is validated like transition() before anything is
+        written; closure state of pipelines not annotated with it is loaded
+        with one query. Valid pipelines are then written with a single
+        bulk_update, invalid ones are left untouched and reported.
+
+        Args:
+            pipelines: Pipeline instances (or queryset) to transition
+            target_status: Target status
+            user: User performing the transition
+
+        Returns:
+            list[dict]: Per pipeline, in input order:
+                {"id", "success": True, "status"} or {"id", "success": False, "errors"}
+
+        Raises:
+            ValidationError: If the user may not transition to target_status at all
+        """
+        from ..models import Pipeline
+
+        pipelines = list(pipelines)
+        cls._validate_role_permission(None, target_status, user)
+
+        if cls._CLOSURE_REQUIREMENTS.get(target_status):
+            ClosureStateService.load_many(pipelines)
+
+        results, valid = cls._validate_many(pipelines, target_status)
+
+        if valid:
+            backward_ids = [
+                p.pk for p in valid if cls._is_backward_transition(p.status, target_status)
+            ]
+            if backward_ids:
+                cls._cleanup_documents_on_rollback_many(backward_ids, target_status)
+                for pipeline in valid:
+                    ClosureStateService.reset(pipeline)
+
+            resumed_ids = [
+                p.pk
+                for p in valid
+                if p.status == PipelineStatusType.ISSUE_REPORTED
+                and target_status
+                not in (PipelineStatusType.DRAFT, PipelineStatusType.CANCELLED)
+            ]
+
+            update_fields = cls._apply_status_many(valid, target_status, user)
+            Pipeline._base_manager.bulk_update(valid, update_fields)
+
+            if resumed_ids:
+                StatusSyncService.restore_issue_entities_many(resumed_ids, target_status)
+            StatusSyncService.sync_many_to_subentities(valid, target_status, user)
+
+            for pipeline in valid:
+                results[pipeline.pk] = {
+                    "id": pipeline.pk,
+                    "success": True,
+                    "status": target_status,
+                }
+
+        return [results[pipeline.pk] for pipeline in pipelines]
+
+    @classmethod
+    def get_allowed_actions(cls, pipeline, user, role=None) -> list[str]:
         """
         Get allowed target statuses for user on this pipeline.
 
         Args:
             pipeline: The pipeline instance
             user: Current user
+            role: Role type already resolved by the caller (list serializers
+                resolve it once per request)
+
+        Targets whose prerequisites are not met (e.g. open outbound orders
+        before OUTBOUND_COMPLETED) are left out. Their closure state comes from
+        the annotated queryset (see PipelineViewSet.closure_state_actions) or
+        is loaded with one query for a pipeline without it.
 
         Returns:
             Sorted list of allowed target statuses
         """
-        role = cls._get_user_role(user)
+        role = role or cls._get_user_role(user)
         if not role:
             return []
 
-        state_machine = PIPELINE_STATE_MACHINE_BY_TYPE.get(pipeline.pipeline_type, {})
-        state_targets = state_machine.get(pipeline.status, set())
+        # State machine ∩ role permissions, precomputed at import
+        targets = PIPELINE_TRANSITION_TABLE.get(
+            (pipeline.pipeline_type, pipeline.status, role), frozenset()
+        )
+        return sorted(
+            target for target in targets if cls._prerequisites_met(pipeline, target)
+        )
 
-        role_targets = PIPELINE_ROLE_ALLOWED_TARGET_STATES.get(role, set())
+    @classmethod
+    def actionable_condition(cls, user) -> Q:
+        """
+        WHERE condition of pipelines on which ``user`` has at least one allowed action.
 
-        # Admin has all permissions
-        if "*" in role_targets:
-            return sorted(state_targets)
+        Matches get_allowed_actions(): besides the state machine and role
+        permissions, targets with prerequisites only count when these hold.
+        Closure prerequisites read the ClosureStateService.annotate() counts,
+        so the filtered queryset must carry them.
+        """
+        transitions = PIPELINE_TRANSITIONS_BY_ROLE.get(cls._get_user_role(user), {})
+        condition = Q(pk__in=[])
+        for (pipeline_type, status), targets in sorted(transitions.items()):
+            prerequisites = [cls._prerequisite_condition(target) for target in targets]
+            if any(not prerequisite for prerequisite in prerequisites):
+                condition |= Q(pipeline_type=pipeline_type, status=status)
+                continue
+            met = Q(pk__in=[])
+            for prerequisite in prerequisites:
+                met |= prerequisite
+            condition |= Q(pipeline_type=pipeline_type, status=status) & met
+        return condition
 
-        # Return intersection of state machine and role permissions
-        return sorted(state_targets & role_targets)
+    @classmethod
+    def _prerequisite_condition(cls, target_status: str) -> Q:
+        """_validate_transition() as a WHERE condition (empty Q: no prerequisite)."""
+        condition = Q()
+        if target_status == PipelineStatusType.ORDER_CONFIRMED:
+            condition &= Q(order__isnull=False, account__isnull=False)
+        for order_type in cls._CLOSURE_REQUIREMENTS.get(target_status, ()):
+            total = ClosureStateService._annotation(order_type, "total")
+            open_count = ClosureStateService._annotation(order_type, "open")
+            condition &= Q(**{f"{total}__gt": 0, open_count: 0})
+        return condition
+
+    @classmethod
+    def _prerequisites_met(cls, pipeline, target_status: str) -> bool:
+        try:
+            cls._validate_transition(pipeline, target_status)
+        except ValidationError:
+            return False
+        return True
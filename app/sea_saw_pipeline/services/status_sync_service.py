@@ -12,6 +12,10 @@ Cascade rules (explicit, user-triggered only):
 All other Pipeline transitions leave sub-entity statuses unchanged.
 Sub-entities manage their own status independently. Pipeline transitions are
 validated against sub-entity completion state before being allowed.
+
+The *_many variants serve PipelineStateService.transition_many(): sub-entity
+updates run once per entity type for the whole batch. Orders are still saved
+one by one (only those whose status actually changes) so Order signals fire.
 """
 
 from django.db import transaction
@@ -58,6 +62,21 @@ class StatusSyncService:
             return queryset.filter(deleted__isnull=True)
         return None
 
+    @classmethod
+    def _get_subentity_queryset_many(cls, pipeline_ids, entity_type):
+        """Non-deleted sub-entities of ``entity_type`` across ``pipeline_ids``."""
+        from ..models import Pipeline
+
+        relation_name = {
+            "production": "production_orders",
+            "purchase": "purchase_orders",
+            "outbound": "outbound_orders",
+        }.get(entity_type)
+        if relation_name is None:
+            return None
+        model = Pipeline._meta.get_field(relation_name).related_model
+        return model.objects.filter(pipeline_id__in=pipeline_ids, deleted__isnull=True)
+
     @classmethod
     def _confirm_order(cls, pipeline, user=None):
         """
@@ -142,7 +161,14 @@ class StatusSyncService:
             target_status: Target status value
             status_filter: Optional status to filter by (for selective updates)
         """
-        queryset = cls._get_subentity_queryset(pipeline, entity_type)
+        cls._update_subentity_queryset(
+            cls._get_subentity_queryset(pipeline, entity_type),
+            target_status,
+            status_filter,
+        )
+
+    @classmethod
+    def _update_subentity_queryset(cls, queryset, target_status, status_filter=None):
         if queryset is None:
             return
 
@@ -175,7 +201,16 @@ class StatusSyncService:
             pipeline.active_entity = active_entity_value
             pipeline.save(update_fields=["active_entity", "updated_at"])
 
-        # Handle the nodes where Pipeline affects Order.status
+        cls._cascade_order(pipeline, new_status, user)
+
+        # Apply status updates to production/purchase/outbound sub-entities
+        status_mapping = PIPELINE_TO_SUBENTITY_STATUS.get(new_status, {})
+        for entity_type, target_status in status_mapping.items():
+            cls._bulk_update_subentities(pipeline, entity_type, target_status)
+
+    @classmethod
+    def _cascade_order(cls, pipeline, new_status, user=None):
+        """Handle the nodes where Pipeline affects Order.status."""
         if new_status == PipelineStatusType.ORDER_CONFIRMED:
             cls._confirm_order(pipeline, user)
         elif new_status == PipelineStatusType.CANCELLED:
@@ -183,10 +218,39 @@ class StatusSyncService:
         elif new_status == PipelineStatusType.DRAFT:
             cls._revert_order_to_draft(pipeline, user)
 
-        # Apply status updates to production/purchase/outbound sub-entities
+    @classmethod
+    @transaction.atomic
+    def sync_many_to_subentities(cls, pipelines, new_status, user=None):
+        """
+        sync_pipeline_to_subentities() for pipelines that all moved to ``new_status``.
+
+        active_entity is not written here: transition_many() saves it together
+        with the status. Orders are loaded with one query, sub-entity cascades
+        run once per entity type.
+        """
+        from sea_saw_sales.models import Order
+
+        pipeline_ids = [pipeline.pk for pipeline in pipelines]
+
+        if new_status in (
+            PipelineStatusType.ORDER_CONFIRMED,
+            PipelineStatusType.CANCELLED,
+            PipelineStatusType.DRAFT,
+        ):
+            orders = Order._base_manager.in_bulk(
+                [pipeline.order_id for pipeline in pipelines if pipeline.order_id]
+            )
+            for pipeline in pipelines:
+                if pipeline.order_id in orders:
+                    pipeline.order = orders[pipeline.order_id]
+                    cls._cascade_order(pipeline, new_status, user)
+
         status_mapping = PIPELINE_TO_SUBENTITY_STATUS.get(new_status, {})
         for entity_type, target_status in status_mapping.items():
-            cls._bulk_update_subentities(pipeline, entity_type, target_status)
+            cls._update_subentity_queryset(
+                cls._get_subentity_queryset_many(pipeline_ids, entity_type),
+                target_status,
+            )
 
     @classmethod
     def sync_subentity_to_pipeline(
@@ -234,3 +298,20 @@ class StatusSyncService:
                 SubEntityStatus.ACTIVE,
                 status_filter=SubEntityStatus.ISSUE_REPORTED,
             )
+
+    @classmethod
+    def restore_issue_entities_many(cls, pipeline_ids, resume_status):
+        """restore_issue_entities() for many pipelines, one UPDATE per entity type."""
+        active_entity_value = PIPELINE_TO_ACTIVE_ENTITY.get(resume_status)
+        if active_entity_value is None:
+            return
+
+        entity_types = ACTIVE_ENTITY_TO_ENTITY_TYPES.get(active_entity_value, [])
+        for entity_type in entity_types:
+            if entity_type == "order":
+                continue
+            cls._update_subentity_queryset(
+                cls._get_subentity_queryset_many(pipeline_ids, entity_type),
+                SubEntityStatus.ACTIVE,
+                status_filter=SubEntityStatus.ISSUE_REPORTED,
+            )
@@ -4,4 +4,107 @@ Pipeline signals module.
 Reverse sync (sub-entity → pipeline auto-advance) has been removed.
 Sub-entities now manage their own status independently. Pipeline transitions
 are user-triggered and validated against sub-entity state.
+
+Financial summary maintenance:
+PipelineFinancialSummary is refreshed inside the same transaction whenever a
+row feeding it (OrderItem, PurchaseOrder, PurchaseItem, Payment) is saved,
+soft-deleted (safedelete soft delete goes through save()) or hard-deleted.
+Bulk operations (bulk_create / QuerySet.update) bypass signals and must call
+FinancialSummaryService.refresh() explicitly.
+Inside DeferredRecompute.scope() (every BaseSerializer.save()) refreshes are
+collected and each pipeline is refreshed once when the scope exits.
+
+Search documents:
+Pipeline.search_document includes the order code and contact name; changing
+either rebuilds the documents of the affected pipelines.
 """
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from sea_saw_base.models import follow_related_changes
+from sea_saw_crm.models import Contact
+from sea_saw_sales.models import Order, OrderItem
+from sea_saw_procurement.models import PurchaseOrder, PurchaseItem
+from sea_saw_finance.models import Payment
+
+from .models import Pipeline
+from .services.financial_summary_service import FinancialSummaryService
+
+
+def _is_pipeline_cascade(kwargs):
+    """Skip refresh while the pipeline itself is being hard-deleted."""
+    return isinstance(kwargs.get("origin"), Pipeline)
+
+
+# ============================================================================
+# Pipeline
+# ============================================================================
+
+
+@receiver(post_save, sender=Pipeline)
+def refresh_summary_on_pipeline_save(sender, instance, created, update_fields, **kwargs):
+    """
+    Pipelines may be created for (or re-linked to) an existing order without
+    any item being saved, so refresh on create and on full / order saves.
+    Status-only saves (update_fields without "order") are skipped.
+    """
+    if created or update_fields is None or "order" in update_fields:
+        FinancialSummaryService.schedule_refresh(instance.pk)
+
+
+# ============================================================================
+# OrderItem
+# ============================================================================
+
+
+@receiver(post_save, sender=OrderItem)
+@receiver(post_delete, sender=OrderItem)
+def refresh_summary_on_order_item_change(sender, instance, **kwargs):
+    if _is_pipeline_cascade(kwargs):
+        return
+    FinancialSummaryService.schedule_refresh_for_order(instance.order_id)
+
+
+# ============================================================================
+# PurchaseOrder / PurchaseItem
+# ============================================================================
+
+
+@receiver(post_save, sender=PurchaseOrder)
+@receiver(post_delete, sender=PurchaseOrder)
+def refresh_summary_on_purchase_order_change(sender, instance, **kwargs):
+    if _is_pipeline_cascade(kwargs):
+        return
+    FinancialSummaryService.schedule_refresh(instance.pipeline_id)
+
+
+@receiver(post_save, sender=PurchaseItem)
+@receiver(post_delete, sender=PurchaseItem)
+def refresh_summary_on_purchase_item_change(sender, instance, **kwargs):
+    if _is_pipeline_cascade(kwargs):
+        return
+    FinancialSummaryService.schedule_refresh_for_purchase_order(
+        instance.purchase_order_id
+    )
+
+
+# ============================================================================
+# Payment
+# ============================================================================
+
+
+@receiver(post_save, sender=Payment)
+@receiver(post_delete, sender=Payment)
+def refresh_summary_on_payment_change(sender, instance, **kwargs):
+    if _is_pipeline_cascade(kwargs):
+        return
+    FinancialSummaryService.schedule_refresh(instance.pipeline_id)
+
+
+# ============================================================================
+# Search documents
+# ============================================================================
+
+follow_related_changes(Pipeline, Order, "order_code", "order")
+follow_related_changes(Pipeline, Contact, "name", "contact")
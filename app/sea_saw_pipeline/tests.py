@@ -1,3 +1,789 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from sea_saw_attachment.models import Attachment
+from sea_saw_auth.models import Role, User
+from sea_saw_base.utils import DeferredRecompute
+from sea_saw_crm.models import Account, Contact
+from sea_saw_finance.models import Payment
+from sea_saw_procurement.models import PurchaseItem, PurchaseOrder
+from sea_saw_production.models import ProductionItem, ProductionOrder
+from sea_saw_sales.models import Order, OrderItem
+from sea_saw_sales.serializers.order_view import OrderSerializerForOrderView
+from sea_saw_warehouse.models import OutboundItem, OutboundOrder
+
+from .models import Pipeline, PipelineFinancialSummary, PipelineStatusType, PipelineType
+from .serializers.pipeline import PipelineSerializerForAdmin
+from .services import (
+    ClosureStateService,
+    FinancialSummaryService,
+    PipelineCloneService,
+    PipelineStateService,
+)
+
+
+class PipelineFinancialSummaryTests(TestCase):
+
+    def setUp(self):
+        self.order = Order.objects.create(order_date="2024-01-15")
+        self.pipeline = Pipeline.objects.create(
+            order=self.order, pipeline_type=PipelineType.HYBRID_FLOW
+        )
+        OrderItem.objects.create(
+            order=self.order, order_qty=10, gross_weight=2, unit_price=5
+        )
+        self.purchase = PurchaseOrder.objects.create(pipeline=self.pipeline)
+        PurchaseItem.objects.create(
+            purchase_order=self.purchase, purchase_qty=10, gross_weight=2, unit_price=3
+        )
+
+    def _pay(self, model_instance, amount):
+        return Payment.objects.create(
+            pipeline=self.pipeline,
+            content_type=ContentType.objects.get_for_model(model_instance),
+            object_id=model_instance.pk,
+            payment_date="2024-02-01",
+            amount=amount,
+        )
+
+    def test_summary_follows_item_and_payment_changes(self):
+        """Saving items / payments keeps the summary in sync."""
+        self._pay(self.order, Decimal("40"))
+        payment = self._pay(self.purchase, Decimal("25"))
+
+        summary = PipelineFinancialSummary.objects.get(pipeline=self.pipeline)
+        self.assertEqual(summary.order_total_amount, Decimal("100"))
+        self.assertEqual(summary.purchase_order_total_amount, Decimal("60"))
+        self.assertEqual(summary.purchase_margin, Decimal("40"))
+        self.assertEqual(summary.received_order_total_amount, Decimal("40"))
+        self.assertEqual(summary.paid_purchase_order_total_amount, Decimal("25"))
+
+        # Soft delete goes through save() and is excluded from the rollup
+        payment.delete()
+        summary.refresh_from_db()
+        self.assertIsNone(summary.paid_purchase_order_total_amount)
+
+    def test_pipeline_without_purchase_orders_has_no_purchase_total(self):
+        pipeline = Pipeline.objects.create(order=Order.objects.create())
+        summary = PipelineFinancialSummary.objects.get(pipeline=pipeline)
+        self.assertEqual(summary.order_total_amount, Decimal("0"))
+        self.assertIsNone(summary.purchase_order_total_amount)
+        self.assertIsNone(summary.purchase_margin)
+
+    def test_serializer_reads_summary_without_aggregates(self):
+        pipeline = Pipeline.objects.select_related("financial_summary").get(
+            pk=self.pipeline.pk
+        )
+        serializer = PipelineSerializerForAdmin()
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                serializer.get_purchase_margin(pipeline), Decimal("40")
+            )
+            self.assertEqual(
+                serializer.get_order_total_amount(pipeline), Decimal("100")
+            )
+
+    def test_rebuild_command_recreates_missing_summaries(self):
+        PipelineFinancialSummary.objects.all().delete()
+
+        call_command("rebuild_financial_summaries", stdout=StringIO())
+
+        summary = PipelineFinancialSummary.objects.get(pipeline=self.pipeline)
+        self.assertEqual(
+            summary.purchase_order_total_amount,
+            FinancialSummaryService.compute(self.pipeline.pk)[
+                "purchase_order_total_amount"
+            ],
+        )
+
+
+class DeferredRecomputeTests(TestCase):
+
+    def setUp(self):
+        self.order = Order.objects.create()
+        self.pipeline = Pipeline.objects.create(order=self.order)
+        self.purchase = PurchaseOrder.objects.create(pipeline=self.pipeline)
+
+    @staticmethod
+    def _count(queries, *fragments):
+        return sum(
+            all(fragment in query["sql"] for fragment in fragments)
+            for query in queries
+        )
+
+    def test_scope_recomputes_each_parent_once(self):
+        with CaptureQueriesContext(connection) as ctx:
+            with DeferredRecompute.scope():
+                for _ in range(20):
+                    OrderItem.objects.create(
+                        order=self.order, order_qty=1, gross_weight=1, unit_price=2
+                    )
+                    PurchaseItem.objects.create(
+                        purchase_order=self.purchase,
+                        purchase_qty=1,
+                        gross_weight=1,
+                        unit_price=1,
+                    )
+
+        order_table = Order._meta.db_table
+        purchase_table = PurchaseOrder._meta.db_table
+        summary_table = PipelineFinancialSummary._meta.db_table
+        self.assertEqual(
+            self._count(ctx.captured_queries, f'UPDATE "{order_table}"'), 1
+        )
+        self.assertEqual(
+            self._count(ctx.captured_queries, f'UPDATE "{purchase_table}"'), 1
+        )
+        self.assertEqual(
+            self._count(ctx.captured_queries, f'INSERT INTO "{summary_table}"'), 1
+        )
+
+        self.order.refresh_from_db()
+        self.purchase.refresh_from_db()
+        summary = PipelineFinancialSummary.objects.get(pipeline=self.pipeline)
+        self.assertEqual(self.order.total_amount, Decimal("40"))
+        self.assertEqual(self.purchase.total_amount, Decimal("20"))
+        self.assertEqual(summary.purchase_margin, Decimal("20"))
+
+    def test_nested_serializer_save_is_deferred(self):
+        items = [
+            {
+                "product_name": f"Squid {i}",
+                "order_qty": 2,
+                "gross_weight": "1.5",
+                "unit_price": "3",
+            }
+            for i in range(50)
+        ]
+        serializer = OrderSerializerForOrderView(
+            self.order, data={"order_items": items}, partial=True, context={}
+        )
+        serializer.is_valid(raise_exception=True)
+        with CaptureQueriesContext(connection) as ctx:
+            serializer.save()
+
+        order_table = Order._meta.db_table
+        # One total recompute for all 50 items (besides the order's own save)
+        self.assertEqual(
+            self._count(ctx.captured_queries, f'UPDATE "{order_table}" SET "total_amount"'),
+            1,
+        )
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.total_amount, Decimal("450"))
+        summary = PipelineFinancialSummary.objects.get(pipeline=self.pipeline)
+        self.assertEqual(summary.order_total_amount, Decimal("450"))
+
+    def test_failed_scope_rolls_back(self):
+        with self.assertRaises(RuntimeError):
+            with DeferredRecompute.scope():
+                OrderItem.objects.create(
+                    order=self.order, order_qty=1, gross_weight=1, unit_price=2
+                )
+                raise RuntimeError
+
+        self.assertFalse(OrderItem.objects.filter(order=self.order).exists())
+        # Outside a scope saves recompute immediately again
+        OrderItem.objects.create(
+            order=self.order, order_qty=1, gross_weight=1, unit_price=2
+        )
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.total_amount, Decimal("2"))
+
+
+class PipelineListQueryCountTests(TestCase):
+    """
+    Listing pipelines must cost a constant number of queries per role,
+    whatever the number of rows (see PrefetchPlanMixin).
+    """
+
+    # Upper bound per role for one list request (auth + count + plan queries)
+    QUERY_CEILING = {
+        "ADMIN": 21,
+        "SALE": 22,
+        "PRODUCTION": 16,
+        "WAREHOUSE": 16,
+    }
+
+    def setUp(self):
+        self.client = APIClient()
+        self.buyer = Account.objects.create(account_name="Buyer")
+        self.supplier = Account.objects.create(account_name="Supplier")
+        self.contact = Contact.objects.create(name="Contact", account=self.buyer)
+        self.users = {
+            role_type: User.objects.create_user(
+                username=role_type.lower(),
+                role=Role.objects.create(
+                    role_name=f"{role_type} (test)", role_type=role_type
+                ),
+            )
+            for role_type in self.QUERY_CEILING
+        }
+
+    def _create_pipeline(self, owner):
+        order = Order.objects.create(
+            buyer=self.buyer, seller=self.supplier, contact=self.contact, owner=owner
+        )
+        pipeline = Pipeline.objects.create(
+            order=order,
+            pipeline_type=PipelineType.HYBRID_FLOW,
+            status=PipelineStatusType.IN_OUTBOUND,
+            owner=owner,
+        )
+        items = [
+            OrderItem.objects.create(
+                order=order, order_qty=5, gross_weight=1, unit_price=2, owner=owner
+            )
+            for _ in range(2)
+        ]
+
+        purchase = PurchaseOrder.objects.create(
+            pipeline=pipeline, supplier=self.supplier, contact=self.contact, owner=owner
+        )
+        production = ProductionOrder.objects.create(pipeline=pipeline, owner=owner)
+        outbound = OutboundOrder.objects.create(pipeline=pipeline, owner=owner)
+        for item in items:
+            PurchaseItem.objects.create(
+                purchase_order=purchase, order_item=item, purchase_qty=5, owner=owner
+            )
+            ProductionItem.objects.create(
+                production_order=production, order_item=item, planned_qty=5
+            )
+            OutboundItem.objects.create(
+                outbound_order=outbound, order_item=item, outbound_qty=5
+            )
+
+        for related in (order, purchase):
+            Payment.objects.create(
+                pipeline=pipeline,
+                content_type=ContentType.objects.get_for_model(related),
+                object_id=related.pk,
+                payment_date="2024-02-01",
+                amount=Decimal("10"),
+                owner=owner,
+            )
+        return pipeline
+
+    def _count_list_queries(self, user):
+        self.client.force_authenticate(user=user)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/api/pipeline/pipelines/", {"page_size": 50})
+        self.assertEqual(response.status_code, 200, response.content)
+        return len(ctx.captured_queries), response.json()
+
+    def _assert_constant_queries(self, role_type):
+        user = self.users[role_type]
+
+        self._create_pipeline(user)
+        # Warm-up request fills per-process caches (e.g. ContentType)
+        self._count_list_queries(user)
+        few, data = self._count_list_queries(user)
+        self.assertEqual(data["count"], 1)
+
+        for _ in range(4):
+            self._create_pipeline(user)
+        many, data = self._count_list_queries(user)
+        self.assertEqual(data["count"], 5)
+
+        self.assertEqual(few, many, f"{role_type}: query count grows with rows")
+        self.assertLessEqual(many, self.QUERY_CEILING[role_type])
+
+    def test_admin_list_query_count_is_constant(self):
+        self._assert_constant_queries("ADMIN")
+
+    def test_sales_list_query_count_is_constant(self):
+        self._assert_constant_queries("SALE")
+
+    def test_production_list_query_count_is_constant(self):
+        self._assert_constant_queries("PRODUCTION")
+
+    def test_warehouse_list_query_count_is_constant(self):
+        self._assert_constant_queries("WAREHOUSE")
+
+
+class PipelineAPITestMixin:
+    """APIClient authenticated as a ``role_type`` user, and a pipeline factory."""
+
+    role_type = "ADMIN"
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.user = self._create_user(self.role_type)
+        self.client.force_authenticate(user=self.user)
+
+    @staticmethod
+    def _create_user(role_type):
+        if role_type == "ADMIN":
+            role = Role.objects.get(role_name="ADMIN")
+        else:
+            role = Role.objects.create(
+                role_name=f"{role_type} (test)", role_type=role_type
+            )
+        return User.objects.create_user(username=role_type.lower(), role=role)
+
+    def _create_pipeline(
+        self,
+        *outbound_statuses,
+        order=None,
+        pipeline_type=PipelineType.HYBRID_FLOW,
+        status=PipelineStatusType.IN_OUTBOUND,
+        **fields,
+    ):
+        """Pipeline with one outbound order per entry of ``outbound_statuses``."""
+        pipeline = Pipeline.objects.create(
+            order=order or Order.objects.create(),
+            pipeline_type=pipeline_type,
+            status=status,
+            **fields,
+        )
+        for outbound_status in outbound_statuses:
+            OutboundOrder.objects.create(pipeline=pipeline, status=outbound_status)
+        return pipeline
+
+
+class BulkTransitionTests(PipelineAPITestMixin, TestCase):
+    URL = "/api/pipeline/pipelines/bulk-transition/"
+    role_type = "WAREHOUSE"
+
+    def _post(self, pipeline_ids, target_status=PipelineStatusType.OUTBOUND_COMPLETED):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(
+                self.URL,
+                {"pipeline_ids": pipeline_ids, "target_status": target_status},
+                format="json",
+            )
+        return response, len(ctx.captured_queries)
+
+    def test_reports_per_pipeline_results(self):
+        closed = self._create_pipeline("completed", "cancelled")
+        still_open = self._create_pipeline("completed", "active")
+        without_outbound = self._create_pipeline()
+
+        response, _ = self._post([closed.pk, still_open.pk, without_outbound.pk, 0])
+        self.assertEqual(response.status_code, 200, response.content)
+        data = response.json()
+        self.assertEqual((data["succeeded"], data["failed"]), (1, 3))
+
+        results = {result["id"]: result for result in data["results"]}
+        self.assertTrue(results[closed.pk]["success"])
+        self.assertIn("outbound", results[still_open.pk]["errors"])
+        self.assertIn("outbound", results[without_outbound.pk]["errors"])
+        self.assertFalse(results[0]["success"])
+
+        closed.refresh_from_db()
+        still_open.refresh_from_db()
+        self.assertEqual(closed.status, PipelineStatusType.OUTBOUND_COMPLETED)
+        self.assertIsNotNone(closed.outbound_completed_at)
+        self.assertEqual(closed.updated_by, self.user)
+        self.assertEqual(still_open.status, PipelineStatusType.IN_OUTBOUND)
+
+    def test_query_count_does_not_grow_with_batch_size(self):
+        few_ids = [self._create_pipeline("completed").pk for _ in range(2)]
+        many_ids = [self._create_pipeline("completed").pk for _ in range(8)]
+
+        response, few = self._post(few_ids)
+        self.assertEqual(response.json()["succeeded"], 2)
+        response, many = self._post(many_ids)
+        self.assertEqual(response.json()["succeeded"], 8)
+        self.assertEqual(few, many)
+
+    def test_role_without_permission_is_rejected(self):
+        pipeline = self._create_pipeline("completed")
+        response, _ = self._post([pipeline.pk], PipelineStatusType.ORDER_CONFIRMED)
+        self.assertEqual(response.status_code, 403)
+
+    def test_order_confirmation_cascades_to_orders(self):
+        self.client.force_authenticate(user=self._create_user("ADMIN"))
+        buyer = Account.objects.create(account_name="Buyer")
+        pipelines = [
+            self._create_pipeline(
+                order=Order.objects.create(buyer=buyer), status=PipelineStatusType.DRAFT
+            )
+            for _ in range(2)
+        ]
+
+        response, _ = self._post(
+            [pipeline.pk for pipeline in pipelines], PipelineStatusType.ORDER_CONFIRMED
+        )
+        self.assertEqual(response.json()["succeeded"], 2, response.content)
+        for pipeline in pipelines:
+            pipeline.refresh_from_db()
+            self.assertEqual(pipeline.active_entity, "order")
+            self.assertEqual(pipeline.order.status, "confirmed")
+
+
+class ClosureStateTests(PipelineAPITestMixin, TestCase):
+    """Sub-entity closure counts are computed once per pipeline and shared."""
+
+    def _outbound_queries(self, func):
+        table = OutboundOrder._meta.db_table
+        with CaptureQueriesContext(connection) as ctx:
+            result = func()
+        return result, sum(table in query["sql"] for query in ctx.captured_queries)
+
+    def test_state_is_loaded_once(self):
+        pipeline = self._create_pipeline("completed", "active")
+
+        state, queries = self._outbound_queries(lambda: ClosureStateService.get(pipeline))
+        self.assertEqual(queries, 1)
+        self.assertEqual(state["outbound"], (2, 1))
+        self.assertEqual(state["production"], (0, 0))
+
+        _, queries = self._outbound_queries(lambda: ClosureStateService.get(pipeline))
+        self.assertEqual(queries, 0)
+
+        annotated = ClosureStateService.annotate(Pipeline.objects.all()).get(pk=pipeline.pk)
+        self.assertTrue(ClosureStateService.is_loaded(annotated))
+        self.assertEqual(ClosureStateService.get(annotated), state)
+
+    def test_transition_reads_annotated_state(self):
+        pipeline = self._create_pipeline("completed", "cancelled")
+        annotated = ClosureStateService.annotate(Pipeline.objects.all()).get(pk=pipeline.pk)
+
+        _, queries = self._outbound_queries(
+            lambda: PipelineStateService.transition(
+                pipeline=annotated,
+                target_status=PipelineStatusType.OUTBOUND_COMPLETED,
+                user=self.user,
+            )
+        )
+        self.assertEqual(queries, 0)
+        self.assertEqual(annotated.status, PipelineStatusType.OUTBOUND_COMPLETED)
+
+    def test_allowed_actions_respect_prerequisites(self):
+        still_open = self._create_pipeline("active")
+        closed = self._create_pipeline("completed")
+
+        response = self.client.get("/api/pipeline/pipelines/")
+        self.assertEqual(response.status_code, 200, response.content)
+        actions = {row["id"]: row["allowed_actions"] for row in response.json()["results"]}
+        self.assertNotIn(PipelineStatusType.OUTBOUND_COMPLETED, actions[still_open.pk])
+        self.assertIn(PipelineStatusType.OUTBOUND_COMPLETED, actions[closed.pk])
+        self.assertIn(PipelineStatusType.ISSUE_REPORTED, actions[still_open.pk])
+
+    def test_allowed_actions_do_not_depend_on_annotation(self):
+        still_open = self._create_pipeline("active")
+        annotated = ClosureStateService.annotate(Pipeline.objects.all()).get(
+            pk=still_open.pk
+        )
+        plain = Pipeline.objects.get(pk=still_open.pk)
+        self.assertFalse(ClosureStateService.is_loaded(plain))
+
+        actions = [
+            PipelineStateService.get_allowed_actions(pipeline, self.user)
+            for pipeline in (annotated, plain)
+        ]
+        self.assertEqual(actions[0], actions[1])
+        self.assertNotIn(PipelineStatusType.OUTBOUND_COMPLETED, actions[1])
+
+    def test_manager_idempotency_uses_closure_state(self):
+        pipeline = self._create_pipeline("completed")
+        with self.assertRaisesMessage(Exception, "OutboundOrder already exists"):
+            pipeline.create_outbound_order(user=self.user, copy_items=False)
+
+        pipeline.create_outbound_order(user=self.user, copy_items=False, force=True)
+        self.assertEqual(ClosureStateService.get(pipeline)["outbound"], (2, 1))
+
+
+class ActionableByMeTests(PipelineAPITestMixin, TestCase):
+    """Precomputed transition table and the ?actionable_by_me list filter."""
+
+    URL = "/api/pipeline/pipelines/"
+    role_type = "SALE"
+
+    def _create_owned_pipeline(self, status):
+        return self._create_pipeline(
+            order=Order.objects.create(owner=self.user), owner=self.user, status=status
+        )
+
+    def test_table_matches_state_machine_and_role_permissions(self):
+        from .constants import (
+            PIPELINE_ROLE_ALLOWED_TARGET_STATES,
+            PIPELINE_STATE_MACHINE_BY_TYPE,
+            PIPELINE_TRANSITION_TABLE,
+        )
+
+        for pipeline_type, state_machine in PIPELINE_STATE_MACHINE_BY_TYPE.items():
+            for status, targets in state_machine.items():
+                for role, role_targets in PIPELINE_ROLE_ALLOWED_TARGET_STATES.items():
+                    expected = targets if "*" in role_targets else targets & role_targets
+                    self.assertEqual(
+                        PIPELINE_TRANSITION_TABLE[(pipeline_type, status, role)],
+                        expected,
+                    )
+
+    def _actionable_rows(self):
+        rows = {}
+        for value in ("true", "false"):
+            response = self.client.get(self.URL, {"actionable_by_me": value})
+            self.assertEqual(response.status_code, 200, response.content)
+            rows[value] = {
+                row["id"]: row["allowed_actions"] for row in response.json()["results"]
+            }
+        return rows
+
+    def test_filter_keeps_only_actionable_pipelines(self):
+        draft = self._create_owned_pipeline(PipelineStatusType.DRAFT)
+        in_progress = self._create_owned_pipeline(
+            PipelineStatusType.IN_PURCHASE_AND_PRODUCTION
+        )
+
+        rows = self._actionable_rows()
+        self.assertEqual(set(rows["true"]), {draft.pk})
+        self.assertTrue(rows["true"][draft.pk])
+        self.assertEqual(set(rows["false"]), {in_progress.pk})
+        self.assertEqual(rows["false"][in_progress.pk], [])
+
+    def test_filter_respects_closure_prerequisites(self):
+        pipelines = {}
+        for purchase_status in ("draft", "completed"):
+            pipeline = self._create_pipeline(
+                order=Order.objects.create(owner=self.user),
+                owner=self.user,
+                pipeline_type=PipelineType.PURCHASE_FLOW,
+                status=PipelineStatusType.IN_PURCHASE,
+            )
+            PurchaseOrder.objects.create(pipeline=pipeline, status=purchase_status)
+            pipelines[purchase_status] = pipeline
+
+        rows = self._actionable_rows()
+        self.assertEqual(set(rows["true"]), {pipelines["completed"].pk})
+        self.assertIn(
+            PipelineStatusType.PURCHASE_COMPLETED, rows["true"][pipelines["completed"].pk]
+        )
+        self.assertEqual(rows["false"], {pipelines["draft"].pk: []})
+
+
+class CreateSubEntitiesTests(PipelineAPITestMixin, TestCase):
+    """Production / purchase / outbound orders created in one batched call."""
+
+    def _create_confirmed_pipeline(self, pipeline_type=PipelineType.HYBRID_FLOW):
+        order = Order.objects.create()
+        for qty in (2, 3, 5):
+            OrderItem.objects.create(order=order, order_qty=qty, total_price=qty * 10)
+        return self._create_pipeline(
+            order=order,
+            pipeline_type=pipeline_type,
+            status=PipelineStatusType.ORDER_CONFIRMED,
+        )
+
+    def _post(self, pipeline, data):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(
+                f"/api/pipeline/pipelines/{pipeline.pk}/create-sub-entities/",
+                data,
+                format="json",
+            )
+        return response, len(ctx.captured_queries)
+
+    def test_hybrid_setup_in_one_call(self):
+        pipeline = self._create_confirmed_pipeline()
+        response, _ = self._post(
+            pipeline,
+            {
+                "production": {"remark": "batch"},
+                "purchase": {},
+                "outbound": {},
+                "auto_update_status": True,
+            },
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(
+            response.json()["status"], PipelineStatusType.IN_PURCHASE_AND_PRODUCTION
+        )
+
+        production = ProductionOrder.objects.get(pipeline=pipeline)
+        purchase = PurchaseOrder.objects.get(pipeline=pipeline)
+        outbound = OutboundOrder.objects.get(pipeline=pipeline)
+        self.assertEqual(production.remark, "batch")
+        self.assertEqual(purchase.purchase_code, pipeline.order.order_code)
+        self.assertEqual(production.production_items.count(), 3)
+        self.assertEqual(purchase.purchase_items.count(), 3)
+        self.assertEqual(outbound.outbound_items.count(), 3)
+        self.assertEqual(purchase.total_amount, Decimal("100"))
+
+        item = pipeline.order.order_items.get(order_qty=5)
+        self.assertEqual(item.fulfillment.purchase_qty_total, Decimal("5"))
+        self.assertEqual(item.fulfillment.planned_qty_total, Decimal("5"))
+
+    def test_batch_uses_fewer_queries_than_separate_calls(self):
+        batched, batched_queries = self._post(
+            self._create_confirmed_pipeline(),
+            {"production": {}, "purchase": {}, "outbound": {}},
+        )
+        self.assertEqual(batched.status_code, 201, batched.content)
+
+        pipeline = self._create_confirmed_pipeline()
+        with CaptureQueriesContext(connection) as ctx:
+            for action in ("production", "purchase", "outbound"):
+                response = self.client.post(
+                    f"/api/pipeline/pipelines/{pipeline.pk}/create_{action}/",
+                    {},
+                    format="json",
+                )
+                self.assertEqual(response.status_code, 201, response.content)
+        self.assertLess(batched_queries, len(ctx.captured_queries))
+
+    def test_invalid_batch_creates_nothing(self):
+        pipeline = self._create_confirmed_pipeline(PipelineType.PRODUCTION_FLOW)
+        response, _ = self._post(pipeline, {"production": {}, "purchase": {}})
+        self.assertEqual(response.status_code, 400, response.content)
+        self.assertFalse(ProductionOrder.objects.filter(pipeline=pipeline).exists())
+
+        self.client.force_authenticate(user=self._create_user("WAREHOUSE"))
+        pipeline.status = PipelineStatusType.PRODUCTION_COMPLETED
+        pipeline.save()
+        response, _ = self._post(pipeline, {"production": {}, "outbound": {}})
+        self.assertEqual(response.status_code, 403, response.content)
+
+
+class PipelineCloneTests(PipelineAPITestMixin, TestCase):
+    """Repeat orders: whole pipeline trees copied with set-based inserts."""
+
+    def setUp(self):
+        super().setUp()
+        self.contact = Contact.objects.create(name="Repeat Buyer")
+        self.supplier = Account.objects.create(account_name="Fish Co")
+
+    def _create_source_pipeline(self):
+        order = Order.objects.create(contact=self.contact, status="confirmed")
+        items = [
+            OrderItem.objects.create(order=order, order_qty=qty, total_price=qty * 10)
+            for qty in (2, 3)
+        ]
+        pipeline = self._create_pipeline(
+            order=order,
+            pipeline_type=PipelineType.PURCHASE_FLOW,
+            status=PipelineStatusType.IN_PURCHASE,
+        )
+        purchase = PurchaseOrder.objects.create(
+            pipeline=pipeline, supplier=self.supplier, status="active"
+        )
+        for item in items:
+            PurchaseItem.objects.create(
+                purchase_order=purchase,
+                order_item=item,
+                purchase_qty=item.order_qty,
+                total_price=item.order_qty * 4,
+            )
+        for target in (order, purchase):
+            Attachment.objects.create(
+                content_type=ContentType.objects.get_for_model(target),
+                object_id=target.pk,
+                file=f"attachments/{target.pk}.pdf",
+            )
+        return pipeline
+
+    def test_clone_copies_tree_with_fresh_codes(self):
+        source = self._create_source_pipeline()
+        response = self.client.post(
+            f"/api/pipeline/pipelines/{source.pk}/clone/",
+            {"order_date": "2024-03-01"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+
+        clone = Pipeline.objects.get(pk=response.json()["id"])
+        self.assertNotEqual(clone.pipeline_code, source.pipeline_code)
+        self.assertEqual(clone.status, PipelineStatusType.DRAFT)
+        self.assertEqual(clone.owner, self.user)
+        self.assertEqual(clone.contact, self.contact)
+        self.assertEqual(str(clone.order_date), "2024-03-01")
+
+        order = clone.order
+        self.assertNotEqual(order.order_code, source.order.order_code)
+        self.assertEqual(order.status, "draft")
+        self.assertEqual(order.total_amount, Decimal("50"))
+        self.assertIn(order.order_code.lower(), clone.search_document)
+        self.assertIn("repeat buyer", order.search_document)
+
+        purchase = clone.purchase_orders.get()
+        self.assertEqual(purchase.supplier, self.supplier)
+        self.assertEqual(purchase.status, "draft")
+        self.assertEqual(purchase.total_amount, Decimal("20"))
+        self.assertEqual(
+            {item.order_item.order_id for item in purchase.purchase_items.all()},
+            {order.pk},
+        )
+        item = order.order_items.get(order_qty=3)
+        self.assertEqual(item.fulfillment.purchase_qty_total, Decimal("3"))
+
+        source_purchase = source.purchase_orders.get()
+        for target, source_target in ((order, source.order), (purchase, source_purchase)):
+            attachment = Attachment.objects.get(
+                content_type=ContentType.objects.get_for_model(target),
+                object_id=target.pk,
+            )
+            self.assertEqual(attachment.file.name, f"attachments/{source_target.pk}.pdf")
+
+        summary = PipelineFinancialSummary.objects.get(pipeline=clone)
+        self.assertEqual(summary.order_total_amount, Decimal("50"))
+        self.assertEqual(summary.purchase_order_total_amount, Decimal("20"))
+
+    def test_bulk_clone_inserts_once_per_table(self):
+        sources = [self._create_source_pipeline() for _ in range(3)]
+        with CaptureQueriesContext(connection) as ctx:
+            clones = PipelineCloneService.clone_many(sources, user=self.user)
+        self.assertEqual(len(clones), 3)
+
+        inserts = [
+            query["sql"].split('"')[1]
+            for query in ctx.captured_queries
+            if query["sql"].startswith("INSERT INTO") and "sequence" not in query["sql"]
+        ]
+        for table in (
+            "sea_saw_sales_order",
+            "sea_saw_pipeline_pipeline",
+            "sea_saw_sales_orderitem",
+            "sea_saw_procurement_purchaseorder",
+            "sea_saw_procurement_purchaseitem",
+            "sea_saw_attachment_attachment",
+            PipelineFinancialSummary._meta.db_table,
+        ):
+            self.assertEqual(inserts.count(table), 1, table)
+        self.assertEqual(
+            len({clone.order.order_code for clone in clones.values()}), 3
+        )
+        for clone in clones.values():
+            summary = PipelineFinancialSummary.objects.get(pipeline=clone)
+            self.assertEqual(summary.order_total_amount, Decimal("50"))
+            self.assertEqual(summary.purchase_order_total_amount, Decimal("20"))
+            self.assertIsNone(summary.received_order_total_amount)
+
+    def test_clone_query_count_does_not_grow_with_batch_size(self):
+        counts = []
+        for size in (1, 4):
+            sources = [self._create_source_pipeline() for _ in range(size)]
+            with CaptureQueriesContext(connection) as ctx:
+                PipelineCloneService.clone_many(sources, user=self.user)
+            counts.append(len(ctx.captured_queries))
+        self.assertEqual(counts[0], counts[1])
 
-# Create your tests here.
+    def test_bulk_clone_reports_missing_pipelines(self):
+        source = self._create_source_pipeline()
+        response = self.client.post(
+            "/api/pipeline/pipelines/bulk-clone/",
+            {"pipeline_ids": [source.pk, 999999], "include_attachments": False},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        body = response.json()
+        self.assertEqual((body["succeeded"], body["failed"]), (1, 1))
+        clone = Pipeline.objects.get(pk=body["results"][0]["clone_id"])
+        self.assertFalse(
+            Attachment.objects.filter(
+                content_type=ContentType.objects.get_for_model(Order),
+                object_id=clone.order_id,
+            ).exists()
+        )
+        self.assertEqual(
+            body["results"][1],
+            {"id": 999999, "success": False, "errors": {"detail": "Not found."}},
+        )
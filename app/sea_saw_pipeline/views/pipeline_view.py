@@ -3,9 +3,10 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework import status
 from django_filters import rest_framework as filters
-from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.filters import OrderingFilter
 from rest_framework.permissions import IsAuthenticated
 from django.core.exceptions import ValidationError as DjangoValidationError
+from django.utils.dateparse import parse_date
 from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.parsers import FormParser, JSONParser
 from sea_saw_base.parsers import NestedMultiPartParser
@@ -27,13 +28,20 @@ from sea_saw_pipeline.permissions import (
 )
 
 from ..constants import PipelineStatus, PipelineTypeAccess
+from ..services import (
+    ClosureStateService,
+    PipelineCloneService,
+    PipelineStateService,
+)
 from ..filters import PipelineFilter
+from sea_saw_base.filtersets import SearchDocumentFilter
 from sea_saw_base.metadata import BaseMetadata
-from sea_saw_base.mixins import MultipartNestedDataMixin
+from sea_saw_base.mixins import MultipartNestedDataMixin, PrefetchPlanMixin
 
 
 class PipelineViewSet(
     MultipartNestedDataMixin,
+    PrefetchPlanMixin,
     ModelViewSet,
 ):
     """
@@ -48,8 +56,10 @@ class PipelineViewSet(
     Features:
     - Role-based serializer selection (ADMIN, SALE, PRODUCTION, WAREHOUSE)
     - Role-based queryset filtering
+    - Role-aware prefetch plans derived from role_serializer_map (PrefetchPlanMixin)
     - State transition management
     - Sub-entity creation (production/purchase/outbound orders)
+    - Cloning pipelines for repeat orders (single / bulk)
     - File upload support via MultipartNestedDataMixin
 
     URL: /api/sea-saw-crm/pipelines/
@@ -57,7 +67,7 @@ class PipelineViewSet(
 
     queryset = Pipeline.objects.all()
     metadata_class = BaseMetadata
-    filter_backends = (OrderingFilter, SearchFilter, filters.DjangoFilterBackend)
+    filter_backends = (OrderingFilter, SearchDocumentFilter, filters.DjangoFilterBackend)
     parser_classes = (JSONParser, NestedMultiPartParser, FormParser)
 
     permission_classes = [
@@ -71,6 +81,24 @@ class PipelineViewSet(
     # Only these actions will parse nested multipart data
     multipart_nested_actions = {"create", "update", "partial_update"}
 
+    # Actions whose pipelines carry sub-entity closure counts (ClosureStateService):
+    # allowed_actions, transition validation and creation idempotency read them
+    # (a pipeline serialized without them costs one extra query)
+    closure_state_actions = {
+        "list",
+        "retrieve",
+        "update",
+        "partial_update",
+        "transition",
+        "bulk_transition",
+        "create_production",
+        "create_purchase",
+        "create_outbound",
+        "create_sub_entities",
+        "create_order",
+        "update_amounts",
+    }
+
     # Role-based serializer mapping
     role_serializer_map = {
         "ADMIN": PipelineSerializerForAdmin,
@@ -156,7 +184,10 @@ class PipelineViewSet(
         - WAREHOUSE: PRODUCTION_COMPLETED and all subsequent states
         """
         # Filter out soft-deleted records
+        # (select_related / prefetch for list & retrieve come from PrefetchPlanMixin)
         base_queryset = super().get_queryset().filter(deleted__isnull=True)
+        if self.action in self.closure_state_actions:
+            base_queryset = ClosureStateService.annotate(base_queryset)
 
         user = self.request.user
         role = getattr(user.role, "role_type", None)
@@ -233,6 +264,83 @@ class PipelineViewSet(
         serializer = self.get_serializer(pipeline)
         return Response(serializer.data)
 
+    # Upper bound of pipelines per bulk_transition request
+    bulk_transition_limit = 200
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="bulk-transition",
+        permission_classes=[IsAuthenticated, CanTransitionPipeline],
+    )
+    def bulk_transition(self, request):
+        """
+        Transition many pipelines to the same target status in one transaction
+
+        Request body:
+        {
+            "pipeline_ids": [1, 2, 3],
+            "target_status": "completed"
+        }
+
+        Returns:
+        - 200: {"results": [{"id", "success", "status" | "errors"}, ...],
+                "succeeded": n, "failed": m}
+        - 400: Invalid request body or transition not allowed for the role
+        """
+        target_status = request.data.get("target_status")
+        pipeline_ids = request.data.get("pipeline_ids")
+
+        if not target_status:
+            return Response(
+                {"detail": "target_status is required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            pipeline_ids = list(dict.fromkeys(int(pk) for pk in pipeline_ids))
+        except (TypeError, ValueError):
+            return Response(
+                {"detail": "pipeline_ids must be a list of ids"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if not pipeline_ids or len(pipeline_ids) > self.bulk_transition_limit:
+            return Response(
+                {
+                    "detail": f"pipeline_ids must contain 1 to "
+                    f"{self.bulk_transition_limit} ids"
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        pipelines = self.get_queryset().in_bulk(pipeline_ids)
+        try:
+            transitioned = PipelineStateService.transition_many(
+                pipelines=[pipelines[pk] for pk in pipeline_ids if pk in pipelines],
+                target_status=target_status,
+                user=request.user,
+            )
+        except (ValidationError, DjangoValidationError) as e:
+            return Response(
+                {"detail": e.message_dict if hasattr(e, "message_dict") else str(e)},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        transitioned = {result["id"]: result for result in transitioned}
+        results = [
+            transitioned.get(
+                pk, {"id": pk, "success": False, "errors": {"detail": "Not found."}}
+            )
+            for pk in pipeline_ids
+        ]
+        succeeded = sum(result["success"] for result in results)
+        return Response(
+            {
+                "results": results,
+                "succeeded": succeeded,
+                "failed": len(results) - succeeded,
+            }
+        )
+
     # =====================
     # Custom Actions - Sub-Entity Creation
     # =====================
@@ -370,6 +478,197 @@ class PipelineViewSet(
         serializer = self.get_serializer(pipeline)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
+    # Who may create each sub-entity type (same as create_production / ...)
+    sub_entity_permissions = {
+        "production": IsProduction | IsAdmin,
+        "purchase": IsSale | IsAdmin,
+        "outbound": IsWarehouse | IsAdmin,
+    }
+
+    @action(
+        detail=True,
+        methods=["post"],
+        url_path="create-sub-entities",
+        permission_classes=[IsAuthenticated],
+    )
+    def create_sub_entities(self, request, pk=None):
+        """
+        Create several sub-entities of this pipeline in one transaction
+
+        Request body:
+        {
+            "production": {"planned_date": "2024-01-15"},
+            "purchase": {"supplier": <supplier_id>},
+            "outbound": {"outbound_date": "2024-02-01"},
+            "copy_items": true,          // Optional (default true)
+            "auto_update_status": true   // Optional: at most one transition
+        }
+
+        Returns:
+        - 201: Updated pipeline data with the new sub-entities
+        - 400: Invalid request or pipeline state (nothing is created)
+        - 403: Role may not create one of the requested types
+        """
+        sub_entities = {
+            order_type: request.data[order_type] or {}
+            for order_type in self.sub_entity_permissions
+            if order_type in request.data
+        }
+        if not all(isinstance(fields, dict) for fields in sub_entities.values()):
+            return Response(
+                {"detail": "Sub-entity fields must be objects"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        for order_type in sub_entities:
+            if not self.sub_entity_permissions[order_type]().has_permission(request, self):
+                raise PermissionDenied(f"Not allowed to create {order_type} orders")
+
+        pipeline = self.get_object()
+
+        try:
+            pipeline.create_sub_entities(
+                sub_entities,
+                user=request.user,
+                copy_items=request.data.get("copy_items", True),
+                auto_update_status=request.data.get("auto_update_status", False),
+            )
+        except (ValidationError, DjangoValidationError) as e:
+            return Response(
+                {"detail": e.messages if hasattr(e, "messages") else str(e)},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        pipeline.refresh_from_db()
+        serializer = self.get_serializer(pipeline)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    # =====================
+    # Custom Actions - Cloning (repeat orders)
+    # =====================
+    @staticmethod
+    def _clone_options(request):
+        """Options shared by clone / bulk_clone; raises ValidationError on bad input."""
+        order_date = request.data.get("order_date") or None
+        if order_date is not None:
+            try:
+                order_date = parse_date(order_date)
+            except (TypeError, ValueError):
+                order_date = None
+            if order_date is None:
+                raise ValidationError({"order_date": "Expected YYYY-MM-DD"})
+        return {
+            "order_date": order_date,
+            "include_purchase_orders": request.data.get("include_purchase_orders", True),
+            "include_attachments": request.data.get("include_attachments", True),
+        }
+
+    @action(
+        detail=True,
+        methods=["post"],
+        permission_classes=[IsAuthenticated, IsSale | IsAdmin],
+    )
+    def clone(self, request, pk=None):
+        """
+        Duplicate this pipeline for a repeat order
+
+        Copies the order and its items, purchase orders (supplier and items)
+        and attachment rows with fresh codes; statuses start over at DRAFT.
+
+        Request body (all optional):
+        {
+            "order_date": "2024-03-01",        // Default: today
+            "include_purchase_orders": true,
+            "include_attachments": true
+        }
+
+        Returns:
+        - 201: The new pipeline
+        - 400: Invalid options
+        """
+        pipeline = self.get_object()
+        try:
+            options = self._clone_options(request)
+        except ValidationError as e:
+            return Response({"detail": e.detail}, status=status.HTTP_400_BAD_REQUEST)
+
+        clone = PipelineCloneService.clone(pipeline, user=request.user, **options)
+        serializer = self.get_serializer(clone)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    # Upper bound of pipelines per bulk_clone request
+    bulk_clone_limit = 200
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="bulk-clone",
+        permission_classes=[IsAuthenticated, IsSale | IsAdmin],
+    )
+    def bulk_clone(self, request):
+        """
+        Duplicate many pipelines in one transaction (seasonal bulk reorders)
+
+        Request body:
+        {
+            "pipeline_ids": [1, 2, 3],
+            "order_date": "2024-03-01",        // Optional, as for clone
+            "include_purchase_orders": true,
+            "include_attachments": true
+        }
+
+        Returns:
+        - 201: {"results": [{"id", "success", "clone_id", "pipeline_code"}
+                            | {"id", "success": False, "errors"}, ...],
+                "succeeded": n, "failed": m}
+        - 400: Invalid request body
+        """
+        try:
+            pipeline_ids = list(
+                dict.fromkeys(int(pk) for pk in request.data.get("pipeline_ids"))
+            )
+        except (TypeError, ValueError):
+            return Response(
+                {"detail": "pipeline_ids must be a list of ids"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if not pipeline_ids or len(pipeline_ids) > self.bulk_clone_limit:
+            return Response(
+                {"detail": f"pipeline_ids must contain 1 to {self.bulk_clone_limit} ids"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            options = self._clone_options(request)
+        except ValidationError as e:
+            return Response({"detail": e.detail}, status=status.HTTP_400_BAD_REQUEST)
+
+        pipelines = self.get_queryset().in_bulk(pipeline_ids)
+        clones = PipelineCloneService.clone_many(
+            pipelines.values(), user=request.user, **options
+        )
+
+        results = [
+            (
+                {
+                    "id": pk,
+                    "success": True,
+                    "clone_id": clones[pk].pk,
+                    "pipeline_code": clones[pk].pipeline_code,
+                }
+                if pk in clones
+                else {"id": pk, "success": False, "errors": {"detail": "Not found."}}
+            )
+            for pk in pipeline_ids
+        ]
+        succeeded = len(clones)
+        return Response(
+            {
+                "results": results,
+                "succeeded": succeeded,
+                "failed": len(results) - succeeded,
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
     # =====================
     # Custom Actions - Data Aggregation
     # =====================
@@ -380,15 +679,15 @@ class PipelineViewSet(
     )
     def update_amounts(self, request, pk=None):
         """
-        Manually trigger update of total_amount and paid_amount
+        Manually rebuild the pipeline's financial summary
+        (order / purchase totals and received / paid payment amounts)
 
         Returns:
         - 200: Updated pipeline data with refreshed amounts
         """
         pipeline = self.get_object()
 
-        pipeline.update_total_amount()
-        pipeline.update_paid_amount()
+        pipeline.refresh_financial_summary()
         pipeline.refresh_from_db()
 
         serializer = self.get_serializer(pipeline)
@@ -6,6 +6,7 @@ from django.db import models
 from django.utils.translation import gettext_lazy as _
 
 from sea_saw_base.models import AbstarctItemBase
+from sea_saw_base.utils import DeferredRecompute
 from sea_saw_sales.models import OrderItem
 from .purchase_order import PurchaseOrder
 
@@ -100,6 +101,7 @@ class PurchaseItem(AbstarctItemBase):
             self.total_price = self.unit_price * self.total_gross_weight
 
         super().save(*args, **kwargs)
-        # Trigger purchase order total_amount update
-        if self.purchase_order_id:
-            self.purchase_order.update_total_amount()
+        # Trigger purchase order total_amount update (once per DeferredRecompute scope)
+        DeferredRecompute.mark_dirty(
+            PurchaseOrder.TOTAL_AMOUNT_RECOMPUTE, self.purchase_order_id
+        )
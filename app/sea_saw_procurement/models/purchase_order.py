@@ -5,18 +5,23 @@ Purchase Order - 使用 Supplier 模型
 """
 
 from django.db import models
-from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from decimal import Decimal
-from django.db.models import Sum
+from django.db.models import OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
 from django.contrib.contenttypes.fields import GenericRelation
 
-from sea_saw_base.models import AbstractOrderBase
+from sea_saw_base.models import (
+    AbstractOrderBase,
+    FieldTrackingMixin,
+    SequentialCodeMixin,
+)
+from sea_saw_base.utils import DeferredRecompute
 from sea_saw_sales.models import Order
 from .enums import PurchaseStatus
 
 
-class PurchaseOrder(AbstractOrderBase):
+class PurchaseOrder(FieldTrackingMixin, SequentialCodeMixin, AbstractOrderBase):
     """
     Purchase Order - Records purchasing information for orders
 
@@ -26,6 +31,13 @@ class PurchaseOrder(AbstractOrderBase):
     Flow: Pipeline → PurchaseOrder → OutboundOrder
     """
 
+    # SequentialCodeMixin: PO{year}-{000001}
+    code_prefix = "PO"
+    code_field = "purchase_code"
+
+    # FieldTrackingMixin: status changes are detected without re-reading the row
+    tracked_fields = ("status",)
+
     purchase_code = models.CharField(
         max_length=100,
         unique=True,
@@ -139,24 +151,39 @@ class PurchaseOrder(AbstractOrderBase):
     def __str__(self):
         return self.purchase_code or _("Unnamed Purchase Order")
 
-    def generate_code(self):
-        """Auto-generate purchase order code"""
-        year = timezone.now().year
-        count = PurchaseOrder.objects.filter(created_at__year=year).count() + 1
-        return f"PO{year}-{count:06d}"
+    # DeferredRecompute key of total_amount
+    TOTAL_AMOUNT_RECOMPUTE = "procurement.purchase_order_total_amount"
+
+    @classmethod
+    def update_total_amounts(cls, purchase_order_ids):
+        """Update total amount of many purchase orders in one UPDATE"""
+        from .purchase_item import PurchaseItem
+
+        totals = (
+            PurchaseItem.objects.filter(purchase_order=OuterRef("pk"))
+            .order_by()
+            .values("purchase_order")
+            .annotate(total=Sum("total_price"))
+            .values("total")
+        )
+        PurchaseOrder.objects.filter(pk__in=purchase_order_ids).update(
+            total_amount=Coalesce(Subquery(totals), Value(Decimal("0")))
+        )
 
     def update_total_amount(self):
         """Update total amount from purchase items"""
-        total = self.purchase_items.aggregate(total=Sum("total_price"))[
-            "total"
-        ] or Decimal("0")
-        PurchaseOrder.objects.filter(pk=self.pk).update(total_amount=total)
+        PurchaseOrder.update_total_amounts([self.pk])
 
     def save(self, *args, **kwargs):
         """Auto-generate purchase code if not set"""
         if not self.purchase_code:
             self.purchase_code = self.generate_code()
         super().save(*args, **kwargs)
-        # Auto-update total_amount after save
+        # Auto-update total_amount after save (deferred inside DeferredRecompute.scope())
         if hasattr(self, "purchase_items"):
-            self.update_total_amount()
+            DeferredRecompute.mark_dirty(self.TOTAL_AMOUNT_RECOMPUTE, self.pk)
+
+
+DeferredRecompute.register(
+    PurchaseOrder.TOTAL_AMOUNT_RECOMPUTE, PurchaseOrder.update_total_amounts
+)
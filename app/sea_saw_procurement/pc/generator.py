@@ -3,10 +3,15 @@
 import os
 from io import BytesIO
 
-from openpyxl import load_workbook
-
 import sea_saw_export
-from sea_saw_export.xlsx import fix_copied_sheet, PRODUCT_FIRST_ROW, setup_product_rows, fill_product_row, fill_header
+from sea_saw_export.xlsx import (
+    fix_copied_sheet,
+    load_template,
+    PRODUCT_FIRST_ROW,
+    setup_product_rows,
+    fill_product_row,
+    fill_header,
+)
 from sea_saw_export.xlsx.config import DocConfig
 
 TEMPLATE_PATH = os.path.join(
@@ -36,7 +41,7 @@ def generate_pc_xlsx(purchase_order) -> BytesIO:
 
     header, products = purchase_order_to_pc_data(purchase_order)
 
-    wb = load_workbook(TEMPLATE_PATH, rich_text=True)
+    wb = load_template(TEMPLATE_PATH)
     template_ws = wb[PC_CONFIG.template_sheet]
 
     ws = wb.copy_worksheet(template_ws)
@@ -61,19 +66,21 @@ def generate_pc_xlsx(purchase_order) -> BytesIO:
     return buf
 
 
-def generate_pc_bulk_xlsx(purchase_orders) -> BytesIO:
+def generate_pc_bulk_xlsx(purchase_orders, progress_callback=None) -> BytesIO:
     """
     Generate a single XLSX with one sheet per purchase order, sorted by created_at ascending.
     Returns a BytesIO object ready to stream as a file response.
+
+    progress_callback: optional callable(done, total), called after each sheet.
     """
     from .adapter import purchase_order_to_pc_data
 
     sorted_orders = sorted(purchase_orders, key=lambda po: po.created_at)
 
-    wb = load_workbook(TEMPLATE_PATH, rich_text=True)
+    wb = load_template(TEMPLATE_PATH)
     template_ws = wb[PC_CONFIG.template_sheet]
 
-    for po in sorted_orders:
+    for done, po in enumerate(sorted_orders, start=1):
         header, products = purchase_order_to_pc_data(po)
         ws = wb.copy_worksheet(template_ws)
         fix_copied_sheet(template_ws, ws, PC_CONFIG)
@@ -84,6 +91,8 @@ def generate_pc_bulk_xlsx(purchase_orders) -> BytesIO:
         for i, product in enumerate(products):
             fill_product_row(ws, PRODUCT_FIRST_ROW + i, product, PC_CONFIG)
         fill_header(ws, header, total_row, PC_CONFIG)
+        if progress_callback:
+            progress_callback(done, len(sorted_orders))
 
     del wb[PC_CONFIG.template_sheet]
 
@@ -65,7 +65,10 @@ class PurchaseOrderViewSet(ExportViewSetMixin, ModelViewSet):
 
     @action(detail=False, methods=["post"], url_path="export-purchase-contract-bulk")
     def export_purchase_contract_bulk(self, request):
-        """Generate a single XLSX with one sheet per purchase order for the given IDs."""
+        """Generate a single XLSX with one sheet per purchase order for the given IDs.
+
+        Pass ``"async": true`` to generate in the background (DownloadTask).
+        """
         from sea_saw_procurement.pc import generate_pc_bulk_xlsx
 
         def get_filename(qs):
@@ -74,7 +77,12 @@ class PurchaseOrderViewSet(ExportViewSetMixin, ModelViewSet):
                 codes += f"-and-{qs.count() - 3}-more"
             return f"PC-{codes}.xlsx"
 
-        return self._export_bulk(generate_pc_bulk_xlsx, get_filename, request.data.get("ids", []))
+        return self._export_bulk(
+            generate_pc_bulk_xlsx,
+            get_filename,
+            request.data.get("ids", []),
+            export_kind="purchase_contract",
+        )
 
 
 class NestedPurchaseOrderViewSet(ReturnRelatedMixin, ModelViewSet):
@@ -7,17 +7,20 @@ from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.contrib.contenttypes.fields import GenericRelation
 
-from sea_saw_base.models import BaseModel
+from sea_saw_base.models import BaseModel, FieldTrackingMixin
 from sea_saw_sales.models import Order
 from .enums import ProductionStatus
 
 
-class ProductionOrder(BaseModel):
+class ProductionOrder(FieldTrackingMixin, BaseModel):
     """
     生产单：隶属于Pipeline流程，由Pipeline创建和管理。
     Production Order: belongs to a Pipeline process, created and managed by Pipeline.
     """
 
+    # FieldTrackingMixin: status changes are detected without re-reading the row
+    tracked_fields = ("status",)
+
     production_code = models.CharField(
         max_length=100,
         unique=True,
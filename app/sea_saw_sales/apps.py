@@ -6,3 +6,6 @@ class SeaSawSalesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "sea_saw_sales"
     verbose_name = _("Sea-Saw Sales")
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,62 @@
+"""
+Management command to diff OrderItemFulfillment rows against live sums.
+
+Usage:
+    python manage.py check_fulfillment_ledger
+    python manage.py check_fulfillment_ledger --order-item 12
+    python manage.py check_fulfillment_ledger --fix
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from sea_saw_sales.services import FulfillmentLedgerService
+
+
+class Command(BaseCommand):
+    help = "Compare the fulfillment ledger with live purchase / production / outbound sums"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--order-item",
+            type=int,
+            action="append",
+            dest="order_items",
+            help="Only check the ledger row of this order item id (repeatable)",
+        )
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Refresh the ledger rows that differ",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of order items compared per batch (default: 500)",
+        )
+
+    def handle(self, *args, **options):
+        mismatched = set()
+        for order_item_id, field, ledger, live in FulfillmentLedgerService.diff(
+            options.get("order_items"), batch_size=options["batch_size"]
+        ):
+            mismatched.add(order_item_id)
+            self.stdout.write(
+                f"  order_item={order_item_id} {field}: ledger={ledger} live={live}"
+            )
+
+        if not mismatched:
+            self.stdout.write(self.style.SUCCESS("Ledger is consistent."))
+            return
+
+        if options.get("fix"):
+            FulfillmentLedgerService.refresh(mismatched)
+            self.stdout.write(
+                self.style.SUCCESS(f"Fixed {len(mismatched)} ledger row(s).")
+            )
+            return
+
+        raise CommandError(
+            f"{len(mismatched)} order item(s) differ from live sums; "
+            "rerun with --fix or use rebuild_fulfillment_ledger."
+        )
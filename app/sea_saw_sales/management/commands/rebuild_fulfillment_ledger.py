@@ -0,0 +1,57 @@
+"""
+Management command to rebuild OrderItemFulfillment rows from scratch.
+
+Usage:
+    python manage.py rebuild_fulfillment_ledger
+    python manage.py rebuild_fulfillment_ledger --order-item 12 --order-item 15
+    python manage.py rebuild_fulfillment_ledger --purge
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from sea_saw_sales.models import OrderItemFulfillment
+from sea_saw_sales.services import FulfillmentLedgerService
+
+
+class Command(BaseCommand):
+    help = "Rebuild the fulfillment ledger of all order items (or specific ones)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--order-item",
+            type=int,
+            action="append",
+            dest="order_items",
+            help="Only rebuild the ledger row of this order item id (repeatable)",
+        )
+        parser.add_argument(
+            "--purge",
+            action="store_true",
+            help="Delete all existing ledger rows before rebuilding",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of order items refreshed per transaction (default: 500)",
+        )
+
+    def handle(self, *args, **options):
+        order_item_ids = options.get("order_items")
+
+        if options.get("purge"):
+            with transaction.atomic():
+                qs = OrderItemFulfillment.objects.all()
+                if order_item_ids:
+                    qs = qs.filter(order_item_id__in=order_item_ids)
+                deleted, _ = qs.delete()
+            self.stdout.write(f"  Purged {deleted} ledger row(s)")
+
+        count = FulfillmentLedgerService.rebuild(
+            order_item_ids, batch_size=options["batch_size"]
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Done. Rebuilt {count} fulfillment ledger row(s).")
+        )
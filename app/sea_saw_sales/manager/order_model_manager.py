@@ -119,9 +119,21 @@ class OrderModelManager(BaseModelManager):
         if user:
             update_fields["updated_by"] = user
 
+        # QuerySet.update() bypasses save(): rebuild search documents explicitly
+        rebuild_search = bool(
+            self.model._search_document_roots().intersection(update_fields)
+        )
+        if rebuild_search:
+            order_ids = list(queryset.values_list("pk", flat=True))
+
         # Update all orders
         count = queryset.update(**update_fields)
 
+        if rebuild_search:
+            self.model.rebuild_search_documents(
+                self.model._base_manager.filter(pk__in=order_ids)
+            )
+
         # Sync each order's pipeline
         for order in queryset.select_related('pipeline'):
             if hasattr(order, 'pipeline') and order.pipeline:
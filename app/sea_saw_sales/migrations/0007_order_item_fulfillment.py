@@ -0,0 +1,34 @@
+# Generated by Django 5.1.2 on 2026-10-17 01:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sea_saw_sales', '0006_rename_sea_saw_sal_buyer_idx_sea_saw_sal_buyer_i_653395_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderItemFulfillment',
+            fields=[
+                ('order_item', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='fulfillment', serialize=False, to='sea_saw_sales.orderitem', verbose_name='Order Item')),
+                ('purchase_qty_total', models.DecimalField(blank=True, decimal_places=3, max_digits=20, null=True, verbose_name='Purchase Qty (Total)')),
+                ('purchase_price_total', models.DecimalField(blank=True, decimal_places=3, max_digits=20, null=True, verbose_name='Purchase Price (Total)')),
+                ('planned_qty_total', models.DecimalField(blank=True, decimal_places=3, max_digits=20, null=True, verbose_name='Planned Qty (Total)')),
+                ('produced_qty_total', models.DecimalField(blank=True, decimal_places=3, max_digits=20, null=True, verbose_name='Produced Qty (Total)')),
+                ('produced_net_weight_total', models.DecimalField(blank=True, decimal_places=3, max_digits=20, null=True, verbose_name='Produced Net Weight (Total)')),
+                ('produced_gross_weight_total', models.DecimalField(blank=True, decimal_places=3, max_digits=20, null=True, verbose_name='Produced Gross Weight (Total)')),
+                ('outbound_qty_total', models.DecimalField(blank=True, decimal_places=3, max_digits=20, null=True, verbose_name='Outbound Qty (Total)')),
+                ('outbound_net_weight_total', models.DecimalField(blank=True, decimal_places=3, max_digits=20, null=True, verbose_name='Outbound Net Weight (Total)')),
+                ('outbound_gross_weight_total', models.DecimalField(blank=True, decimal_places=3, max_digits=20, null=True, verbose_name='Outbound Gross Weight (Total)')),
+                ('refreshed_at', models.DateTimeField(auto_now=True, verbose_name='Refreshed At')),
+            ],
+            options={
+                'verbose_name': 'Order Item Fulfillment',
+                'verbose_name_plural': 'Order Item Fulfillments',
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.2 on 2026-10-17 01:25
+
+from django.db import migrations, models
+
+from sea_saw_base.models.search_document import search_document_operations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sea_saw_sales', '0007_order_item_fulfillment'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='search_document',
+            field=models.TextField(blank=True, default='', editable=False, help_text='Lower-cased search text maintained on save.', verbose_name='Search Document'),
+        ),
+        *search_document_operations(
+            "sea_saw_sales",
+            "order",
+            ("order_code", "comment", "contact.name"),
+            "sales_order_search_trgm",
+        ),
+    ]
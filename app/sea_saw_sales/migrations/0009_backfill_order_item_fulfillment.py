@@ -0,0 +1,81 @@
+# Generated by Django 5.1.2 on 2026-10-17 02:40
+
+from django.db import migrations
+from django.db.models import Sum
+
+BATCH_SIZE = 2000
+
+# (app_label, model, {ledger field: summed source field}), as in
+# FulfillmentLedgerService._sources()
+SOURCES = [
+    (
+        "sea_saw_procurement",
+        "PurchaseItem",
+        {"purchase_qty_total": "purchase_qty", "purchase_price_total": "total_price"},
+    ),
+    (
+        "sea_saw_production",
+        "ProductionItem",
+        {
+            "planned_qty_total": "planned_qty",
+            "produced_qty_total": "produced_qty",
+            "produced_net_weight_total": "produced_net_weight",
+            "produced_gross_weight_total": "produced_gross_weight",
+        },
+    ),
+    (
+        "sea_saw_warehouse",
+        "OutboundItem",
+        {
+            "outbound_qty_total": "outbound_qty",
+            "outbound_net_weight_total": "outbound_net_weight",
+            "outbound_gross_weight_total": "outbound_gross_weight",
+        },
+    ),
+]
+
+
+def backfill_fulfillment(apps, schema_editor):
+    """Create ledger rows of existing order items (grouped sums per batch)."""
+    OrderItem = apps.get_model("sea_saw_sales", "OrderItem")
+    OrderItemFulfillment = apps.get_model("sea_saw_sales", "OrderItemFulfillment")
+
+    order_item_ids = list(
+        OrderItem._base_manager.order_by("pk").values_list("pk", flat=True)
+    )
+    for start in range(0, len(order_item_ids), BATCH_SIZE):
+        batch = order_item_ids[start : start + BATCH_SIZE]
+        totals = {pk: {} for pk in batch}
+        for app_label, model_name, columns in SOURCES:
+            model = apps.get_model(app_label, model_name)
+            rows = (
+                model._base_manager.filter(order_item_id__in=batch)
+                .order_by()
+                .values("order_item_id")
+                .annotate(**{name: Sum(source) for name, source in columns.items()})
+            )
+            for row in rows:
+                totals[row.pop("order_item_id")].update(row)
+
+        # Rows written by rebuild_fulfillment_ledger before this migration win
+        OrderItemFulfillment.objects.bulk_create(
+            [
+                OrderItemFulfillment(order_item_id=pk, **values)
+                for pk, values in totals.items()
+            ],
+            ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sea_saw_sales', '0008_search_document'),
+        ('sea_saw_procurement', '0005_alter_purchaseorder_pipeline_nullable'),
+        ('sea_saw_production', '0002_alter_productionitem_glazing'),
+        ('sea_saw_warehouse', '0005_search_document'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_fulfillment, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,11 @@
 from .order import Order
 from .order_item import OrderItem
+from .order_item_fulfillment import OrderItemFulfillment
 from .enums import OrderStatusType
 
 __all__ = [
     "Order",
     "OrderItem",
+    "OrderItemFulfillment",
     "OrderStatusType",
 ]
@@ -7,16 +7,22 @@ Sales Order - 使用 Company 和 Contact 模型
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 from decimal import Decimal
-from django.db.models import Sum
-from django.utils import timezone
+from django.db.models import OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
 from django.contrib.contenttypes.fields import GenericRelation
 
-from sea_saw_base.models import AbstractOrderBase
+from sea_saw_base.models import (
+    AbstractOrderBase,
+    SearchDocumentMixin,
+    SequentialCodeMixin,
+    search_document_field,
+)
+from sea_saw_base.utils import DeferredRecompute
 from .enums import OrderStatusType
 from ..manager.order_model_manager import OrderModelManager
 
 
-class Order(AbstractOrderBase):
+class Order(SearchDocumentMixin, SequentialCodeMixin, AbstractOrderBase):
     """
     Sales Order
     Contains shipment info, linked contract, price summary and status.
@@ -24,6 +30,13 @@ class Order(AbstractOrderBase):
 
     objects = OrderModelManager()
 
+    # SequentialCodeMixin: SO{year}-{000001}
+    code_prefix = "SO"
+    code_field = "order_code"
+
+    # SearchDocumentMixin: text matched by SearchDocumentFilter
+    search_document_sources = ("order_code", "comment", "contact.name")
+
     order_code = models.CharField(
         max_length=100,
         unique=True,
@@ -103,6 +116,8 @@ class Order(AbstractOrderBase):
         related_query_name="order",
     )
 
+    search_document = search_document_field()
+
     class Meta:
         verbose_name = _("Order")
         verbose_name_plural = _("Orders")
@@ -116,19 +131,28 @@ class Order(AbstractOrderBase):
     def __str__(self):
         return self.order_code or _("Unnamed Order")
 
-    def generate_code(self):
-        """Auto-generate order code"""
-
-        year = timezone.now().year
-        count = Order.objects.filter(created_at__year=year).count() + 1
-        return f"SO{year}-{count:06d}"
+    # DeferredRecompute key of total_amount
+    TOTAL_AMOUNT_RECOMPUTE = "sales.order_total_amount"
+
+    @classmethod
+    def update_total_amounts(cls, order_ids):
+        """一条 UPDATE 重算多个订单的 total_amount (相关子查询)"""
+        from .order_item import OrderItem
+
+        totals = (
+            OrderItem.objects.filter(order=OuterRef("pk"))
+            .order_by()
+            .values("order")
+            .annotate(total=Sum("total_price"))
+            .values("total")
+        )
+        Order.objects.filter(pk__in=order_ids).update(
+            total_amount=Coalesce(Subquery(totals), Value(Decimal("0")))
+        )
 
     def update_total_amount(self):
         """直接用 QuerySet update 避免递归 save()"""
-        total = self.order_items.aggregate(total=Sum("total_price"))[
-            "total"
-        ] or Decimal("0")
-        Order.objects.filter(pk=self.pk).update(total_amount=total)
+        Order.update_total_amounts([self.pk])
 
     def save(self, *args, **kwargs):
 
@@ -137,6 +161,9 @@ class Order(AbstractOrderBase):
             self.order_code = self.generate_code()
         super().save(*args, **kwargs)
 
-        # auto update total_amount
+        # auto update total_amount (deferred inside DeferredRecompute.scope())
         if hasattr(self, "order_items"):
-            self.update_total_amount()
+            DeferredRecompute.mark_dirty(self.TOTAL_AMOUNT_RECOMPUTE, self.pk)
+
+
+DeferredRecompute.register(Order.TOTAL_AMOUNT_RECOMPUTE, Order.update_total_amounts)
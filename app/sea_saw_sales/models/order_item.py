@@ -6,6 +6,7 @@ from django.db import models
 from django.utils.translation import gettext_lazy as _
 
 from sea_saw_base.models import AbstarctItemBase
+from sea_saw_base.utils import DeferredRecompute
 from .order import Order
 
 
@@ -89,6 +90,5 @@ class OrderItem(AbstarctItemBase):
 
         super().save(*args, **kwargs)
 
-        # auto update total_amount after item save
-        if self.order_id:
-            self.order.update_total_amount()
+        # auto update total_amount after item save (once per DeferredRecompute scope)
+        DeferredRecompute.mark_dirty(Order.TOTAL_AMOUNT_RECOMPUTE, self.order_id)
@@ -0,0 +1,63 @@
+"""
+OrderItemFulfillment - 每个 OrderItem 的履约汇总物化表
+
+由 FulfillmentLedgerService 在 PurchaseItem / ProductionItem / OutboundItem
+变更时于同一事务内刷新, 订单集成视图直接 JOIN 读取, 避免每行九个相关子查询。
+"""
+
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+def _total_field(verbose_name):
+    return models.DecimalField(
+        max_digits=20,
+        decimal_places=3,
+        null=True,
+        blank=True,
+        verbose_name=verbose_name,
+    )
+
+
+class OrderItemFulfillment(models.Model):
+    """
+    Materialized purchase / production / outbound totals of one OrderItem.
+
+    Every total is nullable: NULL means no linked row exists, matching the
+    SUM() over an empty set of the previous per-row subqueries.
+    """
+
+    order_item = models.OneToOneField(
+        "sea_saw_sales.OrderItem",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="fulfillment",
+        verbose_name=_("Order Item"),
+    )
+
+    # PurchaseItem
+    purchase_qty_total = _total_field(_("Purchase Qty (Total)"))
+    purchase_price_total = _total_field(_("Purchase Price (Total)"))
+
+    # ProductionItem
+    planned_qty_total = _total_field(_("Planned Qty (Total)"))
+    produced_qty_total = _total_field(_("Produced Qty (Total)"))
+    produced_net_weight_total = _total_field(_("Produced Net Weight (Total)"))
+    produced_gross_weight_total = _total_field(_("Produced Gross Weight (Total)"))
+
+    # OutboundItem
+    outbound_qty_total = _total_field(_("Outbound Qty (Total)"))
+    outbound_net_weight_total = _total_field(_("Outbound Net Weight (Total)"))
+    outbound_gross_weight_total = _total_field(_("Outbound Gross Weight (Total)"))
+
+    refreshed_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name=_("Refreshed At"),
+    )
+
+    class Meta:
+        verbose_name = _("Order Item Fulfillment")
+        verbose_name_plural = _("Order Item Fulfillments")
+
+    def __str__(self):
+        return f"Fulfillment(order_item={self.order_item_id})"
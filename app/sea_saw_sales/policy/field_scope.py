@@ -0,0 +1,26 @@
+"""
+Copy-on-write field scoping for access policies.
+
+scope_fields() used to deepcopy the whole field map (including nested
+serializers and their children) just to flip ``read_only`` on some fields.
+Only the flipped fields are copied now, and only shallowly; the rest of the
+map is shared with the serializer.
+"""
+
+from copy import copy
+
+
+def with_read_only(fields, exclude=()):
+    """
+    New field map in which every field not in ``exclude`` is read-only.
+
+    Fields that must change are shallow-copied before ``read_only`` is set;
+    the original map and its fields are left untouched.
+    """
+    scoped = {}
+    for name, field in fields.items():
+        if name not in exclude and not field.read_only:
+            field = copy(field)
+            field.read_only = True
+        scoped[name] = field
+    return scoped
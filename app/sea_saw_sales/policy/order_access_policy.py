@@ -1,6 +1,7 @@
-from copy import deepcopy
 from rest_access_policy import AccessPolicy
 
+from .field_scope import with_read_only
+
 
 class OrderAccessPolicy(AccessPolicy):
     """
@@ -10,6 +11,10 @@ class OrderAccessPolicy(AccessPolicy):
     - SALE
     - PRODUCTION
     - WAREHOUSE
+
+    Object-level conditions call view.get_object(); use with views based on
+    MemoizedObjectMixin (e.g. OrderViewSet) so that they and the handler
+    share a single lookup.
     """
 
     statements = [
@@ -208,25 +213,21 @@ class OrderAccessPolicy(AccessPolicy):
 
     @classmethod
     def scope_fields(cls, request, fields, instance):
+        # Copy-on-write: only fields flipped to read-only are (shallowly) copied
         role = getattr(request.user.role, "role_type", None)
-        new_fields = deepcopy(fields)
 
         if not instance or role == "ADMIN":
-            return new_fields
+            return fields
 
         status = instance.status
 
         if role == "SALE" and status != "DRAFT":
-            for name, field in new_fields.items():
-                if name != "payments":
-                    field.read_only = True
+            return with_read_only(fields, exclude={"payments"})
 
         if role == "PRODUCTION" and status not in cls.PRODUCTION_EDITABLE_STATUSES:
-            for field in new_fields.values():
-                field.read_only = True
+            return with_read_only(fields)
 
         if role == "WAREHOUSE" and status not in cls.WAREHOUSE_EDITABLE_STATUSES:
-            for field in new_fields.values():
-                field.read_only = True
+            return with_read_only(fields)
 
-        return new_fields
+        return fields
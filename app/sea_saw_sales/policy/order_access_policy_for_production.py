@@ -1,6 +1,7 @@
-from copy import deepcopy
 from rest_access_policy import AccessPolicy
 
+from .field_scope import with_read_only
+
 
 class OrderAccessPolicyForProduction(AccessPolicy):
     """
@@ -66,10 +67,6 @@ class OrderAccessPolicyForProduction(AccessPolicy):
         """
         非生产中订单: 所有字段只读
         """
-        new_fields = deepcopy(fields)
-
         if instance and instance.status not in cls.EDITABLE_STATUSES:
-            for field in new_fields.values():
-                field.read_only = True
-
-        return new_fields
+            return with_read_only(fields)
+        return fields
@@ -1,6 +1,7 @@
-from copy import deepcopy
 from rest_access_policy import AccessPolicy
 
+from .field_scope import with_read_only
+
 
 class OrderAccessPolicyForSales(AccessPolicy):
     """
@@ -85,13 +86,6 @@ class OrderAccessPolicyForSales(AccessPolicy):
         """
         Non-draft orders: fields are read-only except "payments" (modifiable).
         """
-        new_fields = deepcopy(fields)
-
         if instance and getattr(instance, "status", None) != "DRAFT":
-            editable = {"payments"}  # whitelist
-
-            for name, field in new_fields.items():
-                if name not in editable:
-                    field.read_only = True
-
-        return new_fields
+            return with_read_only(fields, exclude={"payments"})  # whitelist
+        return fields
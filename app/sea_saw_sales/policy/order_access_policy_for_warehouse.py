@@ -1,6 +1,7 @@
-from copy import deepcopy
 from rest_access_policy import AccessPolicy
 
+from .field_scope import with_read_only
+
 
 class OrderAccessPolicyForWarehouse(AccessPolicy):
     """
@@ -63,10 +64,6 @@ class OrderAccessPolicyForWarehouse(AccessPolicy):
         """
         非 IN_OUTBOUND 阶段：所有字段只读
         """
-        new_fields = deepcopy(fields)
-
         if instance and instance.status != "IN_OUTBOUND":
-            for field in new_fields.values():
-                field.read_only = True
-
-        return new_fields
+            return with_read_only(fields)
+        return fields
@@ -3,10 +3,15 @@
 import os
 from io import BytesIO
 
-from openpyxl import load_workbook
-
 import sea_saw_export
-from sea_saw_export.xlsx import fix_copied_sheet, PRODUCT_FIRST_ROW, setup_product_rows, fill_product_row, fill_header
+from sea_saw_export.xlsx import (
+    fix_copied_sheet,
+    load_template,
+    PRODUCT_FIRST_ROW,
+    setup_product_rows,
+    fill_product_row,
+    fill_header,
+)
 from sea_saw_export.xlsx.config import DocConfig
 
 TEMPLATE_PATH = os.path.join(
@@ -26,19 +31,21 @@ SC_CONFIG = DocConfig(
 )
 
 
-def generate_sc_bulk_xlsx(orders) -> BytesIO:
+def generate_sc_bulk_xlsx(orders, progress_callback=None) -> BytesIO:
     """
     Generate a single XLSX with one sheet per order, sorted by created_at ascending.
     Returns a BytesIO object ready to stream as a file response.
+
+    progress_callback: optional callable(done, total), called after each sheet.
     """
     from .adapter import order_to_sc_data
 
     sorted_orders = sorted(orders, key=lambda o: o.created_at)
 
-    wb = load_workbook(TEMPLATE_PATH, rich_text=True)
+    wb = load_template(TEMPLATE_PATH)
     template_ws = wb[SC_CONFIG.template_sheet]
 
-    for order in sorted_orders:
+    for done, order in enumerate(sorted_orders, start=1):
         header, products = order_to_sc_data(order)
         ws = wb.copy_worksheet(template_ws)
         fix_copied_sheet(template_ws, ws, SC_CONFIG)
@@ -49,6 +56,8 @@ def generate_sc_bulk_xlsx(orders) -> BytesIO:
         for i, product in enumerate(products):
             fill_product_row(ws, PRODUCT_FIRST_ROW + i, product, SC_CONFIG)
         fill_header(ws, header, total_row, SC_CONFIG)
+        if progress_callback:
+            progress_callback(done, len(sorted_orders))
 
     del wb[SC_CONFIG.template_sheet]
 
@@ -67,7 +76,7 @@ def generate_sc_xlsx(order) -> BytesIO:
 
     header, products = order_to_sc_data(order)
 
-    wb = load_workbook(TEMPLATE_PATH, rich_text=True)
+    wb = load_template(TEMPLATE_PATH)
     template_ws = wb[SC_CONFIG.template_sheet]
 
     ws = wb.copy_worksheet(template_ws)
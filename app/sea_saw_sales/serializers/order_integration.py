@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from django.utils.translation import gettext_lazy as _
-from django.db.models import Sum, F, ExpressionWrapper, DecimalField
+from django.db import models
+from django.db.models import Sum, Max, F, ExpressionWrapper, DecimalField
 from drf_writable_nested.mixins import UniqueFieldsMixin
 
 from sea_saw_base.serializers import BaseSerializer
@@ -20,6 +21,113 @@ from .pipeline_minimal import PipelineMinimalSerializer
 from ..models import Order
 
 
+def resolve_pipeline_metrics(pipeline_ids):
+    """
+    Pipeline 级汇总指标的批量计算 (每个指标一条分组查询, 与页面大小无关)。
+
+    Returns:
+        dict: pipeline_id → {eta, total_purchase_amount, total_outbound_amount,
+        total_received_amount, total_paid_amount}; missing values are None
+    """
+    from sea_saw_finance.models import Payment
+    from sea_saw_finance.models.enums import PaymentType
+    from sea_saw_procurement.models import PurchaseOrder
+    from sea_saw_warehouse.models import OutboundItem, OutboundOrder
+
+    pipeline_ids = list(pipeline_ids)
+    metrics = {
+        pk: {
+            "eta": None,
+            "total_purchase_amount": None,
+            "total_outbound_amount": None,
+            "total_received_amount": None,
+            "total_paid_amount": None,
+        }
+        for pk in pipeline_ids
+    }
+    if not pipeline_ids:
+        return metrics
+
+    # Latest ETA among outbound orders
+    for row in (
+        OutboundOrder.objects.filter(pipeline_id__in=pipeline_ids, eta__isnull=False)
+        .order_by()
+        .values("pipeline_id")
+        .annotate(value=Max("eta"))
+    ):
+        metrics[row["pipeline_id"]]["eta"] = row["value"]
+
+    for row in (
+        PurchaseOrder.objects.filter(pipeline_id__in=pipeline_ids)
+        .order_by()
+        .values("pipeline_id")
+        .annotate(value=Sum("total_amount"))
+    ):
+        metrics[row["pipeline_id"]]["total_purchase_amount"] = row["value"]
+
+    # Outbound amount = order item unit price × outbound gross weight
+    for row in (
+        OutboundItem.objects.filter(
+            outbound_order__pipeline_id__in=pipeline_ids,
+            outbound_gross_weight__isnull=False,
+            order_item__unit_price__isnull=False,
+        )
+        .order_by()
+        .values("outbound_order__pipeline_id")
+        .annotate(
+            value=Sum(
+                ExpressionWrapper(
+                    F("order_item__unit_price") * F("outbound_gross_weight"),
+                    output_field=DecimalField(max_digits=20, decimal_places=2),
+                )
+            )
+        )
+    ):
+        metrics[row["outbound_order__pipeline_id"]]["total_outbound_amount"] = row[
+            "value"
+        ]
+
+    payment_metrics = {
+        PaymentType.ORDER_PAYMENT: "total_received_amount",
+        PaymentType.PURCHASE_PAYMENT: "total_paid_amount",
+    }
+    for row in (
+        Payment.objects.filter(
+            pipeline_id__in=pipeline_ids, payment_type__in=list(payment_metrics)
+        )
+        .order_by()
+        .values("pipeline_id", "payment_type")
+        .annotate(value=Sum("amount"))
+    ):
+        metrics[row["pipeline_id"]][payment_metrics[row["payment_type"]]] = row[
+            "value"
+        ]
+
+    return metrics
+
+
+class OrderIntegrationListSerializer(serializers.ListSerializer):
+    """
+    List serializer resolving the pipeline metrics of a whole page at once.
+
+    The child's method fields then read from the shared result instead of
+    issuing five aggregate queries per order.
+    """
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.manager.BaseManager) else data
+        orders = list(iterable)
+
+        pipeline_ids = []
+        for order in orders:
+            pipeline = getattr(order, "pipeline", None)
+            if pipeline:
+                pipeline_ids.append(pipeline.pk)
+        self.child._resolved_metrics = resolve_pipeline_metrics(pipeline_ids)
+
+        return super().to_representation(orders)
+
+
 class OrderIntegrationSerializer(
     PipelineSyncMixin, ReusableAttachmentWriteMixin, UniqueFieldsMixin, BaseSerializer
 ):
@@ -86,60 +194,37 @@ class OrderIntegrationSerializer(
     total_received_amount = serializers.SerializerMethodField(label=_("Total Received Amount"))
     total_paid_amount = serializers.SerializerMethodField(label=_("Total Paid Amount"))
 
-    def get_eta(self, obj):
+    def _pipeline_metrics(self, obj):
         pipeline = getattr(obj, "pipeline", None)
         if not pipeline:
             return None
-        return (
-            pipeline.outbound_orders.filter(eta__isnull=False)
-            .order_by("eta")
-            .values_list("eta", flat=True)
-            .last()
-        )
+        resolved = getattr(self, "_resolved_metrics", None)
+        if resolved is None or pipeline.pk not in resolved:
+            # Detail / write responses: resolve this pipeline only, once
+            resolved = self._resolved_metrics = {
+                **(resolved or {}),
+                **resolve_pipeline_metrics([pipeline.pk]),
+            }
+        return resolved[pipeline.pk]
+
+    def _metric(self, obj, name):
+        metrics = self._pipeline_metrics(obj)
+        return metrics[name] if metrics else None
+
+    def get_eta(self, obj):
+        return self._metric(obj, "eta")
 
     def get_total_purchase_amount(self, obj):
-        pipeline = getattr(obj, "pipeline", None)
-        if not pipeline:
-            return None
-        result = pipeline.purchase_orders.aggregate(total=Sum("total_amount"))
-        return result["total"]
+        return self._metric(obj, "total_purchase_amount")
 
     def get_total_outbound_amount(self, obj):
-        pipeline = getattr(obj, "pipeline", None)
-        if not pipeline:
-            return None
-        from sea_saw_warehouse.models import OutboundItem
-        result = OutboundItem.objects.filter(
-            outbound_order__pipeline=pipeline,
-            outbound_gross_weight__isnull=False,
-            order_item__unit_price__isnull=False,
-        ).aggregate(
-            total=Sum(
-                ExpressionWrapper(
-                    F("order_item__unit_price") * F("outbound_gross_weight"),
-                    output_field=DecimalField(max_digits=20, decimal_places=2),
-                )
-            )
-        )
-        return result["total"]
+        return self._metric(obj, "total_outbound_amount")
 
     def get_total_received_amount(self, obj):
-        pipeline = getattr(obj, "pipeline", None)
-        if not pipeline:
-            return None
-        result = pipeline.payments.filter(
-            payment_type="order_payment"
-        ).aggregate(total=Sum("amount"))
-        return result["total"]
+        return self._metric(obj, "total_received_amount")
 
     def get_total_paid_amount(self, obj):
-        pipeline = getattr(obj, "pipeline", None)
-        if not pipeline:
-            return None
-        result = pipeline.payments.filter(
-            payment_type="purchase_payment"
-        ).aggregate(total=Sum("amount"))
-        return result["total"]
+        return self._metric(obj, "total_paid_amount")
 
     order_items = OrderItemIntegrationSerializer(
         many=True, required=False, allow_null=True, label=_("Order Items")
@@ -161,6 +246,7 @@ class OrderIntegrationSerializer(
 
     class Meta(BaseSerializer.Meta):
         model = Order
+        list_serializer_class = OrderIntegrationListSerializer
         fields = [
             "id",
             "order_code",
@@ -4,26 +4,65 @@ from django.utils.translation import gettext_lazy as _
 from sea_saw_base.serializers import BaseSerializer
 from ..models import OrderItem
 
-_decimal = dict(max_digits=14, decimal_places=3, read_only=True, allow_null=True, required=False)
+_decimal = dict(
+    max_digits=14, decimal_places=3, read_only=True, allow_null=True, required=False
+)
 
 
 class OrderItemIntegrationSerializer(BaseSerializer):
     """
     Read-only OrderItem serializer with aggregated stats from purchase/production/outbound items.
-    Aggregations are pre-computed via Subquery annotations in OrderIntegrationViewSet.get_queryset().
+    Aggregations are read from the OrderItemFulfillment ledger (select_related("fulfillment")
+    in OrderIntegrationViewSet.get_queryset()); items without a ledger row read as null.
     """
 
-    purchase_qty_total = serializers.DecimalField(label=_("Purchase Qty (Total)"), **_decimal)
-    purchase_price_total = serializers.DecimalField(label=_("Purchase Price (Total)"), **_decimal)
+    purchase_qty_total = serializers.DecimalField(
+        source="fulfillment.purchase_qty_total",
+        label=_("Purchase Qty (Total)"),
+        **_decimal,
+    )
+    purchase_price_total = serializers.DecimalField(
+        source="fulfillment.purchase_price_total",
+        label=_("Purchase Price (Total)"),
+        **_decimal,
+    )
 
-    planned_qty_total = serializers.DecimalField(label=_("Planned Qty (Total)"), **_decimal)
-    produced_qty_total = serializers.DecimalField(label=_("Produced Qty (Total)"), **_decimal)
-    produced_net_weight_total = serializers.DecimalField(label=_("Produced Net Weight (Total)"), **_decimal)
-    produced_gross_weight_total = serializers.DecimalField(label=_("Produced Gross Weight (Total)"), **_decimal)
+    planned_qty_total = serializers.DecimalField(
+        source="fulfillment.planned_qty_total",
+        label=_("Planned Qty (Total)"),
+        **_decimal,
+    )
+    produced_qty_total = serializers.DecimalField(
+        source="fulfillment.produced_qty_total",
+        label=_("Produced Qty (Total)"),
+        **_decimal,
+    )
+    produced_net_weight_total = serializers.DecimalField(
+        source="fulfillment.produced_net_weight_total",
+        label=_("Produced Net Weight (Total)"),
+        **_decimal,
+    )
+    produced_gross_weight_total = serializers.DecimalField(
+        source="fulfillment.produced_gross_weight_total",
+        label=_("Produced Gross Weight (Total)"),
+        **_decimal,
+    )
 
-    outbound_qty_total = serializers.DecimalField(label=_("Outbound Qty (Total)"), **_decimal)
-    outbound_net_weight_total = serializers.DecimalField(label=_("Outbound Net Weight (Total)"), **_decimal)
-    outbound_gross_weight_total = serializers.DecimalField(label=_("Outbound Gross Weight (Total)"), **_decimal)
+    outbound_qty_total = serializers.DecimalField(
+        source="fulfillment.outbound_qty_total",
+        label=_("Outbound Qty (Total)"),
+        **_decimal,
+    )
+    outbound_net_weight_total = serializers.DecimalField(
+        source="fulfillment.outbound_net_weight_total",
+        label=_("Outbound Net Weight (Total)"),
+        **_decimal,
+    )
+    outbound_gross_weight_total = serializers.DecimalField(
+        source="fulfillment.outbound_gross_weight_total",
+        label=_("Outbound Gross Weight (Total)"),
+        **_decimal,
+    )
 
     class Meta(BaseSerializer.Meta):
         model = OrderItem
@@ -117,6 +117,9 @@ class BaseOrderSerializer(
         label=_("Bank Account ID"),
     )
 
+    # PrefetchPlan hint: get_active_entity reads obj.pipeline
+    select_related_hints = ["pipeline"]
+
     # Add active_entity from related Pipeline (read-only)
     active_entity = serializers.SerializerMethodField(
         label=_("Active Entity"),
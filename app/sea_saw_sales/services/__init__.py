@@ -0,0 +1,9 @@
+"""
+Sales Services
+"""
+
+from .fulfillment_ledger_service import FulfillmentLedgerService
+
+__all__ = [
+    "FulfillmentLedgerService",
+]
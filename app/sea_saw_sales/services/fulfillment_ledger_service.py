@@ -0,0 +1,193 @@
+"""
+Fulfillment Ledger Service - Maintains OrderItemFulfillment rows
+
+OrderItem 履约汇总的唯一写入口:
+- refresh(): 重新计算一批 OrderItem 的汇总并 upsert（在调用方事务内执行）
+- schedule_refresh(): 经 DeferredRecompute 刷新, 作用域内每个 OrderItem 只刷新一次
+- rebuild(): 全量重建（rebuild_fulfillment_ledger 命令使用）
+- diff(): 对比汇总表与实时 SUM（check_fulfillment_ledger 命令使用）
+
+汇总口径与原 OrderIntegrationViewSet 的相关子查询一致: 对 objects 管理器
+可见的全部明细行求和 (含软删除行)。
+"""
+
+from django.db import transaction
+from django.db.models import Sum
+
+from sea_saw_base.utils import DeferredRecompute
+
+from ..models import OrderItem, OrderItemFulfillment
+
+
+class FulfillmentLedgerService:
+    """
+    Service class for computing and persisting per-order-item fulfillment totals.
+    """
+
+    # DeferredRecompute key
+    RECOMPUTE = "sales.order_item_fulfillment"
+
+    @staticmethod
+    def _sources():
+        """(model, {ledger field: summed source field}) per linked item model."""
+        from sea_saw_procurement.models import PurchaseItem
+        from sea_saw_production.models import ProductionItem
+        from sea_saw_warehouse.models import OutboundItem
+
+        return [
+            (
+                PurchaseItem,
+                {
+                    "purchase_qty_total": "purchase_qty",
+                    "purchase_price_total": "total_price",
+                },
+            ),
+            (
+                ProductionItem,
+                {
+                    "planned_qty_total": "planned_qty",
+                    "produced_qty_total": "produced_qty",
+                    "produced_net_weight_total": "produced_net_weight",
+                    "produced_gross_weight_total": "produced_gross_weight",
+                },
+            ),
+            (
+                OutboundItem,
+                {
+                    "outbound_qty_total": "outbound_qty",
+                    "outbound_net_weight_total": "outbound_net_weight",
+                    "outbound_gross_weight_total": "outbound_gross_weight",
+                },
+            ),
+        ]
+
+    @classmethod
+    def fields(cls):
+        return [name for _, columns in cls._sources() for name in columns]
+
+    # ========================
+    # Compute
+    # ========================
+    @classmethod
+    def compute(cls, order_item_ids) -> dict:
+        """
+        Live totals for the given order items (one grouped query per item model).
+
+        Returns:
+            dict: order_item_id → {ledger field: amount or None}
+        """
+        order_item_ids = list(order_item_ids)
+        empty = dict.fromkeys(cls.fields())
+        totals = {pk: dict(empty) for pk in order_item_ids}
+
+        for model, columns in cls._sources():
+            rows = (
+                model.objects.filter(order_item_id__in=order_item_ids)
+                .order_by()
+                .values("order_item_id")
+                .annotate(
+                    **{name: Sum(source) for name, source in columns.items()}
+                )
+            )
+            for row in rows:
+                order_item_id = row.pop("order_item_id")
+                totals[order_item_id].update(row)
+
+        return totals
+
+    # ========================
+    # Persist
+    # ========================
+    @classmethod
+    @transaction.atomic
+    def refresh(cls, order_item_ids):
+        """
+        Recompute and upsert the ledger rows of the given order items.
+
+        Ids of order items that no longer exist are ignored.
+
+        Returns:
+            int: Number of ledger rows written
+        """
+        existing = list(
+            OrderItem.objects.filter(pk__in=list(order_item_ids)).values_list(
+                "pk", flat=True
+            )
+        )
+        if not existing:
+            return 0
+
+        fields = cls.fields()
+        rows = [
+            OrderItemFulfillment(order_item_id=pk, **values)
+            for pk, values in cls.compute(existing).items()
+        ]
+        OrderItemFulfillment.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=["order_item"],
+            update_fields=fields + ["refreshed_at"],
+        )
+        return len(rows)
+
+    @classmethod
+    def schedule_refresh(cls, order_item_id):
+        """Refresh now, or once at the end of the active DeferredRecompute scope."""
+        DeferredRecompute.mark_dirty(cls.RECOMPUTE, order_item_id)
+
+    @classmethod
+    def rebuild(cls, order_item_ids=None, *, batch_size=500):
+        """
+        Rebuild ledger rows from scratch.
+
+        Args:
+            order_item_ids: Optional iterable limiting the rebuild; all items if None
+            batch_size: Number of order items refreshed per transaction
+
+        Returns:
+            int: Number of ledger rows rebuilt
+        """
+        ids = cls._ids(order_item_ids)
+        for start in range(0, len(ids), batch_size):
+            cls.refresh(ids[start : start + batch_size])
+        return len(ids)
+
+    # ========================
+    # Consistency check
+    # ========================
+    @classmethod
+    def diff(cls, order_item_ids=None, *, batch_size=500):
+        """
+        Compare ledger rows with live sums.
+
+        Yields:
+            tuple: (order_item_id, field, ledger value, live value); a missing
+            ledger row reads as all NULL
+        """
+        ids = cls._ids(order_item_ids)
+        fields = cls.fields()
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start : start + batch_size]
+            stored = {
+                row["order_item_id"]: row
+                for row in OrderItemFulfillment.objects.filter(
+                    order_item_id__in=batch
+                ).values("order_item_id", *fields)
+            }
+            for pk, live in cls.compute(batch).items():
+                ledger = stored.get(pk, {})
+                for field in fields:
+                    if ledger.get(field) != live[field]:
+                        yield pk, field, ledger.get(field), live[field]
+
+    @staticmethod
+    def _ids(order_item_ids):
+        queryset = OrderItem.objects.order_by("pk")
+        if order_item_ids is not None:
+            queryset = queryset.filter(pk__in=list(order_item_ids))
+        return list(queryset.values_list("pk", flat=True))
+
+
+DeferredRecompute.register(
+    FulfillmentLedgerService.RECOMPUTE, FulfillmentLedgerService.refresh
+)
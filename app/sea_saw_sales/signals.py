@@ -0,0 +1,57 @@
+"""
+Sales signals module.
+
+Fulfillment ledger maintenance:
+OrderItemFulfillment is refreshed whenever a PurchaseItem, ProductionItem or
+OutboundItem linked to an order item is saved, soft-deleted (safedelete soft
+delete goes through save()) or hard-deleted. When a row is re-linked to a
+different order item, both the previous and the new order item are refreshed.
+Inside DeferredRecompute.scope() each order item is refreshed once when the
+scope exits.
+Bulk operations (bulk_create / QuerySet.update) bypass signals and must call
+FulfillmentLedgerService.refresh() explicitly.
+
+Search documents:
+Order.search_document includes the contact name; renaming a contact rebuilds
+the documents of its orders.
+"""
+
+from django.db.models.signals import post_delete, post_init, post_save
+
+from sea_saw_base.models import follow_related_changes
+from sea_saw_crm.models import Contact
+from sea_saw_procurement.models import PurchaseItem
+from sea_saw_production.models import ProductionItem
+from sea_saw_warehouse.models import OutboundItem
+
+from .models import Order
+from .services import FulfillmentLedgerService
+
+# order_item_id as loaded from the database (set on post_init)
+LOADED_ORDER_ITEM_ATTR = "_fulfillment_order_item_id"
+
+
+def remember_order_item(sender, instance, **kwargs):
+    # __dict__ lookup: never triggers a query for deferred fields
+    setattr(instance, LOADED_ORDER_ITEM_ATTR, instance.__dict__.get("order_item_id"))
+
+
+def refresh_fulfillment_on_item_save(sender, instance, **kwargs):
+    previous = getattr(instance, LOADED_ORDER_ITEM_ATTR, None)
+    if previous != instance.order_item_id:
+        FulfillmentLedgerService.schedule_refresh(previous)
+    FulfillmentLedgerService.schedule_refresh(instance.order_item_id)
+    setattr(instance, LOADED_ORDER_ITEM_ATTR, instance.order_item_id)
+
+
+def refresh_fulfillment_on_item_delete(sender, instance, **kwargs):
+    FulfillmentLedgerService.schedule_refresh(instance.order_item_id)
+
+
+for item_model in (PurchaseItem, ProductionItem, OutboundItem):
+    post_init.connect(remember_order_item, sender=item_model)
+    post_save.connect(refresh_fulfillment_on_item_save, sender=item_model)
+    post_delete.connect(refresh_fulfillment_on_item_delete, sender=item_model)
+
+
+follow_related_changes(Order, Contact, "name", "contact")
@@ -1 +1,308 @@
-# Create your tests here.
+from decimal import Decimal
+from importlib import import_module
+from io import StringIO
+
+from django.apps import apps as django_apps
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+from safedelete.models import HARD_DELETE
+
+from sea_saw_auth.models import Role, User
+from sea_saw_base.utils import DeferredRecompute
+from sea_saw_finance.models import Payment
+from sea_saw_pipeline.models import Pipeline, PipelineType
+from sea_saw_procurement.models import PurchaseItem, PurchaseOrder
+from sea_saw_production.models import ProductionItem, ProductionOrder
+from sea_saw_warehouse.models import OutboundItem, OutboundOrder
+
+from .models import Order, OrderItem, OrderItemFulfillment
+from .policy import OrderAccessPolicy
+from .serializers.order_item_integration import OrderItemIntegrationSerializer
+from .services import FulfillmentLedgerService
+from .views import NestedOrderViewSet, OrderViewSet
+
+
+class FulfillmentLedgerTests(TestCase):
+
+    def setUp(self):
+        self.order = Order.objects.create(order_date="2024-01-15")
+        self.item = OrderItem.objects.create(order=self.order, order_qty=10)
+        self.other_item = OrderItem.objects.create(order=self.order, order_qty=4)
+        pipeline = Pipeline.objects.create(
+            order=self.order, pipeline_type=PipelineType.HYBRID_FLOW
+        )
+        purchase = PurchaseOrder.objects.create(pipeline=pipeline)
+        production = ProductionOrder.objects.create(pipeline=pipeline)
+        outbound = OutboundOrder.objects.create(pipeline=pipeline)
+
+        self.purchase_items = [
+            PurchaseItem.objects.create(
+                purchase_order=purchase, order_item=self.item, purchase_qty=qty
+            )
+            for qty in (3, 4)
+        ]
+        ProductionItem.objects.create(
+            production_order=production, order_item=self.item, planned_qty=6
+        )
+        OutboundItem.objects.create(
+            outbound_order=outbound, order_item=self.item, outbound_qty=2
+        )
+
+    def _ledger(self, item):
+        return OrderItemFulfillment.objects.get(order_item=item)
+
+    def test_ledger_follows_item_changes(self):
+        ledger = self._ledger(self.item)
+        self.assertEqual(ledger.purchase_qty_total, Decimal("7"))
+        self.assertEqual(ledger.planned_qty_total, Decimal("6"))
+        self.assertEqual(ledger.outbound_qty_total, Decimal("2"))
+        # No row until something links to the order item (serializer reads None)
+        self.assertFalse(hasattr(self.other_item, "fulfillment"))
+
+        # Re-linking a purchase item refreshes both order items
+        moved = self.purchase_items[0]
+        moved.order_item = self.other_item
+        moved.save()
+        self.assertEqual(self._ledger(self.item).purchase_qty_total, Decimal("4"))
+        self.assertEqual(self._ledger(self.other_item).purchase_qty_total, Decimal("3"))
+
+        self.purchase_items[1].delete(force_policy=HARD_DELETE)
+        self.assertIsNone(self._ledger(self.item).purchase_qty_total)
+
+    def test_scope_refreshes_each_order_item_once(self):
+        calls = []
+        original = DeferredRecompute._recomputers[FulfillmentLedgerService.RECOMPUTE]
+        DeferredRecompute.register(
+            FulfillmentLedgerService.RECOMPUTE,
+            lambda ids: calls.append(set(ids)) or original(ids),
+        )
+        try:
+            with DeferredRecompute.scope():
+                for item in self.purchase_items:
+                    item.purchase_qty = 1
+                    item.save()
+        finally:
+            DeferredRecompute.register(FulfillmentLedgerService.RECOMPUTE, original)
+
+        self.assertEqual(calls, [{self.item.pk}])
+        self.assertEqual(self._ledger(self.item).purchase_qty_total, Decimal("2"))
+
+    def test_serializer_reads_ledger_without_aggregates(self):
+        item = OrderItem.objects.select_related("fulfillment").get(pk=self.item.pk)
+        with self.assertNumQueries(0):
+            data = OrderItemIntegrationSerializer(item).data
+        self.assertEqual(Decimal(data["purchase_qty_total"]), Decimal("7"))
+
+    def test_check_and_rebuild_commands(self):
+        call_command("check_fulfillment_ledger", stdout=StringIO())
+
+        OrderItemFulfillment.objects.filter(order_item=self.item).update(
+            purchase_qty_total=Decimal("99")
+        )
+        with self.assertRaises(CommandError):
+            call_command("check_fulfillment_ledger", stdout=StringIO())
+
+        call_command("check_fulfillment_ledger", "--fix", stdout=StringIO())
+        self.assertEqual(self._ledger(self.item).purchase_qty_total, Decimal("7"))
+
+        OrderItemFulfillment.objects.all().delete()
+        call_command("rebuild_fulfillment_ledger", stdout=StringIO())
+        self.assertEqual(OrderItemFulfillment.objects.count(), 2)
+        self.assertEqual(list(FulfillmentLedgerService.diff()), [])
+
+    def test_migration_backfills_existing_items(self):
+        migration = import_module(
+            "sea_saw_sales.migrations.0009_backfill_order_item_fulfillment"
+        )
+        OrderItemFulfillment.objects.all().delete()
+
+        migration.backfill_fulfillment(django_apps, None)
+
+        self.assertEqual(OrderItemFulfillment.objects.count(), 2)
+        self.assertEqual(self._ledger(self.item).purchase_qty_total, Decimal("7"))
+        self.assertEqual(list(FulfillmentLedgerService.diff()), [])
+
+
+class OrderIntegrationMetricsTests(TestCase):
+
+    URL = "/api/sales/orders-integration/"
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            user=User.objects.create_user(
+                username="boss", role=Role.objects.get(role_name="ADMIN")
+            )
+        )
+
+    def _create_order(self):
+        order = Order.objects.create(order_date="2024-01-15")
+        item = OrderItem.objects.create(order=order, order_qty=5, unit_price=2)
+        pipeline = Pipeline.objects.create(
+            order=order, pipeline_type=PipelineType.HYBRID_FLOW
+        )
+        purchase = PurchaseOrder.objects.create(pipeline=pipeline)
+        PurchaseItem.objects.create(
+            purchase_order=purchase,
+            order_item=item,
+            purchase_qty=5,
+            gross_weight=1,
+            unit_price=3,
+        )
+        for eta in ("2024-03-01", "2024-04-01"):
+            outbound = OutboundOrder.objects.create(pipeline=pipeline, eta=eta)
+            OutboundItem.objects.create(
+                outbound_order=outbound, order_item=item, outbound_gross_weight=4
+            )
+        for related, amount in ((order, "10"), (purchase, "6")):
+            Payment.objects.create(
+                pipeline=pipeline,
+                content_type=ContentType.objects.get_for_model(related),
+                object_id=related.pk,
+                payment_date="2024-02-01",
+                amount=Decimal(amount),
+            )
+        return order
+
+    def _list(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.URL, {"page_size": 50})
+        self.assertEqual(response.status_code, 200, response.content)
+        return len(ctx.captured_queries), response.json()
+
+    def test_metrics_match_detail(self):
+        order = self._create_order()
+        Order.objects.create(order_date="2024-01-16")  # no pipeline
+
+        _, data = self._list()
+        rows = {row["id"]: row for row in data["results"]}
+        detail = self.client.get(f"{self.URL}{order.pk}/").json()
+
+        row = rows[order.pk]
+        for name, expected in (
+            ("eta", "2024-04-01"),
+            ("total_purchase_amount", "15"),
+            ("total_outbound_amount", "16"),
+            ("total_received_amount", "10"),
+            ("total_paid_amount", "6"),
+        ):
+            self.assertEqual(str(row[name]), str(detail[name]))
+            if name == "eta":
+                self.assertEqual(row[name], expected)
+            else:
+                self.assertEqual(Decimal(str(row[name])), Decimal(expected))
+
+        no_pipeline = next(r for pk, r in rows.items() if pk != order.pk)
+        self.assertIsNone(no_pipeline["total_purchase_amount"])
+
+    def test_list_query_count_is_constant(self):
+        self._create_order()
+        self._list()  # warm per-process caches
+        few, _ = self._list()
+        for _ in range(4):
+            self._create_order()
+        many, data = self._list()
+        self.assertEqual(data["count"], 5)
+        self.assertEqual(few, many)
+
+
+class OrderObjectLookupTests(TestCase):
+    """Policy conditions, permissions and handlers share one Order lookup."""
+
+    def setUp(self):
+        self.roles = {
+            role_type: User.objects.create_user(
+                username=role_type.lower(),
+                role=Role.objects.create(
+                    role_name=f"{role_type} (test)", role_type=role_type
+                ),
+            )
+            for role_type in ("SALE", "PRODUCTION", "WAREHOUSE")
+        }
+        self.roles["ADMIN"] = User.objects.create_user(
+            username="admin", role=Role.objects.get(role_name="ADMIN")
+        )
+
+    def _order_lookups(self, func):
+        """Run ``func``; count Order lookups through the view queryset."""
+        table = Order._meta.db_table
+        needle = f'"{table}"."deleted" IS NULL AND "{table}"."id" = '
+        with CaptureQueriesContext(connection) as ctx:
+            result = func()
+        return result, sum(needle in query["sql"] for query in ctx.captured_queries)
+
+    def _policy_view(self, user, action, order):
+        factory = APIRequestFactory()
+        method = "get" if action == "retrieve" else "patch"
+        request = Request(getattr(factory, method)("/"))
+        request.user = user
+        view = OrderViewSet(
+            action=action, kwargs={"pk": order.pk}, format_kwarg=None, request=request
+        )
+        view.permission_classes = [OrderAccessPolicy]
+        return view
+
+    def test_policy_conditions_share_lookup(self):
+        cases = [
+            ("SALE", "DRAFT"),
+            ("PRODUCTION", "IN_PRODUCTION"),
+            ("WAREHOUSE", "IN_OUTBOUND"),
+        ]
+        for role_type, order_status in cases:
+            user = self.roles[role_type]
+            order = Order.objects.create(owner=user, status=order_status)
+            for action in ("retrieve", "update"):
+                with self.subTest(role_type, action=action):
+                    view = self._policy_view(user, action, order)
+
+                    def check_and_fetch():
+                        view.check_permissions(view.request)
+                        return view.get_object()
+
+                    fetched, lookups = self._order_lookups(check_and_fetch)
+                    self.assertEqual(fetched, order)
+                    self.assertEqual(lookups, 1)
+
+    def test_nested_update_fetches_order_once(self):
+        user = self.roles["ADMIN"]
+        order = Order.objects.create(owner=user, status="draft")
+        client = APIClient()
+        client.force_authenticate(user=user)
+
+        response, lookups = self._order_lookups(
+            lambda: client.patch(
+                f"/api/sales/nested-orders/{order.pk}/",
+                {"comment": "memo"},
+                format="json",
+            )
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(lookups, 1)
+
+        response, lookups = self._order_lookups(
+            lambda: client.get(f"/api/sales/orders/{order.pk}/")
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(lookups, 1)
+
+    def test_scope_fields_copies_only_flipped_fields(self):
+        request = Request(APIRequestFactory().patch("/"))
+        request.user = self.roles["SALE"]
+        order = Order.objects.create(owner=request.user, status="CONFIRMED")
+        serializer = NestedOrderViewSet.role_serializer_map["SALE"](
+            order, context={"request": request}
+        )
+        fields = serializer.fields
+
+        scoped = OrderAccessPolicy.scope_fields(request, fields, order)
+        self.assertTrue(all(field.read_only for field in scoped.values()))
+        self.assertFalse(fields["comment"].read_only)
+        for name, field in fields.items():
+            # Already read-only fields are shared, not copied
+            self.assertEqual(scoped[name] is field, field.read_only)
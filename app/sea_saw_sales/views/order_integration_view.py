@@ -3,17 +3,15 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.parsers import FormParser, JSONParser
-from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.filters import OrderingFilter
 from rest_framework import status
 from django_filters import rest_framework as filters
-from django.db.models import Subquery, OuterRef, Sum, DecimalField, Prefetch
+from django.db.models import Prefetch
 
 from sea_saw_base.parsers import NestedMultiPartParser
+from sea_saw_base.filtersets import SearchDocumentFilter
 from sea_saw_base.metadata import BaseMetadata
 from sea_saw_export.mixins import ExportViewSetMixin
-from sea_saw_procurement.models import PurchaseItem
-from sea_saw_production.models import ProductionItem
-from sea_saw_warehouse.models import OutboundItem
 from sea_saw_pipeline.models import Pipeline
 
 from ..models import Order, OrderItem
@@ -22,18 +20,6 @@ from ..permissions import OrderAdminPermission, OrderSalePermission
 from ..filters import OrderFilter
 
 
-def _sum_sub(model, field):
-    """Correlated subquery: SUM(field) for rows matching order_item=OuterRef('pk')."""
-    return Subquery(
-        model.objects
-        .filter(order_item=OuterRef("pk"))
-        .values("order_item")
-        .annotate(total=Sum(field))
-        .values("total"),
-        output_field=DecimalField(),
-    )
-
-
 class OrderIntegrationViewSet(ExportViewSetMixin, ModelViewSet):
     """
     ViewSet for Order with integrated pipeline/outbound data.
@@ -44,10 +30,10 @@ class OrderIntegrationViewSet(ExportViewSetMixin, ModelViewSet):
     serializer_class = OrderIntegrationSerializer
     parser_classes = (JSONParser, NestedMultiPartParser, FormParser)
     permission_classes = [IsAuthenticated, OrderAdminPermission | OrderSalePermission]
-    filter_backends = (OrderingFilter, SearchFilter, filters.DjangoFilterBackend)
+    filter_backends = (OrderingFilter, SearchDocumentFilter, filters.DjangoFilterBackend)
     filterset_class = OrderFilter
     metadata_class = BaseMetadata
-    search_fields = ["order_code", "remark", "comment", "contact__name"]
+    search_fields = ["order_code", "comment", "contact__name"]
     ordering_fields = [
         "order_code",
         "order_date",
@@ -59,26 +45,16 @@ class OrderIntegrationViewSet(ExportViewSetMixin, ModelViewSet):
     ordering = ["-created_at"]
 
     def get_queryset(self):
-        annotated_items = OrderItem.objects.annotate(
-            purchase_qty_total=_sum_sub(PurchaseItem, "purchase_qty"),
-            purchase_price_total=_sum_sub(PurchaseItem, "total_price"),
-            planned_qty_total=_sum_sub(ProductionItem, "planned_qty"),
-            produced_qty_total=_sum_sub(ProductionItem, "produced_qty"),
-            produced_net_weight_total=_sum_sub(ProductionItem, "produced_net_weight"),
-            produced_gross_weight_total=_sum_sub(ProductionItem, "produced_gross_weight"),
-            outbound_qty_total=_sum_sub(OutboundItem, "outbound_qty"),
-            outbound_net_weight_total=_sum_sub(OutboundItem, "outbound_net_weight"),
-            outbound_gross_weight_total=_sum_sub(OutboundItem, "outbound_gross_weight"),
-        )
+        # Per-item totals come from the OrderItemFulfillment ledger (one JOIN);
+        # pipeline metrics are resolved per page by OrderIntegrationListSerializer
+        items_with_fulfillment = OrderItem.objects.select_related("fulfillment")
 
         return (
             Order.objects.filter(deleted__isnull=True)
             .select_related("pipeline")
             .prefetch_related(
-                Prefetch("order_items", queryset=annotated_items),
-                "pipeline__outbound_orders",
-                "pipeline__purchase_orders",
-                "pipeline__payments",
+                Prefetch("order_items", queryset=items_with_fulfillment),
+                "attachments",
             )
         )
 
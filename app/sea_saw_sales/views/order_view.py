@@ -6,7 +6,7 @@ from rest_framework.parsers import FormParser, JSONParser
 from rest_framework import status
 from sea_saw_base.parsers import NestedMultiPartParser
 from django_filters import rest_framework as filters
-from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.filters import OrderingFilter
 from rest_framework.permissions import IsAuthenticated
 
 from ..models import Order
@@ -22,15 +22,19 @@ from sea_saw_pipeline.serializers.pipeline import (
 )
 from ..permissions import OrderAdminPermission, OrderSalePermission
 from ..filters import OrderFilter
+from sea_saw_base.filtersets import SearchDocumentFilter
 from sea_saw_base.metadata import BaseMetadata
-from sea_saw_base.mixins import ReturnRelatedMixin
+from sea_saw_base.mixins import MemoizedObjectMixin, ReturnRelatedMixin
 from sea_saw_export.mixins import ExportViewSetMixin
 
 
-class OrderViewSet(ExportViewSetMixin, ModelViewSet):
+class OrderViewSet(MemoizedObjectMixin, ExportViewSetMixin, ModelViewSet):
     """
     ViewSet for Order (standalone access).
 
+    get_object() is memoized (MemoizedObjectMixin): permission / access policy
+    conditions and handlers share one Order lookup per request.
+
     Note: Pipeline is now the main entry point for business workflows.
     This ViewSet provides direct access to Order entities for:
     - Legacy API compatibility
@@ -43,14 +47,14 @@ class OrderViewSet(ExportViewSetMixin, ModelViewSet):
     queryset = Order.objects.all()
     serializer_class = OrderSerializerForOrderView
     parser_classes = (JSONParser, NestedMultiPartParser, FormParser)
-    filter_backends = (OrderingFilter, SearchFilter, filters.DjangoFilterBackend)
+    filter_backends = (OrderingFilter, SearchDocumentFilter, filters.DjangoFilterBackend)
     filterset_class = OrderFilter
     permission_classes = [
         IsAuthenticated,
         OrderAdminPermission | OrderSalePermission,
     ]
     metadata_class = BaseMetadata
-    search_fields = ["order_code", "remark", "comment", "contact__name"]
+    search_fields = ["order_code", "comment", "contact__name"]
     ordering_fields = [
         "order_code",
         "order_date",
@@ -87,7 +91,10 @@ class OrderViewSet(ExportViewSetMixin, ModelViewSet):
 
     @action(detail=False, methods=["post"], url_path="export-sales-contract-bulk")
     def export_sales_contract_bulk(self, request):
-        """Generate a single XLSX with one sheet per order for the given IDs."""
+        """Generate a single XLSX with one sheet per order for the given IDs.
+
+        Pass ``"async": true`` to generate in the background (DownloadTask).
+        """
         from sea_saw_sales.sc import generate_sc_bulk_xlsx
 
         def get_filename(qs):
@@ -96,7 +103,12 @@ class OrderViewSet(ExportViewSetMixin, ModelViewSet):
                 codes += f"-and-{qs.count() - 3}-more"
             return f"SC-{codes}.xlsx"
 
-        return self._export_bulk(generate_sc_bulk_xlsx, get_filename, request.data.get("ids", []))
+        return self._export_bulk(
+            generate_sc_bulk_xlsx,
+            get_filename,
+            request.data.get("ids", []),
+            export_kind="sales_contract",
+        )
 
     @action(detail=True, methods=["post"])
     def create_pipeline(self, request, pk=None):
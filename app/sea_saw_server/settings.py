@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 import os
 import socket
 from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit
 from datetime import timedelta
 
 
@@ -168,6 +169,65 @@ DATABASES = {
 }
 
 
+# =============================================================================
+# CACHE
+# =============================================================================
+
+# Shared cache (role visibility sets, dashboard / metadata caches and their
+# invalidation generations). It must be shared by every worker process, so:
+# - CACHE_URL if set
+# - otherwise the Celery Redis (CELERY_BROKER), on its own database (/1) so
+#   cache.clear() never flushes the broker queues
+# - local-memory cache only in DEBUG (single-process development / tests)
+def _cache_url_from_broker(broker_url):
+    if not broker_url or not broker_url.startswith(("redis://", "rediss://")):
+        return None
+    return urlunsplit(urlsplit(broker_url)._replace(path="/1"))
+
+
+CACHE_URL = os.environ.get("CACHE_URL") or _cache_url_from_broker(
+    os.environ.get("CELERY_BROKER")
+)
+
+if CACHE_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CACHE_URL,
+        }
+    }
+elif DEBUG:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+else:
+    # Per-process caches would keep invalidations (role changes, ...) from
+    # reaching the other workers
+    raise ValueError(
+        "CACHE_URL (or a Redis CELERY_BROKER) must be set when DEBUG is off, "
+        "e.g. CACHE_URL=redis://redis:6379/1"
+    )
+
+# Dashboard overview aggregates; orders confirmed / cancelled invalidate early
+DASHBOARD_CACHE_TIMEOUT = int(os.environ.get("DASHBOARD_CACHE_TIMEOUT", 300))
+
+# OPTIONS metadata of list routes (sea_saw_base.metadata.MetadataCache); Field
+# changes and prebuild_metadata_cache invalidate early
+METADATA_CACHE_TIMEOUT = int(os.environ.get("METADATA_CACHE_TIMEOUT", 3600))
+
+# List endpoint ?search= backend (sea_saw_base.filtersets.SearchDocumentFilter):
+# "auto" uses the trigram-indexed search_document on PostgreSQL and the
+# field-by-field SearchFilter elsewhere; "document" / "fields" force either one
+SEARCH_BACKEND = os.environ.get("SEARCH_BACKEND", "auto")
+
+# SALE payment lists (sea_saw_finance.mixins.PaymentQuerysetFilterMixin):
+# "pipeline" filters on Pipeline.owner through the indexed pipeline FK;
+# "denormalized" filters on Payment.pipeline_owner without the join
+PAYMENT_OWNER_FILTER = os.environ.get("PAYMENT_OWNER_FILTER", "pipeline")
+
+
 # =============================================================================
 # AUTHENTICATION & AUTHORIZATION
 # =============================================================================
@@ -226,7 +286,8 @@ WHITENOISE_AUTOREFRESH = DEBUG
 REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": ["rest_framework.permissions.DjangoModelPermissions"],
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        # JWTAuthentication that serves request.user from role claims (no DB hit)
+        "sea_saw_auth.authentication.RoleClaimsJWTAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ],
     "DEFAULT_THROTTLE_RATES": {
@@ -261,6 +322,9 @@ SIMPLE_JWT = {
     "ALGORITHM": "HS256",
     "SIGNING_KEY": SECRET_KEY,
     "AUTH_HEADER_TYPES": ("Bearer",),
+    # Access tokens carry role / group claims (sea_saw_auth.tokens)
+    "TOKEN_OBTAIN_SERIALIZER": "sea_saw_auth.serializers.RoleClaimsTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "sea_saw_auth.serializers.RoleClaimsTokenRefreshSerializer",
 }
 
 # dj-rest-auth configuration
@@ -309,6 +373,12 @@ CELERY_TIMEZONE = TIME_ZONE
 CELERY_TASK_SOFT_TIME_LIMIT = 300  # 5 minutes
 CELERY_TASK_TIME_LIMIT = 360  # 6 minutes (hard limit)
 
+# CSV export (sea_saw_download): keyset page size and record cap per task.
+# The cap must fit in CELERY_TASK_SOFT_TIME_LIMIT: at ~1500 records/s,
+# 250k records take ~170 s. Raise both together.
+DOWNLOAD_CHUNK_SIZE = int(os.environ.get("DOWNLOAD_CHUNK_SIZE", 2000))
+DOWNLOAD_MAX_RECORDS = int(os.environ.get("DOWNLOAD_MAX_RECORDS", 250_000))
+
 
 # =============================================================================
 # DJANGO DEBUG TOOLBAR
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.2 on 2026-10-17 01:25
+
+from django.db import migrations, models
+
+from sea_saw_base.models.search_document import search_document_operations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sea_saw_warehouse', '0004_alter_outboundorder_pipeline'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboundorder',
+            name='search_document',
+            field=models.TextField(blank=True, default='', editable=False, help_text='Lower-cased search text maintained on save.', verbose_name='Search Document'),
+        ),
+        *search_document_operations(
+            "sea_saw_warehouse",
+            "outboundorder",
+            ("outbound_code", "remark", "container_no", "seal_no"),
+            "outbound_order_search_trgm",
+        ),
+    ]
@@ -9,12 +9,17 @@ from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.contrib.contenttypes.fields import GenericRelation
 
-from sea_saw_base.models import BaseModel
+from sea_saw_base.models import (
+    BaseModel,
+    FieldTrackingMixin,
+    SearchDocumentMixin,
+    search_document_field,
+)
 from sea_saw_sales.models import Order
 from .enums import OutboundStatus
 
 
-class OutboundOrder(BaseModel):
+class OutboundOrder(FieldTrackingMixin, SearchDocumentMixin, BaseModel):
     """
     出仓单 / 出货单
     Outbound Order / Shipment Order
@@ -26,6 +31,9 @@ class OutboundOrder(BaseModel):
     Describes an actual shipment (full container, LCL, partial shipment, etc.)
     """
 
+    # FieldTrackingMixin: status changes are detected without re-reading the row
+    tracked_fields = ("status",)
+
     outbound_code = models.CharField(
         max_length=100,
         unique=True,
@@ -106,6 +114,11 @@ class OutboundOrder(BaseModel):
         verbose_name=_("Remark"),
     )
 
+    search_document = search_document_field()
+
+    # SearchDocumentMixin: text matched by SearchDocumentFilter
+    search_document_sources = ("outbound_code", "remark", "container_no", "seal_no")
+
     # GenericRelation to unified Attachment model
     attachments = GenericRelation(
         "sea_saw_attachment.Attachment",
@@ -3,7 +3,7 @@ from rest_framework.exceptions import ValidationError
 from rest_framework.parsers import FormParser, JSONParser
 from sea_saw_base.parsers import NestedMultiPartParser
 from django_filters import rest_framework as filters
-from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.filters import OrderingFilter
 from rest_framework.permissions import IsAuthenticated
 
 from sea_saw_warehouse.models import OutboundOrder
@@ -19,6 +19,7 @@ from sea_saw_pipeline.serializers.pipeline import (
     PipelineSerializerForWarehouse,
 )
 from sea_saw_base.permissions import IsAdmin, IsWarehouse, IsSale
+from sea_saw_base.filtersets import SearchDocumentFilter
 from sea_saw_base.metadata import BaseMetadata
 from sea_saw_base.mixins import ReturnRelatedMixin
 
@@ -35,7 +36,7 @@ class OutboundOrderViewSet(ModelViewSet):
     queryset = OutboundOrder.objects.all()
     serializer_class = OutboundOrderSerializerForOutboundView
     parser_classes = (JSONParser, NestedMultiPartParser, FormParser)
-    filter_backends = (OrderingFilter, SearchFilter, filters.DjangoFilterBackend)
+    filter_backends = (OrderingFilter, SearchDocumentFilter, filters.DjangoFilterBackend)
     filterset_class = OutboundOrderFilter
     permission_classes = [IsAuthenticated, IsAdmin | IsWarehouse | IsSale]
     metadata_class = BaseMetadata
@@ -69,7 +70,7 @@ class NestedOutboundOrderViewSet(ReturnRelatedMixin, ModelViewSet):
     queryset = OutboundOrder.objects.all()
     serializer_class = OutboundOrderSerializerForAdmin
     parser_classes = (JSONParser, NestedMultiPartParser, FormParser)
-    filter_backends = (OrderingFilter, SearchFilter, filters.DjangoFilterBackend)
+    filter_backends = (OrderingFilter, SearchDocumentFilter, filters.DjangoFilterBackend)
     permission_classes = [
         IsAuthenticated,
         IsAdmin | IsWarehouse,